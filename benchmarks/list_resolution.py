@@ -0,0 +1,94 @@
+"""리스트 참조 해석: 엔트리 복사와 ``ListRef`` 핸들의 크기/메모리 비교
+
+합성 정책(모든 룰이 같은 대형 리스트를 참조)을 ``PolicyManager``로 파싱한
+뒤 ``PolicyItem.raw``로 저장되는 JSON을 두 방식으로 만듭니다.
+
+- copy: 이전 동작처럼 ``lists_resolved``에 엔트리 목록 전체를 저장
+- ref: :class:`ListRef` 핸들을 리스트 id로만 저장
+
+각 방식의 직렬화 크기와 시간, 저장된 JSON을 다시 읽은 레코드의 메모리를
+``tracemalloc``으로 측정합니다. copy 방식의 크기는 룰 수 x 엔트리 수에 비례하므로
+(룰 200개 x 엔트리 5만 개면 JSON만 약 1.8GB) 기본값은 작게 잡았습니다.
+
+    python benchmarks/list_resolution.py --rules 200 --list-entries 2000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from policy_module.list_refs import ListRef
+from policy_module.policy_manager import PolicyManager
+from policy_module.policy_store import PolicyStore
+
+from record_memory import build_source
+
+
+def _copied(value):
+    """핸들을 엔트리 목록으로 펼친 값 (이전 ``lists_resolved``)"""
+    if isinstance(value, ListRef):
+        return list(value)
+    if isinstance(value, list):
+        return [_copied(item) for item in value]
+    return value
+
+
+def serialize(items: list, copy: bool) -> tuple:
+    """``raw`` 컬럼에 들어갈 JSON 문자열 목록과 소요 시간"""
+    start = time.perf_counter()
+    encoded = []
+    for item in items:
+        raw = PolicyStore._raw(item)
+        if copy and "lists_resolved" in item:
+            raw["lists_resolved"] = _copied(item["lists_resolved"])
+        encoded.append(json.dumps(raw, ensure_ascii=False))
+    return encoded, time.perf_counter() - start
+
+
+def loaded_memory(encoded: list) -> int:
+    """저장된 JSON을 다시 읽은 레코드가 차지하는 메모리 (bytes)"""
+    gc.collect()
+    tracemalloc.start()
+    records = [json.loads(text) for text in encoded]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return current
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rules", type=int, default=200)
+    ap.add_argument("--list-entries", type=int, default=2000)
+    args = ap.parse_args()
+
+    # 룰마다 조건식 하나 -> 모든 룰이 list0을 참조
+    manager = PolicyManager(build_source(args.rules, 1, args.list_entries))
+    manager.parse_lists()
+    items = manager.parse_policy()
+    referencing = sum(1 for item in items if isinstance(item.get("lists_resolved"), ListRef))
+    print(f"rules={args.rules} list_entries={args.list_entries} referencing_records={referencing}")
+
+    print(f"{'mode':<8}{'JSON MB':>10}{'seconds':>10}{'loaded MB':>12}")
+    results = {}
+    for mode in ("copy", "ref"):
+        encoded, seconds = serialize(items, copy=mode == "copy")
+        size = sum(len(text.encode("utf-8")) for text in encoded)
+        memory = loaded_memory(encoded)
+        results[mode] = (size, memory)
+        print(f"{mode:<8}{size / 2**20:>10.1f}{seconds:>10.2f}{memory / 2**20:>12.1f}")
+    (copy_size, copy_memory), (ref_size, ref_memory) = results["copy"], results["ref"]
+    print(f"{'ratio':<8}{copy_size / max(ref_size, 1):>9.0f}x{'':>10}{copy_memory / max(ref_memory, 1):>11.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""직렬 파싱과 프로세스 풀 병렬 파싱의 속도 비교
+
+합성 정책 데이터를 ``PolicyParser``로 직렬/병렬 파싱하여 레코드와 경로
+테이블이 동일한지 확인한 뒤 소요 시간과 속도 향상 비율을 출력합니다.
+
+    python benchmarks/parallel_parse.py --rules 50000 --workers 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from policy_module.parsers.policy_parser import PolicyParser
+from policy_module.parsers.records import as_dict
+
+from record_memory import build_source
+
+
+def run(source: dict, workers: int, compact: bool, repeat: int) -> tuple:
+    """가장 빠른 실행 시간과 마지막 실행의 파서"""
+    best = float("inf")
+    for _ in range(repeat):
+        parser = PolicyParser(source, compact=compact, workers=workers)
+        start = time.perf_counter()
+        parser.parse()
+        best = min(best, time.perf_counter() - start)
+    return best, parser
+
+
+def check(serial: PolicyParser, parallel: PolicyParser) -> None:
+    """병렬 결과가 직렬 결과와 레코드/경로 단위로 동일한지 확인"""
+    assert len(serial.rule_records) == len(parallel.rule_records), "record count differs"
+    for index, (a, b) in enumerate(zip(serial.rule_records, parallel.rule_records)):
+        assert as_dict(a) == as_dict(b), f"record {index} differs"
+    assert serial.paths.rows() == parallel.paths.rows(), "path table differs"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rules", type=int, default=50000)
+    ap.add_argument("--conditions", type=int, default=3)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--compact", action="store_true")
+    args = ap.parse_args()
+
+    source = build_source(args.rules, args.conditions, 0)
+    serial_time, serial = run(source, 0, args.compact, args.repeat)
+    parallel_time, parallel = run(source, args.workers, args.compact, args.repeat)
+    check(serial, parallel)
+
+    count = len(serial.rule_records)
+    print(f"{'mode':<16}{'records':>10}{'seconds':>10}{'rec/s':>12}")
+    print(f"{'serial':<16}{count:>10}{serial_time:>10.2f}{count / serial_time:>12.0f}")
+    print(f"{f'workers={args.workers}':<16}{count:>10}{parallel_time:>10.2f}{count / parallel_time:>12.0f}")
+    print(f"speedup {serial_time / parallel_time:.2f}x (results identical)")
+
+
+if __name__ == "__main__":
+    main()
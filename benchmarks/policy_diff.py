@@ -0,0 +1,99 @@
+"""두 내보내기의 구조 비교(diff) 속도 측정
+
+합성 정책을 만들고 복사본의 룰 일부를 바꾼 뒤(이름/조건식 연산자 변경,
+삭제, 다른 그룹으로 이동) 두 내보내기를 파싱하여 :func:`diff_policy` 소요
+시간을 출력합니다. 파싱 시간은 따로 표시합니다.
+
+    python benchmarks/policy_diff.py --rules 1000000 --changes 100
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from policy_module.parsers.policy_parser import PolicyParser
+from policy_module.policy_diff import diff_policy
+
+import synthetic
+
+
+def _groups(group: dict) -> list:
+    """룰이 있는 그룹 (문서 순서)"""
+    found = [group] if group.get("rules") else []
+    children = (group.get("ruleGroups") or {}).get("ruleGroup") or []
+    for child in children if isinstance(children, list) else [children]:
+        found.extend(_groups(child))
+    return found
+
+
+def _rules(group: dict) -> list:
+    rules = group["rules"]["rule"]
+    if not isinstance(rules, list):
+        rules = group["rules"]["rule"] = [rules]
+    return rules
+
+
+def mutate(source: dict, changes: int, seed: int) -> dict:
+    """룰 ``changes``개를 바꾼 복사본"""
+    source = copy.deepcopy(source)
+    rng = random.Random(seed)
+    groups = _groups(source["libraryContent"]["ruleGroup"])
+    for i in range(changes):
+        rules = _rules(rng.choice(groups))
+        if not rules:
+            continue
+        rule = rng.choice(rules)
+        kind = i % 4
+        if kind == 0:
+            rule["@name"] += " (renamed)"
+        elif kind == 1:
+            expressions = rule["condition"]["expressions"]["conditionExpression"]
+            first = expressions[0] if isinstance(expressions, list) else expressions
+            first["@operatorId"] = "does not equal"
+        elif kind == 2:
+            rules.remove(rule)
+        else:
+            rules.remove(rule)
+            _rules(rng.choice(groups)).append(rule)
+    return source
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rules", type=int, default=100000)
+    ap.add_argument("--depth", type=int, default=3)
+    ap.add_argument("--conditions", type=int, default=3)
+    ap.add_argument("--changes", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    before = synthetic.generate(rules=args.rules, depth=args.depth, conditions=args.conditions, seed=args.seed)
+    after = mutate(before, args.changes, args.seed)
+
+    start = time.perf_counter()
+    old_records = PolicyParser(before).parse()
+    new_records = PolicyParser(after).parse()
+    parse_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    changes, stats = diff_policy(old_records, new_records)
+    diff_time = time.perf_counter() - start
+
+    counts = {}
+    for change in changes:
+        key = change.status + (" (moved)" if change.moved else "")
+        counts[key] = counts.get(key, 0) + 1
+    print(f"records {len(old_records)} / {len(new_records)}, items {stats['old_items']} / {stats['new_items']}")
+    print(f"parse (both) {parse_time:.2f}s, diff {diff_time:.2f}s")
+    print(f"compared {stats['compared']}, skipped subtrees {stats['skipped']}, changes {counts}")
+
+
+if __name__ == "__main__":
+    main()
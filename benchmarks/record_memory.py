@@ -0,0 +1,89 @@
+"""dict 레코드와 compact 레코드의 메모리 사용량 비교
+
+합성 정책 데이터를 ``PolicyParser``/``ListsParser``로 파싱하여 결과 레코드가
+차지하는 메모리를 ``tracemalloc``으로 측정합니다.
+
+    python benchmarks/record_memory.py --rules 20000 --list-entries 50000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from policy_module.parsers.lists_parser import ListsParser
+from policy_module.parsers.policy_parser import PolicyParser
+
+
+def _expression(i: int) -> dict:
+    return {
+        "@prefix": "AND" if i else None,
+        "@operatorId": "in list",
+        "propertyInstance": {"@propertyId": "URL.Host"},
+        "parameter": {"@valueType": "list", "value": {"listValue": {"@id": f"list{i}"}}},
+    }
+
+
+def build_source(rules: int, conditions: int, list_entries: int) -> dict:
+    """``rules`` 개의 룰을 100개씩 그룹으로 묶은 libraryContent 생성"""
+    groups = []
+    for g in range(0, rules, 100):
+        group_rules = [
+            {
+                "@id": f"r{r}",
+                "@name": f"Rule {r}",
+                "@enabled": "true",
+                "condition": {"expressions": {"conditionExpression": [_expression(i) for i in range(conditions)]}},
+                "actionContainer": {"@actionId": "com.scur.engine.action.block"},
+            }
+            for r in range(g, min(g + 100, rules))
+        ]
+        groups.append({"@id": f"g{g}", "@name": f"Group {g}", "rules": {"rule": group_rules}})
+    entries = [{"entry": f"host{i}.example.com", "description": None} for i in range(list_entries)]
+    return {
+        "libraryContent": {
+            "ruleGroup": {"@id": "root", "@name": "Root", "ruleGroups": {"ruleGroup": groups}},
+            "lists": {"entry": {"list": {"@id": "list0", "@name": "Hosts", "content": {"listEntry": entries}}}},
+        }
+    }
+
+
+def measure(parser_cls, source: dict, compact: bool) -> tuple:
+    """파싱 후 남아 있는 레코드의 메모리 (bytes, 레코드 수)"""
+    gc.collect()
+    tracemalloc.start()
+    parser = parser_cls(source, compact=compact)
+    records = parser.parse()
+    del parser
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, len(records)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rules", type=int, default=20000)
+    ap.add_argument("--conditions", type=int, default=3)
+    ap.add_argument("--list-entries", type=int, default=50000)
+    args = ap.parse_args()
+
+    source = build_source(args.rules, args.conditions, args.list_entries)
+    print(f"{'parser':<14}{'mode':<9}{'records':>10}{'MB':>10}{'B/record':>10}")
+    for parser_cls in (PolicyParser, ListsParser):
+        results = {}
+        for compact in (False, True):
+            size, count = measure(parser_cls, source, compact)
+            results[compact] = size
+            mode = "compact" if compact else "dict"
+            print(f"{parser_cls.__name__:<14}{mode:<9}{count:>10}{size / 2**20:>10.1f}{size / max(count, 1):>10.0f}")
+        print(f"{'':<14}{'ratio':<9}{'':>10}{results[False] / max(results[True], 1):>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""스냅샷 저장소의 중복 제거 효과 측정
+
+합성 내보내기를 하루에 룰 ``--changes``개씩 바꾸며(이름 변경, 삭제, 복제)
+``--days``일치 스냅샷을 :class:`SnapshotStore`에 저장하고, 내보내기마다 통째로
+zstd 압축하여 보관했을 때와 저장 크기를 비교합니다. 저장/복원 속도도 함께
+출력합니다.
+
+    python benchmarks/snapshot_dedup.py --rules 20000 --days 30 --changes 20
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import zstandard as zstd
+
+from policy_module.snapshot_store import DEFAULT_LEVEL, SnapshotStore
+
+import synthetic
+
+RULE = re.compile(rb"<rule .*?</rule>", re.S)
+
+
+def mutate(content: bytes, changes: int, rng: random.Random, day: int) -> bytes:
+    """룰 ``changes``개를 바꾼 다음 날 내보내기"""
+    rules = [match.span() for match in RULE.finditer(content)]
+    edits = {}
+    for i, (start, end) in enumerate(rng.sample(rules, min(changes, len(rules)))):
+        rule = content[start:end]
+        kind = i % 3
+        if kind == 0:
+            edits[start] = (end, rule.replace(b'name="', f'name="day{day} '.encode(), 1))
+        elif kind == 1:
+            edits[start] = (end, b"")
+        else:
+            copy = rule.replace(b' id="', f' id="d{day}-{i}-'.encode(), 1)
+            edits[start] = (end, rule + copy)
+    out, last = [], 0
+    for start in sorted(edits):
+        end, replacement = edits[start]
+        out.append(content[last:start])
+        out.append(replacement)
+        last = end
+    out.append(content[last:])
+    return b"".join(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    synthetic.spec_arguments(ap)
+    ap.add_argument("--days", type=int, default=30)
+    ap.add_argument("--changes", type=int, default=20)
+    ap.set_defaults(rules=20000, list_entries=200)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_path = os.path.join(tmp, "export.xml")
+        synthetic.write_xml(export_path, synthetic.spec_from_args(args))
+        with open(export_path, "rb") as f:
+            content = f.read()
+        store = SnapshotStore(os.path.join(tmp, "snapshots"))
+        compressor = zstd.ZstdCompressor(level=DEFAULT_LEVEL)
+        whole = put_time = 0.0
+        for day in range(args.days):
+            if day:
+                content = mutate(content, args.changes, rng, day)
+            whole += len(compressor.compress(content))
+            start = time.perf_counter()
+            info = store.put(content)
+            put_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        restored = store.read(info.id)
+        read_time = time.perf_counter() - start
+        assert restored == content, "restored snapshot differs"
+
+        stats = store.stats()
+        print(f"rules={args.rules} days={args.days} changes/day={args.changes} export={len(content) / 2**20:.1f} MB")
+        print(f"raw total        {stats['logical_bytes'] / 2**20:>10.1f} MB")
+        print(f"zstd per export  {whole / 2**20:>10.1f} MB")
+        print(f"snapshot store   {stats['stored_bytes'] / 2**20:>10.1f} MB ({stats['chunks']} chunks, "
+              f"{whole / max(stats['stored_bytes'], 1):.1f}x smaller than zstd per export)")
+        print(f"put {put_time / args.days:.2f}s/snapshot, read {read_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
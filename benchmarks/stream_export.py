@@ -0,0 +1,116 @@
+"""API 가져오기: 내보내기 전체 수신과 스트리밍 수신의 최대 메모리 비교
+
+합성 내보내기 XML을 로컬 HTTP 서버(로그인/Rule Set 목록/내보내기만 흉내)로
+제공하고 ``PolicyStore.store_from_api``를 두 방식으로 실행하여 소요 시간과
+``tracemalloc`` 최대 메모리를 출력합니다.
+
+- buffered: 내보내기를 bytes로 받아 ``xmltodict``로 파싱 후 저장 (기본 동작)
+- stream: ``stream=True``, 받는 대로 증분 XML 파싱하여 ``batch_size`` 단위로 저장
+
+SQLite 파일 DB를 사용하며 DB 자체의 메모리는 측정에 포함되지 않습니다.
+
+    python benchmarks/stream_export.py --rules 10000 --list-entries 200
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from policy_module.config import ProxyConfig
+from policy_module.policy_store import PolicyStore
+from ppat_db.database import db
+from ppat_db.policy_db import PolicyItem
+
+import synthetic
+
+RULESETS = b"<entries><entry><id>rs0</id><title>Main</title></entry></entries>"
+
+
+def serve(path: str) -> ThreadingHTTPServer:
+    """``path`` 파일을 내보내기로 제공하는 서버 (본문은 64KB씩 전송)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _reply(self, body=b"", headers=None):
+            self.send_response(200)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._reply(RULESETS)
+
+        def do_POST(self):
+            if self.path.endswith("/login"):
+                return self._reply(headers={"Set-Cookie": "JSESSIONID=bench; Path=/"})
+            if "/export" not in self.path:
+                return self._reply()
+            self.send_response(200)
+            self.send_header("Content-Length", str(os.path.getsize(path)))
+            self.end_headers()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    self.wfile.write(chunk)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(proxy: ProxyConfig, db_path: str, **options) -> tuple:
+    """(소요 시간, 최대 메모리 bytes, 저장한 그룹/룰 수)"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    db.Model.metadata.create_all(engine)
+    with Session(engine) as session:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        PolicyStore(session, search=False).store_from_api(proxy, skip_unchanged=False, **options)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        items = session.query(PolicyItem).count()
+    engine.dispose()
+    return seconds, peak, items
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    synthetic.spec_arguments(ap)
+    ap.add_argument("--batch-size", type=int, default=1000)
+    ap.set_defaults(rules=10000, list_entries=200)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_path = os.path.join(tmp, "export.xml")
+        synthetic.write_xml(export_path, synthetic.spec_from_args(args))
+        server = serve(export_path)
+        proxy = ProxyConfig(f"http://127.0.0.1:{server.server_address[1]}", "bench", "bench")
+        print(f"rules={args.rules} export={os.path.getsize(export_path) / 2**20:.1f} MB")
+        print(f"{'mode':<10}{'seconds':>10}{'peak MB':>10}{'items':>10}")
+        for mode in ("buffered", "stream"):
+            options = {"stream": True, "batch_size": args.batch_size} if mode == "stream" else {}
+            seconds, peak, items = measure(proxy, os.path.join(tmp, f"{mode}.db"), **options)
+            print(f"{mode:<10}{seconds:>10.2f}{peak / 2**20:>10.1f}{items:>10}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""파싱/저장 단계별 확장성 벤치마크
+
+:mod:`synthetic`으로 만든 내보내기 파일을 단계별로 처리하면서 소요 시간,
+최대 RSS, 초당 레코드 수를 측정합니다. 각 단계는 새 프로세스에서 실행되므로
+최대 RSS가 앞 단계의 영향을 받지 않습니다. 결과는 커밋, Python 버전, 데이터
+매개변수와 함께 JSON으로 저장되며 ``--compare``로 이전 결과와 비교합니다.
+
+    python benchmarks/suite.py --rules 100000 --output bench.json
+    python benchmarks/suite.py --rules 100000 --compare bench.json
+    python benchmarks/suite.py --source big.xml --stages load policy
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import synthetic
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _rss() -> int:
+    """현재 RSS (bytes)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return _peak_rss()
+
+
+def _peak_rss() -> int:
+    """프로세스 최대 RSS (bytes)"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    import psutil
+
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss)
+
+
+def _is_xml(path: str) -> bool:
+    return not path.lower().endswith(".json")
+
+
+def _read(path: str) -> Any:
+    """XML은 bytes, JSON은 dict로 읽기"""
+    if _is_xml(path):
+        with open(path, "rb") as f:
+            return f.read()
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _library(path: str):
+    from policy_module.parsers.library import ParsedLibrary
+
+    return ParsedLibrary(_read(path), from_xml=_is_xml(path))
+
+
+def _named(obj: Any) -> Iterator[dict]:
+    """이름 있는 요소(룰/그룹)를 문서 순서로 나열"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if "@name" in value:
+                yield value
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+
+
+# 단계: 이름 -> (준비 함수, 측정 함수). 준비 결과는 측정 대상에서 제외되며
+# 측정 함수는 처리한 레코드 수(또는 측정 후 호출할 개수 함수)를 반환
+def _stage_load(path: str) -> Tuple[Any, Callable[[Any], Any]]:
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    def run(raw: bytes) -> Callable[[], int]:
+        from policy_module.parsers.library import ParsedLibrary
+
+        if _is_xml(path):
+            library = ParsedLibrary(raw, from_xml=True)
+        else:
+            library = ParsedLibrary(json.loads(raw))
+        return lambda: sum(1 for _ in _named(library.rule_group))
+
+    return raw, run
+
+
+def _stage_policy(path: str):
+    from policy_module.parsers.policy_parser import PolicyParser
+
+    return _library(path), lambda library: len(PolicyParser(library).parse())
+
+
+def _stage_policy_compact(path: str):
+    from policy_module.parsers.policy_parser import PolicyParser
+
+    return _library(path), lambda library: len(PolicyParser(library, compact=True).parse())
+
+
+def _stage_conditions(path: str):
+    from policy_module.parsers.condition_parser import ConditionParser
+
+    conditions = [
+        obj["condition"] for obj in _named(_library(path).rule_group) if isinstance(obj.get("condition"), dict)
+    ]
+    return conditions, lambda conditions: sum(len(ConditionParser(c).parsed) for c in conditions)
+
+
+def _stage_lists(path: str):
+    from policy_module.parsers.lists_parser import ListsParser
+
+    return _library(path), lambda library: len(ListsParser(library).parse())
+
+
+def _stage_list_index(path: str):
+    from policy_module.list_index import ListValueIndex
+    from policy_module.policy_manager import PolicyManager
+
+    manager = PolicyManager(_library(path))
+    manager.parse_lists()
+
+    def run(lists: Dict[str, List[Any]]) -> int:
+        index = ListValueIndex.from_lists(lists)
+        # 리스트마다 첫 엔트리 값으로 역조회
+        for records in lists.values():
+            if records:
+                index.lookup(records[0].get("entry") or "")
+        return index.entries
+
+    return manager.lists, run
+
+
+def _stage_configurations(path: str):
+    from policy_module.parsers.configurations_parser import ConfigurationsParser
+
+    return _library(path), lambda library: len(ConfigurationsParser(library).parse())
+
+
+def _manager_records(manager) -> int:
+    return len(manager.parse_lists()) + len(manager.parse_configurations()) + len(manager.parse_policy())
+
+
+def _stage_manager(path: str):
+    from policy_module.policy_manager import PolicyManager
+
+    def run(data: Any) -> int:
+        return _manager_records(PolicyManager(data, from_xml=_is_xml(path)))
+
+    return _read(path), run
+
+
+def _stage_stream(path: str):
+    from policy_module.policy_manager import PolicyManager
+
+    if not _is_xml(path):
+        raise ValueError("stream 단계는 XML 소스만 지원합니다.")
+
+    def run(path: str) -> int:
+        manager = PolicyManager(path, from_xml=True, stream=True)
+        return sum(1 for _ in manager.iter_lists()) + sum(1 for _ in manager.iter_configurations()) + sum(
+            1 for _ in manager.iter_policy()
+        )
+
+    return path, run
+
+
+def _stage_store(path: str):
+    from sqlalchemy import create_engine, func, select
+    from sqlalchemy.orm import Session
+
+    import ppat_db.policy_db as models
+    from ppat_db.database import db
+    from policy_module.policy_store import PolicyStore
+
+    engine = create_engine("sqlite://")
+    db.Model.metadata.create_all(engine)
+
+    def run(data: Any) -> int:
+        with Session(engine) as session:
+            PolicyStore(session).store_from_source(data, from_xml=_is_xml(path))
+            return sum(
+                session.scalar(select(func.count()).select_from(model))
+                for model in (models.PolicyList, models.PolicyConfiguration, models.PolicyItem)
+            )
+
+    return _read(path), run
+
+
+STAGES: Dict[str, Callable[[str], Tuple[Any, Callable[[Any], Any]]]] = {
+    "load": _stage_load,
+    "policy": _stage_policy,
+    "policy_compact": _stage_policy_compact,
+    "conditions": _stage_conditions,
+    "lists": _stage_lists,
+    "list_index": _stage_list_index,
+    "configurations": _stage_configurations,
+    "manager": _stage_manager,
+    "stream": _stage_stream,
+    "store": _stage_store,
+}
+
+
+def measure(stage: str, path: str) -> Dict[str, Any]:
+    """현재 프로세스에서 단계 하나를 실행하여 측정"""
+    data, run = STAGES[stage](path)
+    rss_before = _rss()
+    start = time.perf_counter()
+    records = run(data)
+    seconds = time.perf_counter() - start
+    peak = _peak_rss()
+    if callable(records):
+        records = records()
+    return {
+        "stage": stage,
+        "records": records,
+        "seconds": seconds,
+        "records_per_sec": records / seconds if seconds else None,
+        "peak_rss": peak,
+        "rss_delta": max(peak - rss_before, 0),
+    }
+
+
+def run_stage(stage: str, path: str, repeat: int) -> Dict[str, Any]:
+    """새 프로세스에서 ``repeat``번 실행한 결과 중 가장 빠른 시간과 가장 작은 RSS"""
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-stage", stage, "--source", path],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            return {"stage": stage, "error": proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed"}
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda r: r["seconds"])
+    return dict(
+        best,
+        peak_rss=min(r["peak_rss"] for r in runs),
+        rss_delta=min(r["rss_delta"] for r in runs),
+        repeat=repeat,
+    )
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        out = subprocess.run(["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def environment() -> Dict[str, Any]:
+    """결과 비교에 필요한 실행 환경 정보"""
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _mb(value: Optional[int]) -> str:
+    return f"{value / 2**20:.1f}" if value is not None else "-"
+
+
+def report(results: List[Dict[str, Any]], previous: Optional[Dict[str, Any]] = None) -> None:
+    """단계별 결과 표 (``previous``가 있으면 시간/최대 RSS 비율 추가)"""
+    before = {r["stage"]: r for r in (previous or {}).get("stages", []) if "error" not in r}
+    header = f"{'stage':<16}{'records':>10}{'seconds':>10}{'rec/s':>12}{'peak MB':>10}{'delta MB':>10}"
+    if previous:
+        header += f"{'time x':>9}{'rss x':>8}"
+    print(header)
+    for r in results:
+        if "error" in r:
+            print(f"{r['stage']:<16}  error: {r['error']}")
+            continue
+        rate = f"{r['records_per_sec']:.0f}" if r["records_per_sec"] else "-"
+        line = f"{r['stage']:<16}{r['records']:>10}{r['seconds']:>10.2f}{rate:>12}{_mb(r['peak_rss']):>10}{_mb(r['rss_delta']):>10}"
+        old = before.get(r["stage"])
+        if old:
+            line += f"{r['seconds'] / old['seconds']:>9.2f}{r['peak_rss'] / old['peak_rss']:>8.2f}"
+        print(line)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--source", help="기존 내보내기 파일 (없으면 합성 데이터 생성)")
+    ap.add_argument("--format", choices=("xml", "json"), default="xml", help="합성 데이터 형식")
+    ap.add_argument("--workdir", help="합성 데이터를 저장/재사용할 디렉터리")
+    ap.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--output", help="결과 JSON 파일")
+    ap.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    ap.add_argument("--run-stage", choices=list(STAGES), help=argparse.SUPPRESS)
+    synthetic.spec_arguments(ap)
+    args = ap.parse_args()
+
+    if args.run_stage:
+        print(json.dumps(measure(args.run_stage, args.source)))
+        return
+
+    spec = None
+    path = args.source
+    if path is None:
+        spec = synthetic.spec_from_args(args)
+        workdir = args.workdir or tempfile.gettempdir()
+        os.makedirs(workdir, exist_ok=True)
+        # 같은 매개변수면 같은 파일이므로 재사용
+        name = "synthetic-" + "-".join(f"{v}" for v in asdict(spec).values())
+        path = os.path.join(workdir, f"{name}.{args.format}")
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            tmp_path = os.path.join(workdir, f"{name}.tmp.{args.format}")
+            synthetic.write(tmp_path, spec)
+            os.replace(tmp_path, path)
+            print(f"generated {path} in {time.perf_counter() - start:.1f}s")
+
+    stages = [s for s in args.stages if _is_xml(path) or s != "stream"]
+    results = [run_stage(stage, path, args.repeat) for stage in stages]
+    result = {
+        "environment": environment(),
+        "spec": asdict(spec) if spec else None,
+        "source": {"path": os.path.basename(path), "bytes": os.path.getsize(path)},
+        "stages": results,
+    }
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"compared with {previous['environment'].get('commit')}")
+    report(results, previous)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""합성 Skyhigh ``libraryContent`` 내보내기 생성기
+
+룰 수, 그룹 중첩 깊이, 룰당 조건식 수, 리스트 크기를 지정하여 실제
+내보내기와 같은 구조의 정책 데이터를 만듭니다. 같은 인자와 ``seed``면
+항상 같은 데이터가 생성되므로 커밋 간 벤치마크 결과를 비교할 수 있습니다.
+
+작은 데이터는 :func:`generate`로 dict를 바로 만들고, 큰 데이터(최대 100만
+룰)는 :func:`write_xml`/:func:`write_json`으로 최상위 그룹 단위로 나누어
+파일에 기록하므로 전체 문서를 메모리에 올리지 않습니다.
+
+    python benchmarks/synthetic.py out.xml --rules 1000000 --depth 3
+    python benchmarks/synthetic.py out.json --rules 10000 --conditions 4
+"""
+
+import argparse
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+LIST_TYPES = (
+    ("com.scur.type.string", "string", "example{}.com"),
+    ("com.scur.type.wildcard", "string", "*.site{}.net"),
+    ("com.scur.type.iprange", "ip", "10.{}.0.0/16"),
+    ("com.scur.type.category", "category", "Category {}"),
+    ("com.scur.type.mediatype", "string", "application/x-type{}"),
+)
+
+# (propertyId, operatorId, 값 종류)
+PROPERTIES = (
+    ("URL.Host", "in list", "list"),
+    ("URL.DestinationIP", "is in range list", "list"),
+    ("URL.Categories", "at least one in list", "list"),
+    ("Authentication.UserGroups", "at least one in list", "list"),
+    ("MediaType.FromFileExtension", "in list", "list"),
+    ("Authentication.IsAuthenticated", "equals", "boolean"),
+    ("Connection.Protocol", "equals", "string"),
+    ("Destination.Port", "equals", "number"),
+    ("Header.Get", "matches", "parameters"),
+)
+
+ACTIONS = (
+    "com.scur.engine.action.block",
+    "com.scur.engine.action.continue",
+    "com.scur.engine.action.stopcycle",
+    "com.scur.engine.action.redirect",
+)
+
+
+@dataclass
+class SyntheticSpec:
+    """합성 데이터 매개변수
+
+    Attributes:
+        rules: 전체 룰 수
+        depth: 루트 아래 그룹 중첩 깊이 (1이면 루트 > 그룹 > 룰)
+        groups: 최상위 그룹 수 (``None``이면 룰 1000개당 1개)
+        branching: 하위 그룹이 있는 그룹의 자식 그룹 수
+        conditions: 룰당 조건식 수
+        lists: 리스트 수
+        list_entries: 리스트당 엔트리 수
+        configurations: 설정 수
+        seed: 난수 시드
+    """
+
+    rules: int = 10000
+    depth: int = 2
+    groups: Optional[int] = None
+    branching: int = 3
+    conditions: int = 3
+    lists: int = 50
+    list_entries: int = 1000
+    configurations: int = 5
+    seed: int = 0
+
+    @property
+    def top_groups(self) -> int:
+        return self.groups or max(1, self.rules // 1000)
+
+    @property
+    def leaves_per_top_group(self) -> int:
+        return self.branching ** max(self.depth - 1, 0)
+
+
+class SyntheticRuleset:
+    """:class:`SyntheticSpec`에 따른 내보내기 구성 요소 생성"""
+
+    def __init__(self, spec: SyntheticSpec) -> None:
+        self.spec = spec
+        self._rule_id = 0
+        self._group_id = 0
+
+    def _random(self, *key: Any) -> random.Random:
+        # 구성 요소별 독립 시드: 생성 순서와 관계없이 같은 결과
+        return random.Random(f"{self.spec.seed}:" + ":".join(map(str, key)))
+
+    def _list_id(self, rnd: random.Random) -> str:
+        return f"list{rnd.randrange(max(self.spec.lists, 1))}"
+
+    def expression(self, rnd: random.Random, index: int, count: int) -> Dict[str, Any]:
+        prop, operator, kind = PROPERTIES[rnd.randrange(len(PROPERTIES))]
+        expr: Dict[str, Any] = {}
+        if index:
+            expr["@prefix"] = "AND" if rnd.random() < 0.7 else "OR"
+        if count > 2 and index == 1:
+            expr["@openingBracketCount"] = "1"
+        if count > 2 and index == count - 1:
+            expr["@closingBracketCount"] = "1"
+        expr["@operatorId"] = operator
+        instance: Dict[str, Any] = {"@propertyId": prop, "@useMostRecentConfiguration": "false"}
+        if kind == "list":
+            parameter = {"@valueType": "list", "value": {"listValue": {"@id": self._list_id(rnd)}}}
+        elif kind == "boolean":
+            parameter = {"@valueType": "value", "value": {"stringValue": {
+                "@value": rnd.choice(("true", "false")), "@typeId": "com.scur.type.boolean"}}}
+        elif kind == "number":
+            parameter = {"@valueType": "value", "value": {"stringValue": {
+                "@value": str(rnd.choice((80, 443, 8080, 3128))), "@typeId": "com.scur.type.number"}}}
+        elif kind == "string":
+            parameter = {"@valueType": "value", "value": {"stringValue": {
+                "@value": rnd.choice(("HTTP", "HTTPS", "FTP")), "@typeId": "com.scur.type.string"}}}
+        else:
+            instance["parameters"] = {"entry": {
+                "string": "name",
+                "parameter": {"@valueType": "value", "value": {"stringValue": {
+                    "@value": rnd.choice(("User-Agent", "Referer", "X-Forwarded-For")),
+                    "@typeId": "com.scur.type.string"}}},
+            }}
+            parameter = {"@valueType": "value", "value": {"stringValue": {
+                "@value": f".*pattern{rnd.randrange(100)}.*", "@typeId": "com.scur.type.regex"}}}
+        expr["propertyInstance"] = instance
+        expr["parameter"] = parameter
+        return expr
+
+    def condition(self, rnd: random.Random, count: int) -> Optional[Dict[str, Any]]:
+        if count <= 0:
+            return None
+        exprs = [self.expression(rnd, i, count) for i in range(count)]
+        return {"@always": "false", "expressions": {"conditionExpression": _many(exprs)}}
+
+    def rule(self) -> Dict[str, Any]:
+        self._rule_id += 1
+        rid = self._rule_id
+        rnd = self._random("rule", rid)
+        rule: Dict[str, Any] = {
+            "@id": f"rule-{rid}",
+            "@name": f"Rule {rid}",
+            "@enabled": "true" if rnd.random() < 0.9 else "false",
+        }
+        if rnd.random() < 0.3:
+            rule["description"] = f"Synthetic rule {rid}"
+        condition = self.condition(rnd, self.spec.conditions)
+        if condition:
+            rule["condition"] = condition
+        rule["actionContainer"] = {"@actionId": rnd.choice(ACTIONS), "@enabled": "true"}
+        rule["immediateActionContainers"] = {
+            "executionContainer": {"@eventId": "com.scur.engine.event.statistics", "@enabled": "true"}
+        } if rnd.random() < 0.2 else None
+        return rule
+
+    def group(self, level: int, rules: int) -> Dict[str, Any]:
+        """``level`` 단계 그룹 (``rules``개 룰을 리프 그룹에 분배)"""
+        self._group_id += 1
+        gid = self._group_id
+        rnd = self._random("group", gid)
+        group: Dict[str, Any] = {
+            "@id": f"group-{gid}",
+            "@name": f"Group {gid}",
+            "@enabled": "true",
+            "@defaultRights": "2",
+            "@cycleRequest": "true",
+            "@cycleResponse": "true" if rnd.random() < 0.5 else "false",
+            "@cycleEmbeddedObject": "false",
+            "@cloudSynced": "false",
+            "acElements": {"accessControlElement": {"@principal": "admin", "@rights": "7"}},
+        }
+        if rnd.random() < 0.5:
+            group["description"] = f"Synthetic group {gid}"
+        condition = self.condition(rnd, 1 if rnd.random() < 0.5 else 0)
+        if condition:
+            group["condition"] = condition
+        if level >= self.spec.depth:
+            group["rules"] = {"rule": _many([self.rule() for _ in range(rules)])} if rules else None
+        else:
+            shares = _split(rules, self.spec.branching)
+            group["rules"] = None
+            group["ruleGroups"] = {"ruleGroup": _many([self.group(level + 1, share) for share in shares])}
+        return group
+
+    def top_groups(self) -> Iterator[Dict[str, Any]]:
+        """최상위 그룹을 하나씩 생성"""
+        for share in _split(self.spec.rules, self.spec.top_groups):
+            yield self.group(1, share)
+
+    def root(self) -> Dict[str, Any]:
+        """최상위 그룹을 제외한 루트 그룹 속성"""
+        return {"@id": "root", "@name": "Root", "@enabled": "true", "@defaultRights": "2",
+                "@cycleRequest": "true", "@cycleResponse": "true", "@cycleEmbeddedObject": "false",
+                "@cloudSynced": "false"}
+
+    def lists(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.spec.lists):
+            type_id, classifier, pattern = LIST_TYPES[i % len(LIST_TYPES)]
+            entries = [
+                {"entry": pattern.format(j), "description": f"entry {j}" if j % 10 == 0 else None}
+                for j in range(self.spec.list_entries)
+            ]
+            yield {"list": {
+                "@id": f"list{i}",
+                "@name": f"List {i}",
+                "@typeId": type_id,
+                "@classifier": classifier,
+                "description": f"Synthetic list {i}",
+                "content": {"listEntry": _many(entries)} if entries else None,
+            }}
+
+    def configurations(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.spec.configurations):
+            yield {
+                "@id": f"conf-{i}",
+                "@name": f"Configuration {i}",
+                "@version": "1",
+                "@mwg-version": "11.2",
+                "@templateId": "com.scur.template",
+                "@targetId": f"target-{i}",
+                "description": f"Synthetic configuration {i}",
+                "configurationProperties": {"configurationProperty": [
+                    {"@key": f"key{k}", "@value": f"value{k}", "@type": "com.scur.type.string", "@encrypted": "false"}
+                    for k in range(5)
+                ]},
+            }
+
+
+def _many(items: List[Any]) -> Any:
+    """xmltodict처럼 요소가 하나면 리스트 대신 그 요소 자체"""
+    if not items:
+        return None
+    return items if len(items) > 1 else items[0]
+
+
+def _split(total: int, parts: int) -> List[int]:
+    parts = max(parts, 1)
+    base, extra = divmod(total, parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
+
+
+def generate(spec: Optional[SyntheticSpec] = None, **params: Any) -> Dict[str, Any]:
+    """``PolicyManager`` 등에 바로 넘길 수 있는 dict 형태의 내보내기 생성"""
+    spec = spec or SyntheticSpec(**params)
+    ruleset = SyntheticRuleset(spec)
+    root = dict(ruleset.root(), rules=None)
+    root["ruleGroups"] = {"ruleGroup": _many(list(ruleset.top_groups()))}
+    return {"libraryContent": {
+        "lists": {"entry": _many(list(ruleset.lists()))},
+        "configurations": {"configuration": _many(list(ruleset.configurations()))},
+        "ruleGroup": root,
+    }}
+
+
+_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"))
+_SPECIAL = frozenset("&<>\"")
+
+
+def _escape(text: str) -> str:
+    # 생성 값 대부분은 특수 문자가 없으므로 검사만 하고 그대로 사용
+    if _SPECIAL.isdisjoint(text):
+        return text
+    for char, entity in _ESCAPES:
+        text = text.replace(char, entity)
+    return text
+
+
+def _xml(tag: str, value: Any, out: List[str]) -> None:
+    """xmltodict.unparse와 같은 규칙으로 요소를 문자열 조각으로 변환"""
+    if isinstance(value, list):
+        for item in value:
+            _xml(tag, item, out)
+        return
+    if value is None:
+        out.append(f"<{tag}></{tag}>")
+        return
+    if not isinstance(value, dict):
+        out.append(f"<{tag}>{_escape(str(value))}</{tag}>")
+        return
+    out.append(f"<{tag}")
+    children = []
+    for key, child in value.items():
+        if key[0] == "@":
+            out.append(f' {key[1:]}="{_escape(str(child))}"')
+        else:
+            children.append((key, child))
+    out.append(">")
+    for key, child in children:
+        _xml(key, child, out)
+    out.append(f"</{tag}>")
+
+
+def write_xml(path: str, spec: SyntheticSpec) -> None:
+    """XML 내보내기를 최상위 그룹 단위로 기록"""
+    ruleset = SyntheticRuleset(spec)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<libraryContent>')
+        out: List[str] = []
+        _xml("lists", {"entry": _many(list(ruleset.lists()))}, out)
+        _xml("configurations", {"configuration": _many(list(ruleset.configurations()))}, out)
+        f.write("".join(out))
+        root = ruleset.root()
+        attrs = "".join(f' {k[1:]}="{_escape(v)}"' for k, v in root.items())
+        f.write(f"<ruleGroup{attrs}><rules></rules><ruleGroups>")
+        for group in ruleset.top_groups():
+            out = []
+            _xml("ruleGroup", group, out)
+            f.write("".join(out))
+        f.write("</ruleGroups></ruleGroup></libraryContent>\n")
+
+
+def write_json(path: str, spec: SyntheticSpec) -> None:
+    """JSON(xmltodict 구조) 내보내기를 최상위 그룹 단위로 기록"""
+    ruleset = SyntheticRuleset(spec)
+    with open(path, "w", encoding="utf-8") as f:
+        root = dict(ruleset.root(), rules=None)
+        head = json.dumps(root)[:-1]
+        f.write('{"libraryContent": {')
+        f.write('"lists": ' + json.dumps({"entry": _many(list(ruleset.lists()))}) + ", ")
+        f.write('"configurations": ' + json.dumps({"configuration": _many(list(ruleset.configurations()))}) + ", ")
+        f.write('"ruleGroup": ' + head + ', "ruleGroups": {"ruleGroup": ')
+        if spec.top_groups > 1:
+            f.write("[")
+        for i, group in enumerate(ruleset.top_groups()):
+            if i:
+                f.write(", ")
+            f.write(json.dumps(group))
+        f.write("]}}}}\n" if spec.top_groups > 1 else "}}}}\n")
+
+
+def write(path: str, spec: SyntheticSpec) -> None:
+    """확장자(``.xml``/``.json``)에 따라 내보내기 파일 생성"""
+    if os.fspath(path).lower().endswith(".json"):
+        write_json(path, spec)
+    else:
+        write_xml(path, spec)
+
+
+def spec_arguments(ap: argparse.ArgumentParser) -> None:
+    """:class:`SyntheticSpec` 필드를 명령행 인자로 추가"""
+    defaults = SyntheticSpec()
+    ap.add_argument("--rules", type=int, default=defaults.rules)
+    ap.add_argument("--depth", type=int, default=defaults.depth)
+    ap.add_argument("--groups", type=int, default=defaults.groups)
+    ap.add_argument("--branching", type=int, default=defaults.branching)
+    ap.add_argument("--conditions", type=int, default=defaults.conditions)
+    ap.add_argument("--lists", type=int, default=defaults.lists)
+    ap.add_argument("--list-entries", type=int, default=defaults.list_entries)
+    ap.add_argument("--configurations", type=int, default=defaults.configurations)
+    ap.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace, **overrides: Any) -> SyntheticSpec:
+    params = {name: getattr(args, name) for name in asdict(SyntheticSpec()) if hasattr(args, name)}
+    params.update(overrides)
+    return SyntheticSpec(**params)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("output", help=".xml 또는 .json 파일 경로")
+    spec_arguments(ap)
+    args = ap.parse_args()
+    spec = spec_from_args(args)
+    write(args.output, spec)
+    print(f"{args.output}: {os.path.getsize(args.output) / 2**20:.1f} MB ({spec})")
+
+
+if __name__ == "__main__":
+    main()
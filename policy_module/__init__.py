@@ -8,7 +8,16 @@ from .policy_manager import PolicyManager
 from .parsers.policy_parser import PolicyParser
 from .parsers.lists_parser import ListsParser
 from .parsers.configurations_parser import ConfigurationsParser
-from .parsers.condition_parser import ConditionParser
+from .parsers.condition_parser import ConditionParser, ConditionCache
+from .parsers.library import ParsedLibrary
+from .parsers.columnar import ColumnarSource
+from .parse_cache import ParseCache
+from .list_index import ListValueIndex
+from .list_refs import ListRef
+from .policy_diff import PolicyDiff
+from .policy_search import PolicySearch
+from .snapshot_store import SnapshotStore
+from .instrumentation import Instrumentation, LogSink, JsonFileSink, HttpSink
 
 __all__ = [
     'PolicyConfig',
@@ -16,5 +25,18 @@ __all__ = [
     'PolicyParser',
     'ListsParser',
     'ConfigurationsParser',
-    'ConditionParser'
+    'ConditionParser',
+    'ConditionCache',
+    'ParsedLibrary',
+    'ParseCache',
+    'ListValueIndex',
+    'ListRef',
+    'PolicyDiff',
+    'PolicySearch',
+    'SnapshotStore',
+    'ColumnarSource',
+    'Instrumentation',
+    'LogSink',
+    'JsonFileSink',
+    'HttpSink'
 ]
@@ -0,0 +1,220 @@
+"""Skyhigh SWG 비동기 API 클라이언트
+
+:class:`SkyhighSWGClient`와 같은 ``list_rulesets``/``export_ruleset`` API를
+``httpx.AsyncClient`` 위에서 제공합니다. 스레드 없이 이벤트 루프 하나에서
+여러 어플라이언스를 동시에 호출할 수 있습니다.
+
+- 어플라이언스마다 HTTP 연결을 ``pool_size``개까지 유지합니다.
+- 세션이 만료되면(401) 다시 로그인한 뒤 요청을 재시도합니다.
+
+``httpx``가 필요합니다 (``pip install httpx``).
+
+    async def main(proxies):
+        return await export_proxies_async(proxies, max_concurrency=32)
+
+    results = asyncio.run(main(config.proxies))
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+import httpx
+
+from ..config import ProxyConfig
+from .skyhigh_client import (
+    DEFAULT_POOL_SIZE, SESSION_EXPIRED_STATUS, parse_rulesets, rulesets_fingerprint, session_id_from_headers,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 32
+
+
+class AsyncSkyhighSWGClient:
+    """Skyhigh SWG 비동기 API 클라이언트"""
+
+    def __init__(self, proxy_config: ProxyConfig, pool_size: int = DEFAULT_POOL_SIZE, timeout: Optional[float] = None):
+        """
+        Args:
+            proxy_config (ProxyConfig): 프록시 설정
+            pool_size (int): 이 어플라이언스로 유지할 HTTP 연결 수
+            timeout (float): 요청 제한 시간 (초, None이면 제한 없음)
+        """
+        self.proxy_config = proxy_config
+        self.client = httpx.AsyncClient(
+            verify=False,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self.session_id = None
+        self._login_lock = asyncio.Lock()
+
+    async def login(self):
+        """API 로그인 및 세션 설정"""
+        login_url = urljoin(self.proxy_config.base_url + '/', 'login')
+        response = await self.client.post(login_url, auth=(self.proxy_config.username, self.proxy_config.password))
+
+        if response.status_code == 200:
+            self.session_id = session_id_from_headers(response.headers)
+            if self.session_id:
+                logger.info(f"프록시 {self.proxy_config.base_url} 로그인 성공")
+            else:
+                raise Exception("세션 ID를 찾을 수 없습니다.")
+        else:
+            raise Exception(f"로그인 실패: {response.status_code} {response.text}")
+
+    async def ensure_login(self):
+        """로그인되어 있지 않으면 로그인 (동시에 호출해도 한 번만)"""
+        async with self._login_lock:
+            if not self.session_id:
+                await self.login()
+
+    async def _relogin(self, expired_session_id):
+        """만료된 세션으로 다시 로그인 (다른 작업이 이미 다시 로그인했으면 생략)"""
+        async with self._login_lock:
+            if self.session_id == expired_session_id:
+                logger.info(f"프록시 {self.proxy_config.base_url} 세션 만료, 다시 로그인")
+                self.session_id = None
+                await self.login()
+
+    async def _request(self, method, endpoint, **kwargs):
+        """API 요청 (세션이 만료되었으면 다시 로그인 후 한 번 재시도)"""
+        session_id = self.session_id
+        response = await self.client.request(method, self._build_url(endpoint), **kwargs)
+        if response.status_code in SESSION_EXPIRED_STATUS:
+            await self._relogin(session_id)
+            response = await self.client.request(method, self._build_url(endpoint), **kwargs)
+        return response
+
+    def _build_url(self, endpoint):
+        """API 엔드포인트 URL 생성"""
+        if not self.session_id:
+            raise Exception("세션 ID가 없습니다. 먼저 로그인해야 합니다.")
+        # 로그인 응답의 JSESSIONID 쿠키가 세션에 저장되어 인증하므로 URL에는 붙이지 않음
+        return urljoin(self.proxy_config.base_url + '/', endpoint)
+
+    async def logout(self):
+        """API 로그아웃"""
+        response = await self.client.post(self._build_url('logout'))
+        self.session_id = None
+        if response.is_success:
+            logger.info(f"프록시 {self.proxy_config.base_url} 로그아웃 완료")
+        else:
+            raise Exception(f"로그아웃 실패: {response.status_code} {response.text}")
+
+    async def list_rulesets(self, top_level_only=False, page=1, page_size=-1) -> List[Dict]:
+        """Rule Set 목록 조회 (:meth:`SkyhighSWGClient.list_rulesets`와 같음)"""
+        params = {
+            'topLevelOnly': str(top_level_only).lower(),
+            'page': page,
+            'pageSize': page_size
+        }
+        response = await self._request('GET', 'rulesets', params=params)
+
+        if response.is_success:
+            return parse_rulesets(response.text)
+        else:
+            raise Exception(f"Rule Set 목록 조회 실패: {response.status_code} {response.text}")
+
+    async def fingerprint(self) -> str:
+        """전체 Rule Set 목록 지문 (:meth:`SkyhighSWGClient.fingerprint`와 같음)"""
+        return rulesets_fingerprint(await self.list_rulesets())
+
+    async def export_ruleset(self, ruleset_id, title) -> bytes:
+        """Rule Set 내보내기 XML (:meth:`SkyhighSWGClient.export_ruleset`와 같음)"""
+        response = await self._request('POST', f'rulesets/rulegroups/{ruleset_id}/export')
+
+        if response.is_success:
+            logger.info(f"Rule Set '{title}'이(가) 추출 되었습니다.")
+            return response.content
+        else:
+            raise Exception(f"Rule Set '{title}' 내보내기 실패: {response.status_code} {response.text}")
+
+    async def export_rulesets(self, rulesets, max_workers=DEFAULT_POOL_SIZE) -> AsyncIterator[Tuple[Dict, bytes]]:
+        """여러 Rule Set을 동시에 내보내고 끝나는 순서대로 (Rule Set, XML) 반환
+
+        하나라도 실패하면 남은 내보내기를 취소하고 예외를 전달합니다.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def export(ruleset):
+            async with semaphore:
+                return ruleset, await self.export_ruleset(ruleset['id'], ruleset['title'])
+
+        tasks = [asyncio.ensure_future(export(ruleset)) for ruleset in rulesets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        try:
+            await self.login()
+        except BaseException:
+            await self.aclose()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.logout()
+        finally:
+            await self.aclose()
+
+
+async def export_proxy_async(proxy: ProxyConfig, client: Optional[AsyncSkyhighSWGClient] = None):
+    """프록시 하나의 메인 Rule Set 내보내기 (:func:`export_proxy`의 비동기 버전)
+
+    ``client``를 주면 로그인한 세션을 재사용하고 로그아웃하지 않습니다.
+    """
+    from ..proxy_export import ProxyExport
+
+    start = time.perf_counter()
+    result = ProxyExport(proxy)
+    try:
+        if client is None:
+            async with AsyncSkyhighSWGClient(proxy) as client:
+                await _export_main(client, result)
+        else:
+            await client.ensure_login()
+            await _export_main(client, result)
+    except Exception as e:
+        logger.error(f"프록시 {proxy.base_url} 내보내기 실패: {e}")
+        result.error = str(e)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+async def _export_main(client: AsyncSkyhighSWGClient, result):
+    result.ruleset = (await client.list_rulesets(top_level_only=True))[0]
+    result.content = await client.export_ruleset(result.ruleset['id'], result.ruleset['title'])
+    result.size = len(result.content)
+
+
+async def export_proxies_async(proxies: Iterable[ProxyConfig], max_concurrency: int = DEFAULT_CONCURRENCY):
+    """여러 프록시를 이벤트 루프 하나에서 동시에 내보내기
+
+    Args:
+        proxies: 내보낼 프록시
+        max_concurrency: 동시에 진행할 내보내기 수
+
+    Returns:
+        list: :class:`ProxyExport` 목록 (``proxies`` 순서)
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency는 1 이상이어야 합니다.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def export(proxy):
+        async with semaphore:
+            return await export_proxy_async(proxy)
+
+    return await asyncio.gather(*(export(proxy) for proxy in proxies))
@@ -0,0 +1,86 @@
+"""Skyhigh SWG 로그인 세션 풀
+
+:class:`SkyhighSWGClient`를 ``with`` 블록으로 쓰면 블록마다 로그인/로그아웃을
+하고 TLS 연결도 새로 맺습니다. 동기화 작업처럼 같은 어플라이언스를 여러 번
+호출할 때는 :class:`SessionPool`이 어플라이언스(``base_url``)별로 로그인한
+클라이언트를 하나씩 유지하여 세션과 keep-alive 연결을 재사용합니다.
+
+- 클라이언트마다 HTTP 연결 풀을 ``pool_size``개로 맞춥니다.
+- 세션이 만료되면(401) 클라이언트가 다시 로그인한 뒤 요청을 재시도합니다.
+- 로그아웃은 :meth:`SessionPool.close` (또는 ``with`` 블록 종료) 때 한 번만 합니다.
+
+    with SessionPool(pool_size=8) as pool:
+        for proxy in config.proxies:
+            client = pool.client(proxy)
+            rulesets = client.list_rulesets(top_level_only=True)
+"""
+
+import logging
+import threading
+from contextlib import nullcontext
+from typing import ContextManager, Dict, Optional
+
+from ..config import ProxyConfig
+from .skyhigh_client import DEFAULT_POOL_SIZE, SkyhighSWGClient
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """어플라이언스별로 로그인한 :class:`SkyhighSWGClient`를 재사용하는 풀
+
+    여러 스레드에서 동시에 :meth:`client`를 호출해도 어플라이언스마다 로그인은
+    한 번만 합니다.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        """
+        Args:
+            pool_size (int): 어플라이언스마다 유지할 HTTP 연결 수
+        """
+        self.pool_size = pool_size
+        self._clients: Dict[str, SkyhighSWGClient] = {}
+        self._lock = threading.Lock()
+
+    def client(self, proxy_config: ProxyConfig) -> SkyhighSWGClient:
+        """로그인한 클라이언트 (처음 요청한 어플라이언스면 생성 후 로그인)"""
+        with self._lock:
+            client = self._clients.get(proxy_config.base_url)
+            if client is None:
+                client = SkyhighSWGClient(proxy_config, pool_size=self.pool_size)
+                self._clients[proxy_config.base_url] = client
+        client.ensure_login()
+        return client
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def close(self):
+        """모든 세션 로그아웃 (실패는 로그만 남김)"""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                if client.session_id:
+                    client.logout()
+            except Exception as e:
+                logger.warning(f"프록시 {client.proxy_config.base_url} 로그아웃 실패: {e}")
+            finally:
+                client.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def client_session(proxy_config: ProxyConfig, pool: Optional[SessionPool] = None) -> ContextManager[SkyhighSWGClient]:
+    """``with`` 블록용 클라이언트
+
+    ``pool``이 없으면 블록마다 로그인/로그아웃하는 새 클라이언트, 있으면 풀의
+    세션을 그대로 빌려줍니다 (블록이 끝나도 로그아웃하지 않음).
+    """
+    if pool is None:
+        return SkyhighSWGClient(proxy_config)
+    return nullcontext(pool.client(proxy_config))
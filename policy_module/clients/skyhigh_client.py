@@ -4,12 +4,16 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 from urllib.parse import urljoin
 import xml.etree.ElementTree as ET
 import logging
 import urllib3
 from datetime import datetime
+import hashlib
 import os
 import re
 import xmltodict
@@ -23,6 +27,51 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# 세션이 만료되었을 때 API가 돌려주는 상태 코드 (다시 로그인 후 재시도)
+SESSION_EXPIRED_STATUS = (401,)
+
+
+def parse_rulesets(text):
+    """``rulesets`` 응답 XML을 Rule Set 목록으로 변환"""
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as e:
+        logger.error(f"XML 파싱 오류: {e}")
+        raise
+    rulesets = []
+    for entry in root.findall('entry'):
+        rule = {
+            'id': entry.findtext('id', default=''),
+            'title': entry.findtext('title', default=''),
+            'position': entry.findtext('position', default=''),
+            'enabled': entry.findtext('enabled', default=''),
+            'no_of_child': entry.findtext('noOfChild', default=''),
+            'link': entry.find('link').get('href') if entry.find('link') is not None else None,
+            'parent_id': None
+        }
+        rulesets.append(rule)
+    return rulesets
+
+
+# 변경 감지에 쓰는 Rule Set 메타데이터 (link는 세션마다 달라질 수 있어 제외)
+FINGERPRINT_FIELDS = ('id', 'title', 'position', 'enabled', 'no_of_child')
+
+
+def rulesets_fingerprint(rulesets):
+    """Rule Set 목록 메타데이터의 SHA-256 (내보내기 전 변경 감지용)"""
+    rows = [[ruleset.get(name) for name in FINGERPRINT_FIELDS] for ruleset in rulesets]
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def session_id_from_headers(headers):
+    """로그인 응답의 ``Set-Cookie``에서 JSESSIONID 추출"""
+    for cookie in headers.get('Set-Cookie', '').split(';'):
+        if cookie.strip().startswith('JSESSIONID='):
+            return cookie.strip().split('=')[1]
+    return None
+
 class SkyhighSWGClient:
     """Skyhigh SWG API 클라이언트
     
@@ -30,14 +79,27 @@ class SkyhighSWGClient:
     세션 관리와 정책 데이터 내보내기 기능을 제공합니다.
     """
     
-    def __init__(self, proxy_config: ProxyConfig):
+    def __init__(self, proxy_config: ProxyConfig, pool_size=DEFAULT_POOL_SIZE):
         """
         Args:
             proxy_config (ProxyConfig): 프록시 설정
+            pool_size (int): 이 어플라이언스로 유지할 HTTP 연결 수
         """
         self.proxy_config = proxy_config
         self.session = requests.Session()
         self.session_id = None
+        self.pool_size = 0
+        self._login_lock = threading.Lock()
+        self._mount(pool_size)
+
+    def _mount(self, pool_size):
+        """HTTP 연결 풀 크기 설정 (keep-alive 연결을 ``pool_size``개까지 재사용)"""
+        if pool_size <= self.pool_size:
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.pool_size = pool_size
 
     def login(self):
         """API 로그인 및 세션 설정"""
@@ -49,11 +111,7 @@ class SkyhighSWGClient:
         )
         
         if response.status_code == 200:
-            if 'Set-Cookie' in response.headers:
-                for cookie in response.headers['Set-Cookie'].split(';'):
-                    if cookie.strip().startswith('JSESSIONID='):
-                        self.session_id = cookie.strip().split('=')[1]
-                        break
+            self.session_id = session_id_from_headers(response.headers)
             if self.session_id:
                 logger.info(f"프록시 {self.proxy_config.base_url} 로그인 성공")
             else:
@@ -61,16 +119,42 @@ class SkyhighSWGClient:
         else:
             raise Exception(f"로그인 실패: {response.status_code} {response.text}")
 
+    def ensure_login(self):
+        """로그인되어 있지 않으면 로그인 (여러 스레드에서 호출해도 한 번만)"""
+        with self._login_lock:
+            if not self.session_id:
+                self.login()
+
+    def _relogin(self, expired_session_id):
+        """만료된 세션으로 다시 로그인 (다른 스레드가 이미 다시 로그인했으면 생략)"""
+        with self._login_lock:
+            if self.session_id == expired_session_id:
+                logger.info(f"프록시 {self.proxy_config.base_url} 세션 만료, 다시 로그인")
+                self.session_id = None
+                self.login()
+
+    def _request(self, method, endpoint, **kwargs):
+        """API 요청 (세션이 만료되었으면 다시 로그인 후 한 번 재시도)"""
+        session_id = self.session_id
+        response = self.session.request(method, self._build_url(endpoint), verify=False, **kwargs)
+        if response.status_code in SESSION_EXPIRED_STATUS:
+            response.close()
+            self._relogin(session_id)
+            response = self.session.request(method, self._build_url(endpoint), verify=False, **kwargs)
+        return response
+
     def _build_url(self, endpoint):
         """API 엔드포인트 URL 생성"""
         if not self.session_id:
             raise Exception("세션 ID가 없습니다. 먼저 로그인해야 합니다.")
-        return urljoin(self.proxy_config.base_url + '/', f"{endpoint};jsessionid={self.session_id}")
+        # 로그인 응답의 JSESSIONID 쿠키가 세션에 저장되어 인증하므로 URL에는 붙이지 않음
+        return urljoin(self.proxy_config.base_url + '/', endpoint)
 
     def logout(self):
         """API 로그아웃"""
         logout_url = self._build_url('logout')
         response = self.session.post(logout_url, verify=False)
+        self.session_id = None
         if response.ok:
             logger.info(f"프록시 {self.proxy_config.base_url} 로그아웃 완료")
         else:
@@ -92,31 +176,17 @@ class SkyhighSWGClient:
             'page': page,
             'pageSize': page_size
         }
-        url = self._build_url('rulesets')
-        response = self.session.get(url, params=params, verify=False)
+        response = self._request('GET', 'rulesets', params=params)
         
         if response.ok:
-            try:
-                root = ET.fromstring(response.text)
-                rulesets = []
-                for entry in root.findall('entry'):
-                    rule = {
-                        'id': entry.findtext('id', default=''),
-                        'title': entry.findtext('title', default=''),
-                        'position': entry.findtext('position', default=''),
-                        'enabled': entry.findtext('enabled', default=''),
-                        'no_of_child': entry.findtext('noOfChild', default=''),
-                        'link': entry.find('link').get('href') if entry.find('link') is not None else None,
-                        'parent_id': None
-                    }
-                    rulesets.append(rule)
-                return rulesets
-            except ET.ParseError as e:
-                logger.error(f"XML 파싱 오류: {e}")
-                raise
+            return parse_rulesets(response.text)
         else:
             raise Exception(f"Rule Set 목록 조회 실패: {response.status_code} {response.text}")
 
+    def fingerprint(self):
+        """전체 Rule Set 목록 지문 (:func:`rulesets_fingerprint`, 목록 조회 한 번)"""
+        return rulesets_fingerprint(self.list_rulesets())
+
     def export_ruleset(self, ruleset_id, title):
         """Rule Set을 내보내고 파싱
         
@@ -127,8 +197,7 @@ class SkyhighSWGClient:
         Returns:
             뭐라고 해야해 이거
         """
-        url = self._build_url(f'rulesets/rulegroups/{ruleset_id}/export')
-        response = self.session.post(url, verify=False)
+        response = self._request('POST', f'rulesets/rulegroups/{ruleset_id}/export')
         
         if response.ok:
             logger.info(f"Rule Set '{title}'이(가) 추출 되었습니다.")
@@ -136,6 +205,56 @@ class SkyhighSWGClient:
         else:
             raise Exception(f"Rule Set '{title}' 내보내기 실패: {response.status_code} {response.text}")
 
+    def export_ruleset_stream(self, ruleset_id, title, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Rule Set 내보내기 본문을 청크 단위로 읽기
+
+        응답 본문 전체를 메모리에 두지 않고 ``chunk_size`` bytes씩 돌려줍니다.
+        요청은 순회를 시작할 때 보내고, 끝까지 읽거나 순회를 멈추면 연결을 반환합니다.
+
+        Args:
+            ruleset_id (str): Rule Set ID
+            title (str): Rule Set 제목
+            chunk_size (int): 청크 크기
+
+        Yields:
+            bytes: 내보내기 XML 청크
+        """
+        response = self._request('POST', f'rulesets/rulegroups/{ruleset_id}/export', stream=True)
+        with response:
+            if not response.ok:
+                raise Exception(f"Rule Set '{title}' 내보내기 실패: {response.status_code} {response.text}")
+            yield from response.iter_content(chunk_size)
+        logger.info(f"Rule Set '{title}'이(가) 추출 되었습니다.")
+
+    def export_rulesets(self, rulesets, max_workers=4):
+        """여러 Rule Set을 동시에 내보내기
+
+        로그인한 세션 하나를 공유하며, 동시에 ``max_workers``개의 요청을 보낼 수
+        있도록 HTTP 연결 풀을 (필요하면) 늘립니다.
+
+        Args:
+            rulesets (list): ``list_rulesets`` 항목
+            max_workers (int): 동시에 내보낼 Rule Set 수
+
+        Yields:
+            tuple: 끝나는 순서대로 (Rule Set, 내보내기 XML bytes)
+
+        Raises:
+            Exception: 하나라도 실패하면 남은 내보내기를 취소하고 예외 전달
+        """
+        self._mount(max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ruleset-export') as pool:
+            futures = {
+                pool.submit(self.export_ruleset, ruleset['id'], ruleset['title']): ruleset
+                for ruleset in rulesets
+            }
+            try:
+                for future in as_completed(futures):
+                    yield futures.pop(future), future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
     def __enter__(self):
         self.login()
         return self
@@ -0,0 +1,88 @@
+"""내보내기 스트림 스풀
+
+``export_ruleset``은 내보내기 전체를 bytes로 받고, ``xmltodict``가 다시 전체를
+dict로 만들므로 Rule Set 크기만큼 메모리가 두 번 필요합니다.
+:class:`ExportSpool`은 HTTP 응답 본문(``iter_content``) 청크를 그대로 증분 XML
+파서(:class:`LibraryStream`)에 넘기면서 gzip 파일에 함께 기록합니다.
+
+스트리밍 파서는 섹션(리스트, 설정, 정책)마다 소스를 한 번씩 읽으므로 첫
+번째 순회만 네트워크에서 읽고, 이후 순회는 압축 파일에서 읽습니다. 메모리에는
+청크 하나와 파싱 중인 레코드만 남습니다.
+
+    with ExportSpool(client.export_ruleset_stream(ruleset_id, title), path="export.xml.gz") as spool:
+        store.store_from_source(spool, from_xml=True, stream=True, batch_size=1000)
+"""
+
+import gzip
+import os
+import tempfile
+from typing import Iterable, Iterator, Optional
+
+from .parsers.xml_stream import DEFAULT_CHUNK_SIZE
+
+DEFAULT_COMPRESSLEVEL = 6
+
+
+class ExportSpool:
+    """여러 번 순회할 수 있는 내보내기 청크 소스
+
+    Attributes:
+        path: 압축 파일 경로
+        size: 기록한 압축 전 크기 (첫 번째 순회가 끝나면 전체 크기)
+        complete: 원본 스트림을 끝까지 읽었는지
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[bytes],
+        path: Optional[str] = None,
+        compresslevel: int = DEFAULT_COMPRESSLEVEL,
+    ):
+        """
+        Args:
+            chunks: 내보내기 본문 청크 (``SkyhighSWGClient.export_ruleset_stream``)
+            path: 압축 파일을 남길 경로. 없으면 임시 파일에 기록하고 :meth:`close`에서 삭제
+            compresslevel: gzip 압축 수준
+        """
+        self._chunks = chunks
+        self.keep = path is not None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="export-", suffix=".xml.gz")
+            os.close(fd)
+        self.path = path
+        self.compresslevel = compresslevel
+        self.size = 0
+        self.complete = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.complete:
+            return self._read()
+        if self._chunks is None:
+            raise ValueError("내보내기 스트림을 끝까지 읽지 못해 다시 읽을 수 없습니다.")
+        chunks, self._chunks = self._chunks, None
+        return self._tee(chunks)
+
+    def _tee(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """원본 청크를 넘기면서 압축 파일에 기록"""
+        with gzip.open(self.path, "wb", compresslevel=self.compresslevel) as out:
+            for chunk in chunks:
+                if chunk:
+                    out.write(chunk)
+                    self.size += len(chunk)
+                    yield chunk
+        self.complete = True
+
+    def _read(self) -> Iterator[bytes]:
+        with gzip.open(self.path, "rb") as f:
+            yield from iter(lambda: f.read(DEFAULT_CHUNK_SIZE), b"")
+
+    def close(self) -> None:
+        """임시 파일 삭제 (``path``를 지정했으면 남김)"""
+        if not self.keep and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> "ExportSpool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
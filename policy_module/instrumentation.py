@@ -0,0 +1,291 @@
+"""정책 가져오기 단계별 계측
+
+가져오기(다운로드, XML 파싱, 정책 트리 순회, 리스트 참조 해석, DB 저장 등)의
+각 단계에 대해 소요 시간, 처리 레코드 수, ``tracemalloc`` 최대 메모리를
+기록하고, 가져오기가 끝나면 결과를 등록된 sink(로그, JSON 파일, HTTP
+메트릭 엔드포인트)로 보냅니다. 필요하면 한 번의 가져오기에 대해서만
+``cProfile`` 프로파일을 함께 수집할 수 있습니다.
+
+    instrumentation = Instrumentation([LogSink(), JsonFileSink("import_metrics.jsonl")])
+    instrumentation.capture_profile("import.prof")  # 다음 가져오기 한 번만
+    PolicyStore(session, instrumentation=instrumentation).store_from_api(proxy_config)
+"""
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP = 30
+
+
+@dataclass
+class StageMetrics:
+    """한 단계의 측정 결과
+
+    Attributes:
+        name: 단계 이름
+        path: 상위 단계를 포함한 이름 (``store_from_source/parse_policy/walk``)
+        depth: 중첩 깊이 (가져오기 자체가 0)
+        seconds: 소요 시간
+        records: 처리한 레코드 수 (단계가 지정한 경우)
+        peak_bytes: 단계 중 ``tracemalloc`` 최대 추적 메모리
+        memory_delta: 단계 전후 추적 메모리 차이
+        info: 단계별 추가 값 (다운로드 크기, 캐시 적중 여부 등)
+        error: 단계가 예외로 끝난 경우 예외 메시지
+    """
+
+    name: str
+    path: str
+    depth: int = 0
+    seconds: float = 0.0
+    records: Optional[int] = None
+    peak_bytes: Optional[int] = None
+    memory_delta: Optional[int] = None
+    info: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    _start_memory: int = field(default=0, repr=False)
+
+    def count(self, records: int) -> None:
+        """처리 레코드 수 누적"""
+        self.records = (self.records or 0) + records
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("_start_memory")
+        return data
+
+
+class MetricsSink:
+    """계측 결과 수신 인터페이스"""
+
+    def emit(self, report: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class LogSink(MetricsSink):
+    """단계별 결과를 로그로 출력"""
+
+    def __init__(self, log: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.log = log or logger
+        self.level = level
+
+    def emit(self, report: Dict[str, Any]) -> None:
+        self.log.log(self.level, f"가져오기 '{report['name']}' 완료: {report['seconds']:.3f}s")
+        for stage in report["stages"]:
+            parts = [f"{stage['seconds']:.3f}s"]
+            if stage["records"] is not None:
+                parts.append(f"{stage['records']} records")
+            if stage["peak_bytes"] is not None:
+                parts.append(f"peak {stage['peak_bytes'] / 2**20:.1f} MB")
+            if stage["error"]:
+                parts.append(f"error: {stage['error']}")
+            self.log.log(self.level, f"{'  ' * stage['depth']}{stage['name']}: {', '.join(parts)}")
+        if report.get("profile"):
+            self.log.log(self.level, f"프로파일: {report['profile'].get('path') or '(메모리)'}")
+
+
+class JsonFileSink(MetricsSink):
+    """가져오기마다 결과를 JSON 한 줄로 파일에 추가"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def emit(self, report: Dict[str, Any]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(report, ensure_ascii=False, default=str) + "\n")
+
+
+class HttpSink(MetricsSink):
+    """결과를 메트릭 엔드포인트로 POST (JSON 본문)"""
+
+    def __init__(self, url: str, timeout: float = 5.0, headers: Optional[Dict[str, str]] = None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def emit(self, report: Dict[str, Any]) -> None:
+        response = requests.post(self.url, json=report, headers=self.headers, timeout=self.timeout)
+        response.raise_for_status()
+
+
+class Instrumentation:
+    """가져오기 단계 계측기
+
+    :meth:`run`으로 가져오기 전체를, :meth:`stage`로 그 안의 단계를 감쌉니다.
+    :meth:`run`이 중첩되면 안쪽은 단계로 기록되고, 가장 바깥 :meth:`run`이
+    끝날 때 결과를 sink로 보냅니다. sink 오류는 로그만 남기고 가져오기는
+    계속됩니다.
+    """
+
+    def __init__(
+        self,
+        sinks: Optional[List[MetricsSink]] = None,
+        *,
+        trace_memory: bool = True,
+        enabled: bool = True,
+    ):
+        """초기화
+
+        Args:
+            sinks: 결과를 받을 sink 목록
+            trace_memory: ``tracemalloc``으로 단계별 최대 메모리 측정
+                (측정 중에는 메모리 할당이 느려짐)
+            enabled: ``False``면 아무것도 측정하지 않음
+        """
+        self.sinks = list(sinks or [])
+        self.trace_memory = trace_memory
+        self.enabled = enabled
+        self.reports: List[Dict[str, Any]] = []
+        self._stack: List[StageMetrics] = []
+        self._stages: List[StageMetrics] = []
+        self._profile_path: Optional[str] = None
+        self._profile_armed = False
+        self._started_tracing = False
+
+    @classmethod
+    def disabled(cls) -> "Instrumentation":
+        return cls(enabled=False)
+
+    @property
+    def last_report(self) -> Optional[Dict[str, Any]]:
+        return self.reports[-1] if self.reports else None
+
+    def capture_profile(self, path: Optional[str] = None) -> None:
+        """다음 가져오기 한 번에 대해 ``cProfile`` 수집
+
+        Args:
+            path: ``pstats`` 파일 저장 경로 (없으면 보고서의 상위 함수 목록만)
+        """
+        self._profile_armed = True
+        self._profile_path = path
+
+    @contextmanager
+    def run(self, name: str, **info: Any) -> Iterator[StageMetrics]:
+        """가져오기 한 번 계측 (이미 실행 중이면 단계로 기록)"""
+        if not self.enabled or self._stack:
+            with self.stage(name, **info) as stage:
+                yield stage
+            return
+
+        self._stages = []
+        started_at = datetime.now(timezone.utc).isoformat()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        profiler = self._start_profile()
+        try:
+            with self.stage(name, **info) as stage:
+                yield stage
+        finally:
+            profile = self._stop_profile(profiler)
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+            report = {
+                "name": name,
+                "started_at": started_at,
+                "seconds": stage.seconds,
+                "error": stage.error,
+                "stages": [s.to_dict() for s in self._stages],
+                "profile": profile,
+            }
+            self.reports.append(report)
+            self._emit(report)
+
+    @contextmanager
+    def stage(self, name: str, records: Optional[int] = None, **info: Any) -> Iterator[StageMetrics]:
+        """단계 하나 계측
+
+        ``with`` 블록에서 받은 :class:`StageMetrics`의 ``records``나
+        ``info``를 채우면 결과에 함께 기록됩니다.
+        """
+        parent = self._stack[-1] if self._stack else None
+        stage = StageMetrics(
+            name=name,
+            path=f"{parent.path}/{name}" if parent else name,
+            depth=len(self._stack),
+            records=records,
+            info=dict(info),
+        )
+        if not self.enabled:
+            yield stage
+            return
+
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent is not None:
+                # 최대값을 초기화하기 전에 상위 단계의 최대값에 반영
+                parent.peak_bytes = max(parent.peak_bytes or 0, peak)
+            tracemalloc.reset_peak()
+            stage._start_memory = current
+        self._stages.append(stage)
+        self._stack.append(stage)
+        start = time.perf_counter()
+        try:
+            yield stage
+        except BaseException as e:
+            stage.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stage.seconds = time.perf_counter() - start
+            self._stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                stage.peak_bytes = max(stage.peak_bytes or 0, peak)
+                stage.memory_delta = current - stage._start_memory
+                if parent is not None:
+                    parent.peak_bytes = max(parent.peak_bytes or 0, stage.peak_bytes)
+
+    def _start_profile(self) -> Optional[cProfile.Profile]:
+        if not self._profile_armed:
+            return None
+        self._profile_armed = False
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:  # 다른 프로파일러가 이미 실행 중
+            logger.warning(f"cProfile 시작 실패: {e}")
+            return None
+        return profiler
+
+    def _stop_profile(self, profiler: Optional[cProfile.Profile]) -> Optional[Dict[str, Any]]:
+        if profiler is None:
+            return None
+        profiler.disable()
+        path, self._profile_path = self._profile_path, None
+        if path:
+            profiler.dump_stats(path)
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        top = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:PROFILE_TOP]
+        return {
+            "path": path,
+            "top": [
+                {
+                    "function": f"{filename}:{line}({func})",
+                    "calls": calls,
+                    "total_seconds": total,
+                    "cumulative_seconds": cumulative,
+                }
+                for (filename, line, func), (_, calls, total, cumulative, _) in top
+            ],
+        }
+
+    def _emit(self, report: Dict[str, Any]) -> None:
+        for sink in self.sinks:
+            try:
+                sink.emit(report)
+            except Exception as e:
+                logger.warning(f"계측 결과 전송 실패 ({type(sink).__name__}): {e}")
@@ -0,0 +1,262 @@
+"""리스트 값 역색인
+
+"example.com을 막는 리스트는?"처럼 값에서 리스트를 찾는 질의를 위해 리스트
+엔트리 값을 정규화하여 리스트 id로 되돌리는 색인입니다.
+
+- 일반 문자열: 정규화한 값 -> 엔트리 해시 맵
+- 도메인 접미사(``*.example.com``, ``.example.com``): 레이블을 뒤집은 트라이
+  (``com`` -> ``example``)
+- IP/CIDR/범위: 겹치는 구간을 경계 기준으로 나눈 정렬 구간 (이진 탐색)
+- 그 외 와일드카드(``*``/``?``) 엔트리: 패턴 목록을 순서대로 확인
+
+색인은 :meth:`PolicyManager.parse_lists` 시점에 만들어지며 :meth:`save`/
+:meth:`load`로 파일에 저장하거나 :class:`ParseCache` 항목에 함께 저장됩니다.
+
+    index = ListValueIndex.from_lists(manager.lists)
+    index.lists_containing("www.example.com")   # ['list1', 'blocked_sites']
+    index.lookup("10.1.2.3")                    # [ListMatch(list_id=..., entry='10.0.0.0/8', kind='ip')]
+"""
+
+import bisect
+import fnmatch
+import os
+import pickle
+import re
+import tempfile
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from .simulation.list_matcher import entry_value, parse_interval
+
+FORMAT_VERSION = 1
+_WILDCARD = re.compile(r"[*?]")
+_IPV4 = re.compile(r"(\d{1,3})\.(\d{1,3})\.(\d{1,3})\.(\d{1,3})(?:/(\d{1,2}))?")
+_IP_SHIFT = 128  # (버전, 주소)를 정수 하나로: 버전 << 128 | 주소
+
+
+class ListMatch(NamedTuple):
+    """질의 값을 포함하는 리스트 엔트리
+
+    Attributes:
+        list_id: 리스트 id
+        entry: 원본 엔트리 값
+        kind: ``exact``, ``domain``, ``ip``, ``wildcard`` 중 하나
+    """
+
+    list_id: str
+    entry: str
+    kind: str
+
+
+def normalize(value: Any) -> str:
+    """비교용 값: 앞뒤 공백 제거, 소문자, 도메인 끝의 ``.`` 제거"""
+    text = value if isinstance(value, str) else str(value)
+    return text.strip().lower().rstrip(".")
+
+
+def _interval(key: str) -> Optional[Tuple[int, int, int]]:
+    """정규화한 값의 IP 구간 (IPv4/CIDR는 ``ipaddress`` 없이 직접 계산)"""
+    if not key[0].isdigit() and ":" not in key:
+        return None
+    match = _IPV4.fullmatch(key)
+    if match is not None:
+        a, b, c, d, bits = match.groups()
+        octets = (int(a), int(b), int(c), int(d))
+        prefix = int(bits) if bits is not None else 32
+        if max(octets) > 255 or prefix > 32:
+            return None
+        host = (1 << (32 - prefix)) - 1
+        first = (octets[0] << 24 | octets[1] << 16 | octets[2] << 8 | octets[3]) & ~host
+        return 4, first, first | host
+    if ":" in key or "-" in key:
+        return parse_interval(key)
+    return None
+
+
+class _DomainNode:
+    """도메인 트라이 노드 (뒤집은 레이블 하나)"""
+
+    __slots__ = ("children", "matches")
+
+    def __init__(self):
+        self.children: Dict[str, "_DomainNode"] = {}
+        # (리스트 id, 엔트리, 도메인 자체 포함 여부)
+        self.matches: List[Tuple[str, str, bool]] = []
+
+
+class ListValueIndex:
+    """리스트 엔트리 값 -> 리스트 역색인"""
+
+    def __init__(self):
+        self.entries = 0
+        self._exact: Dict[str, List[Tuple[str, str]]] = {}
+        self._domains = _DomainNode()
+        self._patterns: List[Tuple[Any, str, str]] = []
+        self._intervals: List[Tuple[int, int, str, str]] = []
+        # 구간 경계 (정렬) / 경계마다 해당 구간에 걸친 _intervals 위치
+        self._starts: Optional[List[int]] = None
+        self._segments: List[Tuple[int, ...]] = []
+
+    @classmethod
+    def from_lists(cls, lists: Dict[str, List[Any]]) -> "ListValueIndex":
+        """``PolicyManager.lists`` (리스트 id -> 엔트리 레코드)로 색인 생성"""
+        index = cls()
+        for list_id, records in lists.items():
+            for record in records:
+                value = entry_value(record)
+                if value is not None:
+                    index.add(list_id, value)
+        index._build_segments()
+        return index
+
+    def add(self, list_id: str, value: str) -> None:
+        """엔트리 하나 추가"""
+        key = normalize(value)
+        if not key:
+            return
+        self.entries += 1
+        interval = _interval(key)
+        if interval is not None:
+            version, first, last = interval
+            self._intervals.append((version << _IP_SHIFT | first, version << _IP_SHIFT | last, list_id, value))
+            self._starts = None
+        elif "*" not in key and "?" not in key:
+            if key[0] == ".":
+                self._add_domain(key[1:], list_id, value, inclusive=True)
+            else:
+                self._exact.setdefault(key, []).append((list_id, value))
+        elif key.startswith("*.") and not _WILDCARD.search(key, 2):
+            self._add_domain(key[2:], list_id, value, inclusive=False)
+        else:
+            self._patterns.append((re.compile(fnmatch.translate(key)), list_id, value))
+
+    def _add_domain(self, domain: str, list_id: str, value: str, inclusive: bool) -> None:
+        node = self._domains
+        for label in reversed(domain.split(".")):
+            child = node.children.get(label)
+            if child is None:
+                child = node.children[label] = _DomainNode()
+            node = child
+        node.matches.append((list_id, value, inclusive))
+
+    def _build_segments(self) -> None:
+        """겹치는 IP 구간을 경계 기준의 서로소 구간으로 분할"""
+        events: List[Tuple[int, int, int]] = []  # (경계, 0=끝/1=시작, 구간 위치)
+        for position, (first, last, _, _) in enumerate(self._intervals):
+            events.append((first, 1, position))
+            events.append((last + 1, 0, position))
+        events.sort()
+        starts: List[int] = []
+        segments: List[Tuple[int, ...]] = []
+        shared: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        active: Dict[int, None] = {}
+        i = 0
+        while i < len(events):
+            point = events[i][0]
+            while i < len(events) and events[i][0] == point:
+                _, is_start, position = events[i]
+                if is_start:
+                    active[position] = None
+                else:
+                    active.pop(position, None)
+                i += 1
+            current = tuple(active)
+            if segments and segments[-1] == current:
+                continue
+            starts.append(point)
+            # 같은 구간 조합은 튜플 하나를 공유
+            segments.append(shared.setdefault(current, current))
+        self._starts = starts
+        self._segments = segments
+
+    def lookup(self, value: Any) -> List[ListMatch]:
+        """값을 포함하는 엔트리 목록
+
+        Args:
+            value: 호스트, URL, 문자열, IP 주소 또는 CIDR/``a-b`` 범위
+                (범위는 겹치는 IP 엔트리를 반환)
+        """
+        key = normalize(value)
+        if not key:
+            return []
+        matches = [ListMatch(list_id, entry, "exact") for list_id, entry in self._exact.get(key, ())]
+        interval = _interval(key)
+        if interval is not None:
+            matches.extend(self._lookup_interval(interval))
+        else:
+            matches.extend(self._lookup_domain(key))
+        matches.extend(
+            ListMatch(list_id, entry, "wildcard")
+            for pattern, list_id, entry in self._patterns
+            if pattern.match(key)
+        )
+        return matches
+
+    def lists_containing(self, value: Any) -> List[str]:
+        """값을 포함하는 리스트 id (중복 제거, 찾은 순서)"""
+        return list(dict.fromkeys(match.list_id for match in self.lookup(value)))
+
+    def _lookup_domain(self, key: str) -> List[ListMatch]:
+        labels = key.split(".")
+        node = self._domains
+        matches = []
+        for depth, label in enumerate(reversed(labels), 1):
+            node = node.children.get(label)
+            if node is None:
+                break
+            is_domain = depth == len(labels)
+            matches.extend(
+                ListMatch(list_id, entry, "domain")
+                for list_id, entry, inclusive in node.matches
+                if inclusive or not is_domain
+            )
+        return matches
+
+    def _lookup_interval(self, interval: Tuple[int, int, int]) -> List[ListMatch]:
+        if self._starts is None:
+            self._build_segments()
+        version, first, last = interval
+        first, last = version << _IP_SHIFT | first, version << _IP_SHIFT | last
+        starts = self._starts
+        low = max(bisect.bisect_right(starts, first) - 1, 0)
+        high = bisect.bisect_right(starts, last)
+        positions: Dict[int, None] = {}
+        for segment in self._segments[low:high]:
+            positions.update(dict.fromkeys(segment))
+        intervals = self._intervals
+        return [
+            ListMatch(intervals[p][2], intervals[p][3], "ip")
+            for p in positions
+            if intervals[p][0] <= last and intervals[p][1] >= first
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": self.entries,
+            "exact": len(self._exact),
+            "intervals": len(self._intervals),
+            "segments": len(self._segments),
+            "patterns": len(self._patterns),
+        }
+
+    def save(self, path: str) -> None:
+        """``pickle`` 파일로 저장 (신뢰할 수 있는 경로만 사용)"""
+        if self._starts is None:
+            self._build_segments()
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump({"version": FORMAT_VERSION, "index": self}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "ListValueIndex":
+        """:meth:`save`로 저장한 색인 읽기"""
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported list index file: {path}")
+        return data["index"]
@@ -0,0 +1,86 @@
+"""리스트 참조 핸들
+
+조건식이 참조하는 리스트를 엔트리 목록 대신 :class:`ListRef` 핸들로
+해석합니다. 핸들은 리스트 id와 엔트리 공급자(``PolicyManager.lists`` 또는
+:class:`StoredLists`)만 들고 있다가 접근할 때 엔트리를 읽으므로, 같은
+리스트를 참조하는 룰이 많아도 엔트리가 레코드마다 복사되지 않습니다.
+
+직렬화할 때는 리스트 id만 남깁니다 (``{"list_ref": "list1"}``).
+
+    ref = manager.parse_policy()[0]["lists_resolved"]   # ListRef('list1')
+    len(ref), ref[0], list(ref)                         # 엔트리는 접근할 때 조회
+    dump_resolved(ref)                                  # {'list_ref': 'list1'}
+    load_resolved({"list_ref": "list1"}, manager.lists) # ListRef('list1')
+"""
+
+from collections.abc import Sequence
+from typing import Any, Dict, List, Mapping
+
+REF_KEY = "list_ref"
+
+
+class ListRef(Sequence):
+    """리스트 하나를 가리키는 읽기 전용 시퀀스
+
+    Attributes:
+        list_id: 리스트 id
+        source: ``get(list_id)``로 엔트리 레코드 목록을 돌려주는 공급자
+    """
+
+    __slots__ = ("list_id", "source")
+
+    def __init__(self, list_id: str, source: Mapping[str, List[Any]]):
+        self.list_id = list_id
+        self.source = source
+
+    @property
+    def entries(self) -> List[Any]:
+        """엔트리 레코드 목록 (공급자에 없으면 빈 목록)"""
+        return self.source.get(self.list_id) or []
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ListRef):
+            return self.list_id == other.list_id and self.entries == other.entries
+        if isinstance(other, (list, tuple)):
+            return list(self.entries) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"ListRef({self.list_id!r})"
+
+    def __reduce__(self):
+        # 공급자가 dict가 아니면(DB 세션 등) 피클하지 않음
+        source = self.source if isinstance(self.source, dict) else {}
+        return ListRef, (self.list_id, source)
+
+    def to_json(self) -> Dict[str, str]:
+        return {REF_KEY: self.list_id}
+
+
+def dump_resolved(value: Any) -> Any:
+    """``lists_resolved`` 값을 JSON으로 저장할 수 있게 변환 (핸들 -> 리스트 id)"""
+    if isinstance(value, ListRef):
+        return value.to_json()
+    if isinstance(value, (list, tuple)):
+        return [dump_resolved(item) for item in value]
+    return value
+
+
+def load_resolved(value: Any, source: Mapping[str, List[Any]]) -> Any:
+    """:func:`dump_resolved` 결과를 ``source``를 가리키는 핸들로 복원"""
+    if isinstance(value, dict) and set(value) == {REF_KEY}:
+        return ListRef(value[REF_KEY], source)
+    if isinstance(value, list):
+        return [load_resolved(item, source) for item in value]
+    return value
@@ -0,0 +1,139 @@
+"""파싱 결과 디스크 캐시
+
+같은 내보내기 파일을 다시 가져올 때 XML 파싱을 건너뛸 수 있도록
+소스 바이트의 SHA-256을 키로 파싱 결과(리스트, 설정, 정책 아이템)를
+``pickle`` 형식으로 캐시 디렉터리에 저장합니다. 전체 크기가
+``max_bytes``를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+"""
+
+import gc
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional
+
+DEFAULT_MAX_BYTES = 1024 ** 3
+FORMAT_VERSION = 1
+_SUFFIX = ".pickle"
+
+
+class ParseCache:
+    """SHA-256 키 기반 파싱 결과 캐시 (LRU, 총 크기 제한)
+
+    캐시 파일은 ``pickle``로 저장되므로 신뢰할 수 있는 로컬 디렉터리만
+    사용해야 합니다.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """초기화
+
+        Args:
+            directory: 캐시 디렉터리 (없으면 생성)
+            max_bytes: 캐시 파일 전체 크기 상한
+        """
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def digest(source: Any) -> Optional[str]:
+        """소스의 SHA-256 (해시할 수 없는 소스는 ``None``)
+
+        XML 바이트/문자열, 파일 경로, dict 소스를 지원합니다. 파일 객체처럼
+        다시 읽을 수 없는 소스는 캐시하지 않습니다.
+        """
+        h = hashlib.sha256()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            h.update(source)
+        elif isinstance(source, str) and source.lstrip().startswith("<"):
+            h.update(source.encode("utf-8"))
+        elif isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+        elif isinstance(source, dict):
+            h.update(json.dumps(source, sort_keys=True, default=str).encode("utf-8"))
+        else:
+            return None
+        return h.hexdigest()
+
+    def key(self, source: Any, variant: str = "") -> Optional[str]:
+        """캐시 키: 소스 digest와 결과 형태(``variant``)의 조합"""
+        digest = self.digest(source)
+        if digest is None:
+            return None
+        return f"{digest}.{variant}" if variant else digest
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 파싱 결과 조회 (없거나 손상된 경우 ``None``)"""
+        path = self._path(key)
+        # 수십만 개의 객체를 한 번에 만들 때 GC가 반복 실행되지 않도록 잠시 중지
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 손상되었거나 다른 버전에서 만든 파일은 버림
+            self._remove(path)
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if not isinstance(entry, dict) or entry.get("version") != FORMAT_VERSION:
+            self._remove(path)
+            return None
+        os.utime(path)  # LRU 순서 갱신
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """파싱 결과 저장 후 크기 상한에 맞춰 오래된 항목 삭제"""
+        entry = dict(entry, version=FORMAT_VERSION)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """전체 크기가 ``max_bytes`` 이하가 될 때까지 오래 사용하지 않은 항목 삭제"""
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def clear(self) -> None:
+        """모든 캐시 항목 삭제"""
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIX):
+                self._remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
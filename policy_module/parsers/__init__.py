@@ -5,16 +5,23 @@
 - ConditionParser: 조건 파싱
 - ConfigurationsParser: 설정 파싱
 - ListsParser: 리스트 파싱
+- ParsedLibrary: 파서 간 공유되는 파싱 문서
+- ColumnarSource: Parquet/Arrow로 내보낸 파싱 결과
 """
 
 from .policy_parser import PolicyParser
-from .condition_parser import ConditionParser
+from .condition_parser import ConditionParser, ConditionCache
 from .configurations_parser import ConfigurationsParser
 from .lists_parser import ListsParser
+from .library import ParsedLibrary
+from .columnar import ColumnarSource
 
 __all__ = [
     'PolicyParser',
     'ConditionParser',
+    'ConditionCache',
     'ConfigurationsParser',
-    'ListsParser'
+    'ListsParser',
+    'ParsedLibrary',
+    'ColumnarSource'
 ] 
\ No newline at end of file
@@ -0,0 +1,294 @@
+"""Columnar (Parquet / Arrow IPC) export of parsed records.
+
+Records are written in row groups as they arrive, so a parser's
+``iter_records`` generator can be exported without collecting it first.
+Repetitive columns (``path``, ``condition_property``, ``list_id`` and a
+few others) are dictionary-encoded with one growing dictionary per file,
+which Parquet and the Arrow IPC file format (as dictionary deltas) both
+accept. Nested values such as ``condition_raw`` or ``properties`` are
+stored as JSON text. The ``read_*`` functions turn the files back into the
+dicts the parsers produce, minus ``lists_resolved`` which
+:class:`PolicyManager` recomputes.
+
+The format follows the file extension: ``.arrow``/``.feather`` for Arrow
+IPC, anything else for Parquet.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .path_table import PathTable
+from .records import GROUP_KEYS, LIST_INFO_KEYS, RULE_KEYS, as_dict
+
+DEFAULT_ROW_GROUP_SIZE = 64 * 1024
+ARROW_EXTENSIONS = (".arrow", ".feather")
+
+# 컬럼 종류: str(문자열), dict(사전 인코딩 문자열), int, json(JSON 텍스트)
+POLICY_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("type", "dict"),
+    ("id", "str"),
+    ("name", "str"),
+    ("enabled", "dict"),
+    ("description", "json"),
+    ("condition_raw", "json"),
+    ("condition_prefix", "dict"),
+    ("condition_property", "dict"),
+    ("condition_operator", "dict"),
+    ("condition_values", "str"),
+    ("condition_result", "json"),
+    ("condition_index", "int"),
+    ("condition_parent_index", "int"),
+    ("path", "dict"),
+    ("group_path", "dict"),
+    ("defaultRights", "str"),
+    ("cycleRequest", "dict"),
+    ("cycleResponse", "dict"),
+    ("cycleEmbeddedObject", "dict"),
+    ("cloudSynced", "dict"),
+    ("acElements", "str"),
+    ("actionContainer_raw", "str"),
+    ("immediateActions_raw", "str"),
+)
+
+LIST_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("list_name", "dict"),
+    ("list_id", "dict"),
+    ("list_type_id", "dict"),
+    ("list_classifier", "dict"),
+    ("list_description", "json"),
+    ("entry", "str"),
+    ("entry_fields", "json"),  # entry 외의 listEntry 필드
+)
+
+CONFIGURATION_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("id", "str"),
+    ("name", "str"),
+    ("version", "str"),
+    ("mwg_version", "str"),
+    ("template_id", "str"),
+    ("target_id", "str"),
+    ("description", "json"),
+    ("properties", "json"),
+    ("raw", "json"),
+)
+
+PATH_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("id", "int"),
+    ("parent_id", "int"),
+    ("name", "str"),
+    ("path", "str"),
+)
+
+_ARROW_TYPES = {
+    "str": pa.string(),
+    "dict": pa.dictionary(pa.int32(), pa.string()),
+    "int": pa.int64(),
+    "json": pa.string(),
+}
+
+
+def is_arrow(path: str) -> bool:
+    return os.fspath(path).lower().endswith(ARROW_EXTENSIONS)
+
+
+def _schema(columns) -> pa.Schema:
+    return pa.schema([(name, _ARROW_TYPES[kind]) for name, kind in columns])
+
+
+def _json(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+class ColumnarWriter:
+    """Writes dict rows to a Parquet or Arrow IPC file in row groups.
+
+    Args:
+        path: output file (format chosen by extension)
+        columns: ``(name, kind)`` column spec
+        row_group_size: rows buffered before a row group is written
+    """
+
+    def __init__(self, path: str, columns, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        self.path = os.fspath(path)
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.schema = _schema(columns)
+        self.rows = 0
+        self._buffers: Dict[str, List[Any]] = {name: [] for name, _ in columns}
+        # 파일 전체에서 하나씩 늘려 가는 사전. Arrow IPC 파일은 사전 교체가 불가하고
+        # 빈 사전에서 늘어나는 것도 교체로 보므로 빈 문자열을 미리 넣어 둠
+        self._dictionaries: Dict[str, Dict[str, int]] = {
+            name: {"": 0} for name, kind in columns if kind == "dict"
+        }
+        if is_arrow(self.path):
+            options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            self._writer = pa.ipc.new_file(self.path, self.schema, options=options)
+        else:
+            self._writer = pq.ParquetWriter(self.path, self.schema)
+
+    def write(self, row: Dict[str, Any]) -> None:
+        for name, kind in self.columns:
+            value = row.get(name)
+            if kind == "json":
+                value = _json(value)
+            elif kind == "dict" and value is not None:
+                codes = self._dictionaries[name]
+                value = codes.setdefault(value, len(codes))
+            self._buffers[name].append(value)
+        self.rows += 1
+        if len(self._buffers[self.columns[0][0]]) >= self.row_group_size:
+            self.flush()
+
+    def write_all(self, rows: Iterable[Dict[str, Any]]) -> int:
+        for row in rows:
+            self.write(row)
+        return self.rows
+
+    def flush(self) -> None:
+        if not self._buffers[self.columns[0][0]]:
+            return
+        arrays = []
+        for name, kind in self.columns:
+            values = self._buffers[name]
+            if kind == "dict":
+                dictionary = pa.array(list(self._dictionaries[name]), pa.string())
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(values, pa.int32()), dictionary))
+            else:
+                arrays.append(pa.array(values, _ARROW_TYPES[kind]))
+            values.clear()
+        self._writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+
+    def close(self) -> None:
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def iter_rows(path: str, columns, batch_size: int = DEFAULT_ROW_GROUP_SIZE) -> Iterator[Dict[str, Any]]:
+    """Yield the rows of a file written by :class:`ColumnarWriter` as dicts (JSON decoded)."""
+    path = os.fspath(path)
+    if is_arrow(path):
+        reader = pa.ipc.open_file(path)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    else:
+        batches = pq.ParquetFile(path).iter_batches(batch_size=batch_size)
+    names = [name for name, _ in columns]
+    json_columns = {name for name, kind in columns if kind == "json"}
+    for batch in batches:
+        data = []
+        for name in names:
+            values = batch.column(name).to_pylist()
+            if name in json_columns:
+                values = [json.loads(v) if v is not None else None for v in values]
+            data.append(values)
+        for values in zip(*data):
+            yield dict(zip(names, values))
+
+
+def _policy_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    keys = GROUP_KEYS if row["type"] == "group" else RULE_KEYS
+    return {key: row[key] for key in keys}
+
+
+def _list_row(record: Any) -> Dict[str, Any]:
+    record = as_dict(record)
+    row = {key: record.get(key) for key in LIST_INFO_KEYS}
+    fields = {k: v for k, v in record.items() if k not in LIST_INFO_KEYS}
+    if isinstance(fields.get("entry"), str):
+        row["entry"] = fields.pop("entry")
+    row["entry_fields"] = fields or None
+    return row
+
+
+def _list_record(row: Dict[str, Any]) -> Dict[str, Any]:
+    record = {key: row[key] for key in LIST_INFO_KEYS}
+    if row["entry"] is not None:
+        record["entry"] = row["entry"]
+    if row["entry_fields"]:
+        record.update(row["entry_fields"])
+    return record
+
+
+def write_policy(records: Iterable[Any], path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Write policy records (dict or compact); returns the number of rows."""
+    with ColumnarWriter(path, POLICY_COLUMNS, row_group_size) as writer:
+        return writer.write_all(as_dict(rec) for rec in records)
+
+
+def write_lists(records: Iterable[Any], path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Write list entry records (dict or compact); returns the number of rows."""
+    with ColumnarWriter(path, LIST_COLUMNS, row_group_size) as writer:
+        return writer.write_all(_list_row(rec) for rec in records)
+
+
+def write_configurations(records: Iterable[Dict[str, Any]], path: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> int:
+    """Write configuration records; returns the number of rows."""
+    with ColumnarWriter(path, CONFIGURATION_COLUMNS, row_group_size) as writer:
+        return writer.write_all(records)
+
+
+def write_paths(paths: PathTable, path: str) -> int:
+    """Write a :class:`PathTable` so ids survive the round trip."""
+    with ColumnarWriter(path, PATH_COLUMNS) as writer:
+        return writer.write_all(paths.rows())
+
+
+def read_policy(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield policy records in :class:`PolicyParser` dict form."""
+    return (_policy_record(row) for row in iter_rows(path, POLICY_COLUMNS))
+
+
+def read_lists(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield list entry records in :class:`ListsParser` dict form."""
+    return (_list_record(row) for row in iter_rows(path, LIST_COLUMNS))
+
+
+def read_configurations(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield configuration records in :class:`ConfigurationsParser` form."""
+    return iter_rows(path, CONFIGURATION_COLUMNS)
+
+
+def read_paths(path: str) -> PathTable:
+    """Rebuild the :class:`PathTable` written by :func:`write_paths`."""
+    paths = PathTable()
+    for row in iter_rows(path, PATH_COLUMNS):
+        parent = paths[row["parent_id"]] if row["parent_id"] else None
+        paths.child(parent, row["name"])
+    return paths
+
+
+class ColumnarSource:
+    """Directory of exported files, usable as a :class:`PolicyManager` source.
+
+    Holds ``lists``, ``configurations``, ``policy`` and ``paths`` files
+    with the given extension, as written by :meth:`PolicyManager.to_columnar`.
+    """
+
+    SECTIONS = ("lists", "configurations", "policy", "paths")
+
+    def __init__(self, directory: str, extension: str = ".parquet"):
+        self.directory = os.fspath(directory)
+        self.extension = extension
+
+    def file(self, section: str) -> str:
+        return os.path.join(self.directory, section + self.extension)
+
+    def load(self) -> Dict[str, Any]:
+        """Read all sections into lists (``paths`` as a :class:`PathTable`)."""
+        return {
+            "lists": list(read_lists(self.file("lists"))),
+            "configurations": list(read_configurations(self.file("configurations"))),
+            "policy": list(read_policy(self.file("policy"))),
+            "paths": read_paths(self.file("paths")),
+        }
@@ -1,9 +1,129 @@
-from typing import Any, Dict, List, Optional, Union
+import json
+import marshal
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+
+class FrozenRow(dict):
+    """Read-only dict used for condition rows shared through :class:`ConditionCache`.
+
+    It is still a ``dict`` so JSON serialization and ``isinstance`` checks
+    keep working; only mutation is refused.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached condition rows are read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenRow, (dict(self),))
+
+
+class ConditionCache:
+    """Memoizes :class:`ConditionParser` results by a canonical subtree key.
+
+    Identical ``condition`` blocks are parsed once and every caller gets the
+    same tuple of read-only rows. Expressions are cached separately so a new
+    condition that reuses known ``conditionExpression`` blocks (the same
+    URL.Host-in-list check, for example) only parses the new ones.
+
+    Args:
+        max_entries: Start over once this many distinct conditions are
+            cached, so memory stays bounded when streaming large exports.
+            ``None`` keeps every entry.
+    """
+
+    COUNTERS = ("condition_hits", "condition_misses", "expression_hits", "expression_misses")
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = max_entries
+        self._conditions: Dict[bytes, Tuple[FrozenRow, ...]] = {}
+        self._expressions: Dict[bytes, Dict[str, Any]] = {}
+        self._compact: Dict[int, Any] = {}
+        self.condition_hits = 0
+        self.condition_misses = 0
+        self.expression_hits = 0
+        self.expression_misses = 0
+
+    @staticmethod
+    def key(subtree: Any) -> bytes:
+        """Canonical serialization of a parsed-XML subtree.
+
+        ``marshal`` is several times cheaper than parsing the subtree, which
+        is what makes the cache pay off. Identical XML blocks produce dicts
+        with identical key order, so no sorting is needed. Types marshal
+        cannot handle fall back to sorted JSON.
+        """
+        try:
+            return marshal.dumps(subtree)
+        except ValueError:
+            return json.dumps(subtree, sort_keys=True, default=str).encode("utf-8")
+
+    def condition(self, condition: Dict[str, Any], parse: Callable) -> Tuple[FrozenRow, ...]:
+        key = self.key(condition)
+        rows = self._conditions.get(key)
+        if rows is not None:
+            self.condition_hits += 1
+            return rows
+        self.condition_misses += 1
+        rows = tuple(FrozenRow(row) for row in parse(condition))
+        if self.max_entries is not None and len(self._conditions) >= self.max_entries:
+            # Reset everything together: the compact map is keyed by row id
+            self.clear()
+        self._conditions[key] = rows
+        return rows
+
+    def expression(self, expr: Dict[str, Any], parse: Callable) -> Dict[str, Any]:
+        """Return a fresh copy of the parsed expression row (callers add ``index``)."""
+        key = self.key(expr)
+        row = self._expressions.get(key)
+        if row is not None:
+            self.expression_hits += 1
+        else:
+            self.expression_misses += 1
+            row = self._expressions[key] = parse(expr)
+        return dict(row)
+
+    def compact(self, row: FrozenRow, convert: Callable) -> Any:
+        """Share one converted (e.g. compact) object per cached row."""
+        converted = self._compact.get(id(row))
+        if converted is None:
+            converted = self._compact[id(row)] = convert(row)
+        return converted
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "condition_hits": self.condition_hits,
+            "condition_misses": self.condition_misses,
+            "expression_hits": self.expression_hits,
+            "expression_misses": self.expression_misses,
+            "conditions": len(self._conditions),
+            "expressions": len(self._expressions),
+        }
+
+    def counts(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.COUNTERS}
+
+    def add_counts(self, counts: Dict[str, int]) -> None:
+        """Add hit/miss counters of another cache (a parallel-parse worker)."""
+        for name in self.COUNTERS:
+            setattr(self, name, getattr(self, name) + counts.get(name, 0))
+
+    def clear(self) -> None:
+        self._conditions.clear()
+        self._expressions.clear()
+        self._compact.clear()
+
 
 class ConditionParser:
-    def __init__(self, condition: Optional[Dict[str, Any]]) -> None:
+    def __init__(self, condition: Optional[Dict[str, Any]], cache: Optional[ConditionCache] = None) -> None:
         self.condition = condition
-        self.parsed = self.parse_condition(condition)
+        self.cache = cache
+        if cache is not None and condition:
+            self.parsed = list(cache.condition(condition, self.parse_condition))
+        else:
+            self.parsed = self.parse_condition(condition)
 
     @classmethod
     def ensure_list(cls, value: Union[Dict, List, None]) -> List:
@@ -37,7 +157,10 @@ class ConditionParser:
         for raw in raw_exprs:
             if not isinstance(raw, dict):
                 continue
-            row = self.parse_expression(raw)
+            if self.cache is not None:
+                row = self.cache.expression(raw, self.parse_expression)
+            else:
+                row = self.parse_expression(raw)
             index = len(rows) + 1
             row["index"] = index
             row["parent_index"] = stack[-1] if stack else None
@@ -1,13 +1,17 @@
-import xmltodict
+from . import columnar
+from .library import ParsedLibrary
+from .xml_stream import LibraryStream, SectionHandler, element_to_dict
 
 class ConfigurationsParser:
-    def __init__(self, source, from_xml: bool = False) -> None:
-        if from_xml:
-            self.data = xmltodict.parse(source)
-        elif isinstance(source, dict):
-            self.data = source
+    def __init__(self, source, from_xml: bool = False, stream: bool = False) -> None:
+        self.stream = stream
+        if stream:
+            if not from_xml:
+                raise ValueError("Streaming mode requires an XML source.")
+            self.source = source
+            self.data = None
         else:
-            raise ValueError("Invalid data source provided. Must be dict or XML string.")
+            self.data = ParsedLibrary.load(source, from_xml=from_xml).data
         self.records = []
 
     @staticmethod
@@ -40,21 +44,63 @@ class ConfigurationsParser:
             return value
         return [value]
 
-    def parse(self):
+    @classmethod
+    def configuration_record(cls, conf: dict) -> dict:
+        return {
+            "id": conf.get("@id"),
+            "name": conf.get("@name"),
+            "version": conf.get("@version"),
+            "mwg_version": conf.get("@mwg-version"),
+            "template_id": conf.get("@templateId"),
+            "target_id": conf.get("@targetId"),
+            "description": conf.get("description"),
+            "properties": cls.parse_properties(conf),
+            "raw": conf,
+        }
+
+    def iter_records(self):
+        """Yield configuration records one by one without keeping them on the parser."""
+        if self.stream:
+            stream = LibraryStream({"configurations": ConfigurationsStreamHandler()})
+            for _, record in stream.iter_records(self.source):
+                yield record
+            return
+
         configs = self.data.get("libraryContent", {}).get("configurations", {}).get("configuration")
         for conf in self.ensure_list(configs):
             if not isinstance(conf, dict):
                 continue
-            record = {
-                "id": conf.get("@id"),
-                "name": conf.get("@name"),
-                "version": conf.get("@version"),
-                "mwg_version": conf.get("@mwg-version"),
-                "template_id": conf.get("@templateId"),
-                "target_id": conf.get("@targetId"),
-                "description": conf.get("description"),
-                "properties": self.parse_properties(conf),
-                "raw": conf,
-            }
-            self.records.append(record)
+            yield self.configuration_record(conf)
+
+    def parse(self):
+        self.records.extend(self.iter_records())
         return self.records
+
+    def to_columnar(self, path: str, row_group_size: int = columnar.DEFAULT_ROW_GROUP_SIZE) -> int:
+        """Parquet/Arrow 파일로 저장 (확장자로 형식 결정)"""
+        return columnar.write_configurations(self.records or self.iter_records(), path, row_group_size)
+
+
+class ConfigurationsStreamHandler(SectionHandler):
+    """Streams ``libraryContent/configurations`` one ``configuration`` at a time."""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        self.section = None
+
+    def start(self, elem):
+        self.depth += 1
+        if self.depth == 1:
+            self.section = elem
+        return []
+
+    def end(self, elem):
+        records = []
+        self.depth -= 1
+        if self.depth == 1 and elem.tag == "configuration":
+            conf = element_to_dict(elem)
+            if isinstance(conf, dict):
+                records.append(ConfigurationsParser.configuration_record(conf))
+        if self.depth == 1:
+            self.section.remove(elem)
+        return records
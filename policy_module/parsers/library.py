@@ -0,0 +1,59 @@
+import xmltodict
+
+
+class ParsedLibrary:
+    """Parsed ``libraryContent`` document shared by the parsers.
+
+    ``PolicyParser``, ``ListsParser`` and ``ConfigurationsParser`` all read
+    from the same export. Building one ``ParsedLibrary`` and handing it to
+    every parser means the XML is run through ``xmltodict`` only once.
+    """
+
+    def __init__(self, source, from_xml: bool = False):
+        if isinstance(source, ParsedLibrary):
+            self.data = source.data
+        elif from_xml:
+            self.data = xmltodict.parse(source)
+        elif isinstance(source, dict):
+            self.data = source
+        else:
+            raise ValueError("Invalid data source provided. Must be dict or XML string.")
+
+    @classmethod
+    def load(cls, source, from_xml: bool = False) -> "ParsedLibrary":
+        """Return ``source`` as-is if already parsed, otherwise parse it."""
+        if isinstance(source, cls):
+            return source
+        return cls(source, from_xml=from_xml)
+
+    @classmethod
+    def merge(cls, libraries) -> "ParsedLibrary":
+        """Combine several exports into one document.
+
+        The top-level rule groups are kept in the given order. Lists and
+        configurations shared by several exports are kept once (first
+        occurrence of each ``@id``).
+        """
+        rule_groups, lists, configurations = [], {}, {}
+        for library in libraries:
+            content = library.content
+            groups = content.get("ruleGroup")
+            rule_groups.extend(groups if isinstance(groups, list) else [groups] if groups else [])
+            for section, key, seen in (("lists", "entry", lists), ("configurations", "configuration", configurations)):
+                items = (content.get(section) or {}).get(key)
+                for item in items if isinstance(items, list) else [items] if items else []:
+                    ident = item.get("list", item).get("@id") if isinstance(item, dict) else None
+                    seen.setdefault(ident if ident is not None else object(), item)
+        return cls({"libraryContent": {
+            "ruleGroup": rule_groups,
+            "lists": {"entry": list(lists.values())},
+            "configurations": {"configuration": list(configurations.values())},
+        }})
+
+    @property
+    def content(self) -> dict:
+        return self.data.get("libraryContent", {})
+
+    @property
+    def rule_group(self):
+        return self.content.get("ruleGroup", {})
@@ -1,16 +1,21 @@
 import json
 import pandas as pd
-import xmltodict
+from . import columnar
+from .library import ParsedLibrary
+from .records import ListRecordFactory, as_dict
+from .xml_stream import LibraryStream, SectionHandler, element_to_dict
 
 class ListsParser:
-    def __init__(self, source, from_xml: bool = False):
-        if from_xml:
-            self.data = xmltodict.parse(source)
-        elif isinstance(source, dict):
-            self.data = source
+    def __init__(self, source, from_xml: bool = False, stream: bool = False, compact: bool = False):
+        self.stream = stream
+        self.compact = compact
+        if stream:
+            if not from_xml:
+                raise ValueError("Streaming mode requires an XML source.")
+            self.source = source
+            self.data = None
         else:
-            raise ValueError("Invalid data source provided. Must be dict or XML string.")
-
+            self.data = ParsedLibrary.load(source, from_xml=from_xml).data
         self.lists_records = []
 
     @staticmethod
@@ -30,17 +35,39 @@ class ListsParser:
                 return default
         return d if d is not None else default
     
-    def parse(self):
+    @staticmethod
+    def list_info(list_in_lists: dict) -> dict:
+        """리스트 메타데이터 추출"""
+        return {
+            "list_name": list_in_lists.get("@name", None),
+            "list_id": list_in_lists.get("@id", None),
+            "list_type_id": list_in_lists.get("@typeId", None),
+            "list_classifier": list_in_lists.get("@classifier", None),
+            "list_description": list_in_lists.get("description", None),
+        }
+
+    def make_record(self, info: dict, entry: dict = None):
+        """리스트 정보와 엔트리로 레코드 생성 (``compact``면 :class:`ListEntryRecord`)"""
+        if self.compact:
+            if not hasattr(self, "_record_factory"):
+                self._record_factory = ListRecordFactory()
+            return self._record_factory(info, entry)
+        return {**info, **entry} if entry else dict(info)
+
+    def iter_records(self):
+        """Yield list entry records one by one without keeping them on the parser."""
+        if self.stream:
+            stream = LibraryStream({"lists": ListsStreamHandler(self.make_record)})
+            for _, record in stream.iter_records(self.source):
+                yield record
+            return
+
         entries = self.data.get("libraryContent", {}).get("lists", {}).get("entry")
         for item in self.ensure_list(entries):
             if not isinstance(item, dict):
                 continue
             list_in_lists = item.get("list", {})
-            list_name = list_in_lists.get("@name", None)
-            list_id = list_in_lists.get("@id", None)
-            list_type_id = list_in_lists.get("@typeId", None)
-            list_classifier = list_in_lists.get("@classifier", None)
-            list_description = list_in_lists.get("description", None)
+            info = self.list_info(list_in_lists)
 
             entries = self.safe_get(item, ["list", "content", "listEntry"], [])
             entries_list = self.ensure_list(entries)
@@ -50,40 +77,81 @@ class ListsParser:
                 if entries_list:
                     for entry in entries_list:
                         if isinstance(entry, dict):
-                            row = {
-                                "list_name": list_name,
-                                "list_id": list_id,
-                                "list_type_id": list_type_id,
-                                "list_classifier": list_classifier,
-                                "list_description": list_description,
-                                **entry,
-                            }
-                            self.lists_records.append(row)
+                            yield self.make_record(info, entry)
                 else:
                     # 엔트리가 없더라도 리스트 정보는 저장
-                    self.lists_records.append(
-                        {
-                            "list_name": list_name,
-                            "list_id": list_id,
-                            "list_type_id": list_type_id,
-                            "list_classifier": list_classifier,
-                            "list_description": list_description,
-                        }
-                    )
+                    yield self.make_record(info)
 
             elif isinstance(entries, dict):
-                row = {
-                    "list_name": list_name,
-                    "list_id": list_id,
-                    "list_type_id": list_type_id,
-                    "list_classifier": list_classifier,
-                    "list_description": list_description,
-                    **entries
-                }
-                self.lists_records.append(row)
-        
+                yield self.make_record(info, entries)
+
+    def parse(self):
+        self.lists_records.extend(self.iter_records())
         return self.lists_records
 
+    def to_columnar(self, path: str, row_group_size: int = columnar.DEFAULT_ROW_GROUP_SIZE) -> int:
+        """Parquet/Arrow 파일로 저장 (확장자로 형식 결정, ``list_id`` 사전 인코딩)
+
+        ``parse()`` 이전에 호출하면 레코드를 모으지 않고 바로 기록합니다.
+        """
+        return columnar.write_lists(self.lists_records or self.iter_records(), path, row_group_size)
+
     def to_excel(self, lists_path: str):
-        df_lists = pd.DataFrame(self.lists_records)
+        df_lists = pd.DataFrame([as_dict(rec) for rec in self.lists_records])
         df_lists.to_excel(lists_path, index=False, engine="openpyxl")
+
+
+class ListsStreamHandler(SectionHandler):
+    """Streams ``libraryContent/lists`` one ``listEntry`` at a time.
+
+    List metadata is taken from the ``list`` attributes and its
+    ``description`` child, which precedes ``content`` in exports. Each
+    ``listEntry`` is emitted and dropped as soon as it ends.
+    """
+
+    def __init__(self, make_record=None) -> None:
+        self.make_record = make_record or (lambda info, entry=None: {**info, **entry} if entry else dict(info))
+        self.path = []
+        self.info = None
+        self.entry_count = 0
+        self.emitted = False
+
+    def start(self, elem):
+        self.path.append(elem)
+        if self._at("entry", "list"):
+            self.info = ListsParser.list_info({f"@{k}": v for k, v in elem.attrib.items()})
+            self.entry_count = 0
+            self.emitted = False
+        return []
+
+    def end(self, elem):
+        records = []
+        if self._at("entry", "list", "description"):
+            self.info["list_description"] = element_to_dict(elem)
+        elif self._at("entry", "list", "content", "listEntry"):
+            self.entry_count += 1
+            entry = element_to_dict(elem)
+            if isinstance(entry, dict):
+                records.append(self.make_record(self.info, entry))
+                self.emitted = True
+            elif entry is not None or self.entry_count > 1:
+                self.emitted = True
+            self.path[-2].remove(elem)
+        elif self._at("entry", "list"):
+            # 엔트리가 없더라도 리스트 정보는 저장
+            if not self.emitted:
+                records.append(self.make_record(self.info))
+            self.emitted = True
+        elif self._at("entry"):
+            if self.info is None and (len(elem) or elem.attrib):
+                records.append(self.make_record(ListsParser.list_info({})))
+            self.info = None
+            self.path[-2].remove(elem)
+        self.path.pop()
+        return records
+
+    def _at(self, *tags) -> bool:
+        """현재 요소가 ``lists`` 아래 주어진 경로에 있는지 확인"""
+        return len(self.path) == len(tags) + 1 and all(
+            e.tag == t for e, t in zip(self.path[1:], tags)
+        )
@@ -0,0 +1,174 @@
+"""Process-pool parsing of top-level rule groups.
+
+Exports usually hold many independent top-level rule groups. The parse is
+split at those boundaries: the top-level group records themselves are
+built in the calling process, and every subtree below them is walked by a
+worker with its own :class:`PathTable`. Results are merged back in
+document order and the worker path nodes are re-interned into the
+caller's table, so record order, ``path``/``group_path`` strings,
+``condition_index`` numbering and path ids are identical to a serial
+:meth:`PolicyParser.walk`.
+
+Each worker has its own :class:`ConditionCache`; their hit/miss counters
+are added to the caller's cache, but its ``conditions``/``expressions``
+sizes only count entries cached in the calling process.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .condition_parser import ConditionCache
+from .path_table import PathNode, PathTable
+
+# (subtree, names of the enclosing groups from the top)
+Unit = Tuple[Any, Tuple[str, ...]]
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(units: Sequence[Unit], compact: bool, cache_conditions: bool) -> None:
+    from .policy_parser import PolicyParser
+
+    _worker["units"] = units
+    _worker["parser"] = PolicyParser(
+        {}, compact=compact, condition_cache=ConditionCache() if cache_conditions else None
+    )
+
+
+def _parse_units(bounds: Tuple[int, int]) -> Tuple[list, List[Tuple[int, Optional[int], str]], Dict[str, int]]:
+    """Walk ``units[start:stop]``.
+
+    Returns the records, the path nodes created and the condition cache
+    counters added by this batch.
+    """
+    parser = _worker["parser"]
+    cache = parser.condition_cache
+    before = cache.counts() if cache is not None else {}
+    parser.paths = PathTable()
+    records = []
+    start, stop = bounds
+    for obj, chain in _worker["units"][start:stop]:
+        records.extend(parser.walk(obj, _resolve(parser.paths, chain)))
+    nodes = [(node.id, node.parent_id, node.name) for node in parser.paths.nodes]
+    counts = {name: value - before[name] for name, value in cache.counts().items()} if cache is not None else {}
+    return records, nodes, counts
+
+
+def _resolve(paths: PathTable, chain: Tuple[str, ...]) -> Optional[PathNode]:
+    node = None
+    for name in chain:
+        node = paths.child(node, name)
+    return node
+
+
+def split(obj: Any, chain: Tuple[str, ...] = ()) -> List[Tuple[str, Any, Tuple[str, ...]]]:
+    """Split a rule-group tree into top-level nodes and independent subtrees.
+
+    Returns ``("node", obj, chain)`` steps for the top-level named elements,
+    to be turned into records by the caller, and ``("unit", obj, chain)``
+    steps for every named element directly below them. The steps are in
+    the order :meth:`PolicyParser.walk` would visit them.
+    """
+    steps = []
+    if isinstance(obj, dict):
+        if "@name" in obj:
+            steps.append(("node", obj, chain))
+            if "rules" in obj or "ruleGroups" in obj:
+                chain = chain + (obj["@name"],) if obj["@name"] else chain
+        for value in obj.values():
+            _collect(value, chain, steps)
+    elif isinstance(obj, list):
+        for item in obj:
+            steps.extend(split(item, chain))
+    return steps
+
+
+def _collect(obj: Any, chain: Tuple[str, ...], steps: list) -> None:
+    if isinstance(obj, dict):
+        if "@name" in obj:
+            steps.append(("unit", obj, chain))
+            return
+        values = obj.values()
+    elif isinstance(obj, list):
+        values = obj
+    else:
+        return
+    for value in values:
+        _collect(value, chain, steps)
+
+
+def plan(steps: list, workers: int) -> Tuple[list, List[Unit]]:
+    """Group consecutive ``unit`` steps into contiguous batches.
+
+    Returns the steps with each run of units replaced by ``("batch",
+    (start, stop), None)`` entries, several per worker for load balancing,
+    and the flat list of units the bounds refer to.
+    """
+    units: List[Unit] = [(obj, chain) for kind, obj, chain in steps if kind == "unit"]
+    size = max(1, len(units) // (workers * 4))
+
+    planned = []
+    run_start = run_stop = 0
+    for kind, obj, chain in steps + [("end", None, ())]:
+        if kind == "unit":
+            run_stop += 1
+            continue
+        for start in range(run_start, run_stop, size):
+            planned.append(("batch", (start, min(start + size, run_stop)), None))
+        run_start = run_stop
+        if kind == "node":
+            planned.append((kind, obj, chain))
+    return planned, units
+
+
+def _mp_context():
+    if "fork" in multiprocessing.get_all_start_methods():
+        # 자식 프로세스가 부모의 파싱된 문서를 복사 없이 공유
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def iter_parallel(parser, workers: Optional[int] = None) -> Iterator[Any]:
+    """Yield the records of ``parser.data`` parsed by a process pool.
+
+    Args:
+        parser: non-streaming :class:`PolicyParser`; its :attr:`paths` table
+            is filled exactly as a serial walk would fill it
+        workers: number of worker processes (default: ``os.cpu_count()``)
+    """
+    workers = workers or os.cpu_count() or 1
+    steps = split(parser.data)
+    if workers < 2 or sum(1 for step in steps if step[0] == "unit") < 2:
+        yield from parser.walk(parser.data)
+        return
+
+    planned, units = plan(steps, workers)
+    paths = parser.paths
+    initargs = (units, parser.compact, parser.condition_cache is not None)
+    with ProcessPoolExecutor(workers, mp_context=_mp_context(), initializer=_init_worker, initargs=initargs) as pool:
+        results = pool.map(_parse_units, [obj for kind, obj, _ in planned if kind == "batch"])
+        for kind, obj, chain in planned:
+            if kind == "node":
+                is_group = "rules" in obj or "ruleGroups" in obj
+                yield from parser.node_records(obj, _resolve(paths, chain), is_group)
+            else:
+                records, nodes, counts = next(results)
+                if parser.condition_cache is not None:
+                    parser.condition_cache.add_counts(counts)
+                yield from _merge(paths, records, nodes, parser.compact)
+
+
+def _merge(paths: PathTable, records: list, nodes: list, compact: bool) -> list:
+    """Re-intern worker path nodes into ``paths`` and rebind compact records."""
+    mapping: Dict[int, PathNode] = {}
+    for node_id, parent_id, name in nodes:
+        mapping[node_id] = paths.child(mapping.get(parent_id), name)
+    if compact:
+        for rec in records:
+            if rec.path_node is not None:
+                rec.path_node = mapping[rec.path_node.id]
+            if rec.group_node is not None:
+                rec.group_node = mapping[rec.group_node.id]
+    return records
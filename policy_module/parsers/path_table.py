@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class PathNode:
+    """One named group or rule in the rule-group tree.
+
+    The ``" > "``-joined path is built on first access and cached, so every
+    record of the same node shares a single string.
+    """
+
+    __slots__ = ("id", "parent", "name", "_path")
+
+    def __init__(self, node_id: int, parent: Optional["PathNode"], name: str) -> None:
+        self.id = node_id
+        self.parent = parent
+        self.name = name
+        self._path = None
+
+    @property
+    def parent_id(self) -> Optional[int]:
+        return self.parent.id if self.parent is not None else None
+
+    @property
+    def path(self) -> str:
+        if self._path is None:
+            self._path = f"{self.parent.path} > {self.name}" if self.parent is not None else self.name
+        return self._path
+
+    def __repr__(self) -> str:
+        return f"<PathNode {self.id} {self.path!r}>"
+
+
+class PathTable:
+    """Interned table of rule-group paths.
+
+    Nodes are numbered from ``1`` in the order they are first seen, which
+    is document order, and point at their parent node.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: List[PathNode] = []
+        self._index: Dict[Tuple[Optional[int], str], PathNode] = {}
+        self._by_path: Optional[Dict[str, PathNode]] = None
+
+    def child(self, parent: Optional[PathNode], name: str) -> PathNode:
+        """Return the node for ``name`` below ``parent``, creating it if needed."""
+        key = (parent.id if parent is not None else None, name)
+        node = self._index.get(key)
+        if node is None:
+            node = PathNode(len(self.nodes) + 1, parent, name)
+            self.nodes.append(node)
+            self._index[key] = node
+            self._by_path = None
+        return node
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __getitem__(self, node_id: int) -> PathNode:
+        return self.nodes[node_id - 1]
+
+    def path(self, node_id: Optional[int]) -> str:
+        return self[node_id].path if node_id else ""
+
+    def find(self, path: str) -> Optional[PathNode]:
+        """Look up a node by its full path string."""
+        if self._by_path is None:
+            self._by_path = {node.path: node for node in self.nodes}
+        return self._by_path.get(path)
+
+    def rows(self, start: int = 0) -> List[dict]:
+        """Nodes as ``id``/``parent_id``/``name``/``path`` dicts, from index ``start``."""
+        return [
+            {"id": node.id, "parent_id": node.parent_id, "name": node.name, "path": node.path}
+            for node in self.nodes[start:]
+        ]
@@ -1,106 +1,321 @@
 import json
 import pandas as pd
-import xmltodict
-from .condition_parser import ConditionParser
+from . import columnar
+from .condition_parser import ConditionCache, ConditionParser, FrozenRow
+from .library import ParsedLibrary
+from .parallel import iter_parallel
+from .path_table import PathNode, PathTable
+from .records import ConditionRecord, PolicyRecord, as_dict
+from .subtree_index import SubtreeIndex, iter_incremental
+from .xml_stream import LibraryStream, SectionHandler, element_to_dict
 
 class PolicyParser:
-    def __init__(self, source, from_xml: bool = False):
-        if from_xml:
-            parsed = xmltodict.parse(source)
-            self.data = parsed.get("libraryContent", {}).get("ruleGroup", {})
-        elif isinstance(source, dict):
-            self.data = source.get("libraryContent", {}).get("ruleGroup", {})
+    def __init__(
+        self,
+        source,
+        from_xml: bool = False,
+        stream: bool = False,
+        compact: bool = False,
+        condition_cache: ConditionCache = None,
+        workers: int = 0,
+        previous_subtrees: SubtreeIndex = None,
+    ):
+        """
+        Args:
+            source: dict, XML 문자열/바이트 또는 :class:`ParsedLibrary`.
+                ``stream=True`` 인 경우 XML 파일 경로나 파일 객체도 가능
+            from_xml: XML 소스 여부
+            stream: ``iterparse`` 방식으로 XML을 읽어 메모리 사용량을 제한
+            compact: dict 대신 :class:`PolicyRecord` 레코드 반환
+            condition_cache: 동일한 조건식을 한 번만 파싱하기 위한 캐시
+            workers: 2 이상이면 최상위 룰 그룹 단위로 나누어 프로세스 풀에서
+                병렬 파싱 (``0``/``1``: 직렬, ``None``: CPU 수). 결과는 직렬
+                파싱과 동일한 순서/경로로 병합됨
+            previous_subtrees: 이전 파싱의 :class:`SubtreeIndex`. 지정하면 내용
+                해시가 같은 그룹/룰은 다시 파싱하지 않고 이전 레코드를 재사용하며,
+                이번 파싱의 인덱스는 :attr:`subtrees`에 저장됨
+
+        레코드의 ``path``/``group_path`` 문자열은 :attr:`paths` 테이블에서
+        노드별로 한 번만 생성되어 같은 노드의 레코드 간에 공유됩니다.
+        """
+        self.stream = stream
+        self.compact = compact
+        self.workers = workers
+        self.condition_cache = condition_cache
+        self._condition_parser = ConditionParser(None, cache=condition_cache)
+        if stream:
+            if not from_xml:
+                raise ValueError("Streaming mode requires an XML source.")
+            if workers != 0:
+                raise ValueError("Parallel parsing is not supported in streaming mode.")
+            if previous_subtrees is not None:
+                raise ValueError("Incremental parsing is not supported in streaming mode.")
+            self.source = source
+            self.data = None
         else:
-            raise ValueError("Invalid data source provided. Must be dict or XML string.")
-        
+            self.data = ParsedLibrary.load(source, from_xml=from_xml).rule_group
+        if workers != 0 and previous_subtrees is not None:
+            raise ValueError("Incremental parsing cannot be combined with parallel parsing.")
+        self.previous_subtrees = previous_subtrees
+        self.subtrees = SubtreeIndex() if previous_subtrees is not None else None
+        self.paths = PathTable()
         self.rulegroup_records = []
         self.rule_records = []
 
     def parse_condition(self, condition_dict: dict):
         try:
+            if self.condition_cache is not None and condition_dict:
+                # 캐시 적중 시 ConditionParser 생성 없이 공유된 행 반환 (tuple)
+                return self.condition_cache.condition(condition_dict, self._condition_parser.parse_condition)
             return ConditionParser(condition_dict).to_rows()   # List[Dict]
         except Exception as e:
             return [{"error": str(e)}]
-    
+
+    def path_node(self, obj: dict, parent: PathNode = None) -> PathNode:
+        """Path table node of ``obj`` (its group's node when it has no name)."""
+        current_name = obj.get("@name")
+        return self.paths.child(parent, current_name) if current_name else parent
+
+    def node_records(self, obj: dict, parent: PathNode, is_group: bool) -> list:
+        """Build the records of a single group/rule node (children excluded).
+
+        Args:
+            obj: group/rule dict
+            parent: path table node of the enclosing group (``None`` at top level)
+            is_group: whether ``obj`` is a rule group
+        """
+        records = []
+        node = self.path_node(obj, parent)
+        path = node.path if node is not None else ""
+
+        # group 또는 rule 여부와 관계없이 condition이 있으면 파싱
+        parsed_conditions = self.parse_condition(obj.get("condition", {}))
+        if not isinstance(parsed_conditions, (list, tuple)):
+            parsed_conditions = [parsed_conditions]
+        if not parsed_conditions:
+            parsed_conditions = [None]
+
+        for cond in parsed_conditions:
+            cond = cond or {}
+            first = cond.get("index", 1) == 1
+            if self.compact:
+                records.append(self.compact_record(obj, node, parent, cond, first, is_group, self.condition_cache))
+                continue
+            values = cond.get("property_values")
+            if isinstance(values, (list, tuple)):
+                condition_values = ", ".join(values)
+            elif values is not None:
+                condition_values = str(values)
+            else:
+                condition_values = None
+
+            record = {
+                "id": obj.get("@id") if first else None,
+                "name": obj.get("@name") if first else None,
+                "enabled": obj.get("@enabled") if first else None,
+                "description": obj.get("description") if first else None,
+                "condition_raw": cond,  # 전체 반환 데이터를 저장
+                "condition_prefix": cond.get("prefix"),
+                "condition_property": cond.get("property"),
+                "condition_operator": cond.get("operator"),
+                "condition_values": condition_values,
+                "condition_result": cond.get("expression_value"),
+                "condition_index": cond.get("index"),
+                "condition_parent_index": cond.get("parent_index"),
+                "path": path
+            }
+            if is_group:
+                record.update({
+                    "defaultRights": obj.get("@defaultRights") if first else None,
+                    "cycleRequest": obj.get("@cycleRequest") if first else None,
+                    "cycleResponse": obj.get("@cycleResponse") if first else None,
+                    "cycleEmbeddedObject": obj.get("@cycleEmbeddedObject") if first else None,
+                    "cloudSynced": obj.get("@cloudSynced") if first else None,
+                    "acElements": str(obj.get("acElements")) if first else None,
+                    "group_path": (parent.path if parent is not None else "") if first else None,
+                    "type": "group"
+                })
+            else:
+                record.update({
+                    "actionContainer_raw": str(obj.get("actionContainer")) if first else None,
+                    "immediateActions_raw": str(obj.get("immediateActionContainers")) if first else None,
+                    "group_path": (parent.path if parent is not None else "") if first else None,
+                    "type": "rule"
+                })
+            records.append(record)
+        return records
+
+    @staticmethod
+    def compact_record(
+        obj: dict,
+        node: PathNode,
+        parent: PathNode,
+        cond: dict,
+        first: bool,
+        is_group: bool,
+        cache: ConditionCache = None,
+    ) -> PolicyRecord:
+        """Build the :class:`PolicyRecord` equivalent of one dict record."""
+        if not cond:
+            condition = None
+        elif cache is not None and isinstance(cond, FrozenRow):
+            condition = cache.compact(cond, ConditionRecord.from_row)
+        else:
+            condition = ConditionRecord.from_row(cond)
+        record = PolicyRecord(
+            type="group" if is_group else "rule",
+            first=first,
+            path_node=node,
+            group_node=parent,
+            condition=condition,
+        )
+        if not first:
+            return record
+        record.id = obj.get("@id")
+        record.name = obj.get("@name")
+        record.enabled = obj.get("@enabled")
+        record.description = obj.get("description")
+        if is_group:
+            record.default_rights = obj.get("@defaultRights")
+            record.cycle_request = obj.get("@cycleRequest")
+            record.cycle_response = obj.get("@cycleResponse")
+            record.cycle_embedded_object = obj.get("@cycleEmbeddedObject")
+            record.cloud_synced = obj.get("@cloudSynced")
+            record.ac_elements = obj.get("acElements")
+        else:
+            record.action_container = obj.get("actionContainer")
+            record.immediate_actions = obj.get("immediateActionContainers")
+        return record
+
+    def walk(self, obj, parent: PathNode = None):
+        """Yield the records of ``obj`` and everything below it in document order.
+
+        Args:
+            obj: parsed subtree
+            parent: path table node of the group enclosing ``obj``
+        """
+        if isinstance(obj, dict):
+            is_group = "@name" in obj and ("rules" in obj or "ruleGroups" in obj)
+
+            if "@name" in obj:
+                yield from self.node_records(obj, parent, is_group)
+
+            if is_group:
+                parent = self.path_node(obj, parent)
+
+            for v in obj.values():
+                if isinstance(v, (dict, list)):
+                    yield from self.walk(v, parent)
+
+        elif isinstance(obj, list):
+            for item in obj:
+                if isinstance(item, (dict, list)):
+                    yield from self.walk(item, parent)
+
+    def iter_records(self):
+        """Yield policy records one by one without keeping them on the parser."""
+        if self.stream:
+            stream = LibraryStream({"ruleGroup": RuleGroupStreamHandler(self)})
+            for _, record in stream.iter_records(self.source):
+                yield record
+        elif self.previous_subtrees is not None:
+            yield from iter_incremental(self, self.previous_subtrees, self.subtrees)
+        elif self.workers != 0:
+            yield from iter_parallel(self, self.workers)
+        else:
+            yield from self.walk(self.data)
+
     def parse(self):
-        def walk(obj, stack=None):
-            if stack is None:
-                stack = []
-            
-            if isinstance(obj, dict):
-                is_group = "@name" in obj and ("rules" in obj or "ruleGroups" in obj)
-                current_name = obj.get("@name")
-            
-                # group 또는 rule 여부와 관계없이 condition이 있으면 파싱
-                if is_group or "@name" in obj:
-                    parsed_conditions = self.parse_condition(obj.get("condition", {}))
-                    if not isinstance(parsed_conditions, list):
-                        parsed_conditions = [parsed_conditions]
-                    if not parsed_conditions:
-                        parsed_conditions = [None]
-
-                    for cond in parsed_conditions:
-                        cond = cond or {}
-                        first = cond.get("index", 1) == 1
-                        values = cond.get("property_values")
-                        if isinstance(values, (list, tuple)):
-                            condition_values = ", ".join(values)
-                        elif values is not None:
-                            condition_values = str(values)
-                        else:
-                            condition_values = None
-                        
-                        record = {
-                            "id": obj.get("@id") if first else None,
-                            "name": obj.get("@name") if first else None,
-                            "enabled": obj.get("@enabled") if first else None,
-                            "description": obj.get("description") if first else None,
-                            "condition_raw": cond,  # 전체 반환 데이터를 저장
-                            "condition_prefix": cond.get("prefix"),
-                            "condition_property": cond.get("property"),
-                            "condition_operator": cond.get("operator"),
-                            "condition_values": condition_values,
-                            "condition_result": cond.get("expression_value"),
-                            "condition_index": cond.get("index"),
-                            "condition_parent_index": cond.get("parent_index"),
-                            "path": " > ".join(stack + [current_name] if current_name else stack)
-                        }
-                        if is_group:
-                            record.update({
-                                "defaultRights": obj.get("@defaultRights") if first else None,
-                                "cycleRequest": obj.get("@cycleRequest") if first else None,
-                                "cycleResponse": obj.get("@cycleResponse") if first else None,
-                                "cycleEmbeddedObject": obj.get("@cycleEmbeddedObject") if first else None,
-                                "cloudSynced": obj.get("@cloudSynced") if first else None,
-                                "acElements": str(obj.get("acElements")) if first else None,
-                                "type": "group"
-                            })
-                            self.rule_records.append(record)
-                        else:
-                            record.update({
-                                "actionContainer_raw": str(obj.get("actionContainer")) if first else None,
-                                "immediateActions_raw": str(obj.get("immediateActionContainers")) if first else None,
-                                "group_path": " > ".join(stack) if first else None,
-                                "type": "rule"
-                            })
-                            self.rule_records.append(record)
-                
-                if is_group and current_name:
-                    stack.append(current_name)
-                
-                for k, v in obj.items():
-                    walk(v, stack)
-                
-                if is_group and current_name:
-                    stack.pop()
-                
-            elif isinstance(obj, list):
-                for item in obj:
-                    walk(item, stack)
-        
-        walk(self.data)
+        self.rule_records.extend(self.iter_records())
         return self.rule_records
-    
+
+    def to_columnar(self, path: str, row_group_size: int = columnar.DEFAULT_ROW_GROUP_SIZE) -> int:
+        """Parquet/Arrow 파일로 저장 (확장자로 형식 결정)
+
+        ``parse()`` 이전에 호출하면 레코드를 모으지 않고 파싱하면서 바로
+        row group 단위로 기록합니다. 기록한 행 수를 반환합니다.
+        """
+        return columnar.write_policy(self.rule_records or self.iter_records(), path, row_group_size)
+
     def to_excel(self, rule_path: str):
-        df_rules = pd.DataFrame(self.rule_records)
+        df_rules = pd.DataFrame([as_dict(rec) for rec in self.rule_records])
         df_rules.to_excel(rule_path, index=False, engine="openpyxl")
+
+
+class RuleGroupStreamHandler(SectionHandler):
+    """Streams ``libraryContent/ruleGroup`` into :class:`PolicyParser` records.
+
+    A named element becomes a group as soon as its ``rules`` or
+    ``ruleGroups`` child starts; the group record is emitted from the
+    children read so far (condition, description, acElements) and the rest
+    of the group is streamed. Every other named element is collected whole
+    and run through :meth:`PolicyParser.walk` once it ends, so records come
+    out identical to the dict-based parser as long as group metadata
+    precedes ``rules``/``ruleGroups``, which is how exports are written.
+    """
+
+    CANDIDATE = "candidate"  # 이름 있는 요소, 그룹 여부 미확정
+    GROUP = "group"
+    CONTAINER = "container"  # 스트리밍 대상 (rules, ruleGroups 등)
+    INNER = "inner"  # 후보 요소 내부, 통째로 수집
+
+    def __init__(self, parser: PolicyParser) -> None:
+        self.parser = parser
+        self.frames = []  # [element, kind]
+        self.groups = []  # 열려 있는 그룹의 경로 노드
+
+    def start(self, elem):
+        records = []
+        parent = self.frames[-1] if self.frames else None
+        if parent and parent[1] == self.CANDIDATE and elem.tag in ("rules", "ruleGroups"):
+            records = self._open_group(parent, elem)
+            kind = self.CONTAINER
+        elif parent and parent[1] in (self.CANDIDATE, self.INNER):
+            kind = self.INNER
+        elif "name" in elem.attrib:
+            kind = self.CANDIDATE
+        else:
+            kind = self.CONTAINER
+        self.frames.append([elem, kind])
+        return records
+
+    def end(self, elem):
+        _, kind = self.frames.pop()
+        records = []
+        if kind == self.CANDIDATE:
+            records = list(self.parser.walk(element_to_dict(elem), self._parent()))
+        elif kind == self.GROUP:
+            self.groups.pop()
+        if kind != self.INNER and self.frames:
+            self.frames[-1][0].remove(elem)
+        return records
+
+    def _open_group(self, frame, first_child):
+        elem = frame[0]
+        obj = {f"@{k}": v for k, v in elem.attrib.items()}
+        # 파서가 앞서 읽은 요소가 트리에 있을 수 있으므로 rules/ruleGroups 이전 자식만 사용
+        children = []
+        for child in elem:
+            if child is first_child:
+                break
+            children.append(child)
+        for child in children:
+            value = element_to_dict(child)
+            if child.tag in obj:
+                existing = obj[child.tag]
+                obj[child.tag] = existing + [value] if isinstance(existing, list) else [existing, value]
+            else:
+                obj[child.tag] = value
+
+        records = self.parser.node_records(obj, self._parent(), is_group=True)
+        self.groups.append(self.parser.path_node(obj, self._parent()))
+        for key, value in obj.items():
+            if not key.startswith("@"):
+                records.extend(self.parser.walk(value, self._parent()))
+        for child in children:
+            elem.remove(child)
+        frame[1] = self.GROUP
+        return records
+
+    def _parent(self):
+        return self.groups[-1] if self.groups else None
@@ -0,0 +1,280 @@
+"""Compact record types for parsed policy data.
+
+The parsers return plain dicts by default. With ``compact=True`` they
+return the slotted records below instead: a policy row keeps a reference
+to a shared :class:`ConditionRecord` rather than a copy of every condition
+column, list entries share one :class:`ListInfo` per list, and stringified
+raw containers are only built when asked for. Records behave like
+read-only mappings (``get``, ``[]``, ``keys``) so existing consumers keep
+working; call :meth:`to_dict` or :func:`as_dict` for a plain dict.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from .path_table import PathNode
+
+_MISSING = object()
+
+# Pickled results (ParseCache) embed these classes and the dict layout;
+# bump whenever records change so stale cache entries are not reused.
+RECORDS_VERSION = 2
+
+CONDITION_KEYS = (
+    "prefix", "open_bracket", "close_bracket", "property", "operator",
+    "property_values", "expression_value", "expression_mode",
+    "index", "parent_index",
+)
+
+_COMMON_KEYS = (
+    "id", "name", "enabled", "description", "condition_raw",
+    "condition_prefix", "condition_property", "condition_operator",
+    "condition_values", "condition_result", "condition_index",
+    "condition_parent_index", "path",
+)
+GROUP_KEYS = _COMMON_KEYS + (
+    "defaultRights", "cycleRequest", "cycleResponse", "cycleEmbeddedObject",
+    "cloudSynced", "acElements", "group_path", "type",
+)
+RULE_KEYS = _COMMON_KEYS + (
+    "actionContainer_raw", "immediateActions_raw", "group_path", "type",
+)
+
+LIST_INFO_KEYS = (
+    "list_name", "list_id", "list_type_id", "list_classifier", "list_description",
+)
+
+
+class _MappingMixin:
+    """Read-only mapping access on top of :meth:`keys` and attributes."""
+
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in self.keys():
+            return default
+        return getattr(self, key)
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: _plain(self.get(key)) for key in self.keys()}
+
+
+@dataclass(slots=True, frozen=True)
+class ConditionRecord(_MappingMixin):
+    """One condition row produced by :class:`ConditionParser`."""
+
+    prefix: Optional[str] = None
+    open_bracket: int = 0
+    close_bracket: int = 0
+    property: Optional[str] = None
+    operator: Optional[str] = None
+    property_values: Any = None
+    expression_value: Any = None
+    expression_mode: Optional[str] = None
+    index: Optional[int] = None
+    parent_index: Optional[int] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "ConditionRecord":
+        if "error" in row:
+            return cls(error=row["error"])
+        return cls(**{key: row.get(key) for key in CONDITION_KEYS})
+
+    def keys(self) -> Tuple[str, ...]:
+        return ("error",) if self.error is not None else CONDITION_KEYS
+
+
+@dataclass(slots=True)
+class PolicyRecord(_MappingMixin):
+    """One group/rule condition row produced by :class:`PolicyParser`.
+
+    Only the first row of a group or rule (``first``) carries the node
+    attributes; the ``condition_*`` columns are derived from ``condition``
+    and ``path``/``group_path`` from the shared :class:`PathNode` entries.
+    """
+
+    type: str
+    first: bool
+    path_node: Optional[PathNode] = None
+    group_node: Optional[PathNode] = None
+    condition: Optional[ConditionRecord] = None
+    id: Optional[str] = None
+    name: Optional[str] = None
+    enabled: Optional[str] = None
+    description: Any = None
+    default_rights: Optional[str] = None
+    cycle_request: Optional[str] = None
+    cycle_response: Optional[str] = None
+    cycle_embedded_object: Optional[str] = None
+    cloud_synced: Optional[str] = None
+    ac_elements: Any = None
+    action_container: Any = None
+    immediate_actions: Any = None
+    lists_resolved: Any = None
+
+    def keys(self) -> Tuple[str, ...]:
+        keys = GROUP_KEYS if self.type == "group" else RULE_KEYS
+        if self.lists_resolved is not None:
+            keys = keys + ("lists_resolved",)
+        return keys
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key != "lists_resolved":
+            raise KeyError(f"{key} is read-only on compact records")
+        self.lists_resolved = value
+
+    def _condition(self, key: str) -> Any:
+        return self.condition.get(key) if self.condition is not None else None
+
+    @property
+    def path(self) -> str:
+        return self.path_node.path if self.path_node is not None else ""
+
+    @property
+    def group_path(self) -> Optional[str]:
+        if not self.first:
+            return None
+        return self.group_node.path if self.group_node is not None else ""
+
+    @property
+    def condition_raw(self):
+        return self.condition if self.condition is not None else {}
+
+    @property
+    def condition_prefix(self):
+        return self._condition("prefix")
+
+    @property
+    def condition_property(self):
+        return self._condition("property")
+
+    @property
+    def condition_operator(self):
+        return self._condition("operator")
+
+    @property
+    def condition_values(self):
+        values = self._condition("property_values")
+        if isinstance(values, (list, tuple)):
+            return ", ".join(values)
+        return str(values) if values is not None else None
+
+    @property
+    def condition_result(self):
+        return self._condition("expression_value")
+
+    @property
+    def condition_index(self):
+        return self._condition("index")
+
+    @property
+    def condition_parent_index(self):
+        return self._condition("parent_index")
+
+    @property
+    def defaultRights(self):
+        return self.default_rights
+
+    @property
+    def cycleRequest(self):
+        return self.cycle_request
+
+    @property
+    def cycleResponse(self):
+        return self.cycle_response
+
+    @property
+    def cycleEmbeddedObject(self):
+        return self.cycle_embedded_object
+
+    @property
+    def cloudSynced(self):
+        return self.cloud_synced
+
+    @property
+    def acElements(self):
+        return str(self.ac_elements) if self.first else None
+
+    @property
+    def actionContainer_raw(self):
+        return str(self.action_container) if self.first else None
+
+    @property
+    def immediateActions_raw(self):
+        return str(self.immediate_actions) if self.first else None
+
+
+@dataclass(slots=True, frozen=True)
+class ListInfo:
+    """Metadata shared by every entry of one list."""
+
+    list_name: Optional[str] = None
+    list_id: Optional[str] = None
+    list_type_id: Optional[str] = None
+    list_classifier: Optional[str] = None
+    list_description: Any = None
+
+
+@dataclass(slots=True, frozen=True)
+class ListEntryRecord(_MappingMixin):
+    """One list entry produced by :class:`ListsParser`.
+
+    ``entry_keys`` is shared between entries with the same layout, so each
+    record only owns the tuple of entry values.
+    """
+
+    info: ListInfo
+    entry_keys: Tuple[str, ...] = ()
+    entry_values: Tuple[Any, ...] = ()
+
+    def keys(self) -> Tuple[str, ...]:
+        return LIST_INFO_KEYS + tuple(k for k in self.entry_keys if k not in LIST_INFO_KEYS)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.entry_keys:
+            return self.entry_values[self.entry_keys.index(key)]
+        if key in LIST_INFO_KEYS:
+            return getattr(self.info, key)
+        return default
+
+
+class ListRecordFactory:
+    """Builds :class:`ListEntryRecord` objects, sharing list metadata and key tuples."""
+
+    def __init__(self) -> None:
+        self._info_source = None
+        self._info = None
+        self._keys: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    def __call__(self, info: Dict[str, Any], entry: Optional[Dict[str, Any]] = None) -> ListEntryRecord:
+        if info is not self._info_source:
+            self._info_source = info
+            self._info = ListInfo(**info)
+        if not entry:
+            return ListEntryRecord(self._info)
+        keys = tuple(entry)
+        keys = self._keys.setdefault(keys, keys)
+        return ListEntryRecord(self._info, keys, tuple(entry.values()))
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, _MappingMixin):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+def as_dict(record: Any) -> Any:
+    """Return ``record`` as a plain dict (dict records are returned as-is)."""
+    return record.to_dict() if isinstance(record, _MappingMixin) else record
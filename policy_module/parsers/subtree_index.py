@@ -0,0 +1,201 @@
+"""Content hashes of rule-group subtrees for incremental re-parsing.
+
+Every named element of the rule-group tree (group or rule) gets a
+Merkle-style digest: a SHA-256 over its own content (everything except the
+``rules``/``ruleGroups`` children) followed by the digests of its named
+children. A :class:`SubtreeIndex` keeps, per ``(parent path, digest)``,
+the records the element produced and the digests of its children. When the
+next export is parsed with the previous index, every element whose key is
+found is restored from the index together with its whole subtree, and only
+changed elements go through :meth:`PolicyParser.node_records`.
+
+Hashing still reads the whole export, but it is a ``marshal`` dump per
+element rather than condition parsing. Restored records are shallow copies
+of the ones held by the previous index, so results returned by the earlier
+parse are left untouched; condition rows are read-only and stay shared.
+"""
+
+import copy
+import hashlib
+import json
+import marshal
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .path_table import PathNode
+from .records import PolicyRecord, as_dict
+
+CHILD_KEYS = ("rules", "ruleGroups")
+
+# marshal 버전 0은 참조/intern 플래그를 쓰지 않아 같은 내용이면 항상 같은 바이트
+_MARSHAL_VERSION = 0
+_NAME_KEY = marshal.dumps("@name", _MARSHAL_VERSION)
+
+
+@dataclass(slots=True)
+class SubtreeEntry:
+    """Records of one named element and the digests of its named children."""
+
+    name: Optional[str]
+    is_group: bool
+    records: list
+    children: Tuple[str, ...] = ()
+
+
+class SubtreeIndex:
+    """Parsed records of rule-group subtrees keyed by parent path and digest."""
+
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[str, str], SubtreeEntry] = {}
+        self.parsed = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, parent_path: str, digest: str) -> Optional[SubtreeEntry]:
+        return self.entries.get((parent_path, digest))
+
+    def add(self, parent_path: str, digest: str, entry: SubtreeEntry) -> None:
+        self.entries[(parent_path, digest)] = entry
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self.entries), "parsed": self.parsed, "reused": self.reused}
+
+    def rows(self) -> List[dict]:
+        """Entries as JSON-serializable dicts (records as plain dicts)."""
+        return [
+            {
+                "parent_path": parent_path,
+                "content_hash": digest,
+                "name": entry.name,
+                "is_group": entry.is_group,
+                "children": list(entry.children),
+                "records": [_stored(rec) for rec in entry.records],
+            }
+            for (parent_path, digest), entry in self.entries.items()
+        ]
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> "SubtreeIndex":
+        """Rebuild an index from :meth:`rows` dicts or objects with the same attributes."""
+        index = cls()
+        for row in rows:
+            get = row.get if isinstance(row, dict) else lambda key: getattr(row, key)
+            index.add(get("parent_path"), get("content_hash"), SubtreeEntry(
+                name=get("name"),
+                is_group=bool(get("is_group")),
+                records=list(get("records") or []),
+                children=tuple(get("children") or ()),
+            ))
+        return index
+
+
+def _stored(record: Any) -> dict:
+    data = dict(as_dict(record))
+    data.pop("lists_resolved", None)  # 리스트 해석 결과는 다음 파싱 때 다시 계산
+    return data
+
+
+def named_children(obj: Any) -> List[dict]:
+    """Named elements directly below ``obj`` in :meth:`PolicyParser.walk` order."""
+    found: List[dict] = []
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            if "@name" in value and value is not obj:
+                found.append(value)
+                continue
+            stack.extend(reversed(list(value.values())))
+        elif isinstance(value, list):
+            stack.extend(reversed(value))
+    return found
+
+
+def subtree_digest(obj: dict, nodes: Dict[int, Tuple[str, List[dict]]]) -> str:
+    """Merkle digest of a named element.
+
+    Fills ``nodes`` with ``id(element) -> (digest, named children)`` for the
+    element and everything below it.
+    """
+    own = {k: v for k, v in obj.items() if k not in CHILD_KEYS}
+    try:
+        encoded = marshal.dumps(own, _MARSHAL_VERSION)
+        nested = encoded.count(_NAME_KEY) > ("@name" in obj)
+    except ValueError:
+        encoded = json.dumps(own, separators=(",", ":"), default=str).encode("utf-8")
+        nested = True
+    if nested:
+        # 이름 있는 요소가 rules/ruleGroups 밖에도 있을 수 있으면 전체 탐색
+        children = named_children(obj)
+    else:
+        children = named_children({k: obj[k] for k in CHILD_KEYS if k in obj})
+    h = hashlib.sha256(encoded)
+    for child in children:
+        h.update(subtree_digest(child, nodes).encode("ascii"))
+    digest = h.hexdigest()
+    nodes[id(obj)] = (digest, children)
+    return digest
+
+
+def iter_incremental(parser, previous: SubtreeIndex, current: SubtreeIndex) -> Iterator[Any]:
+    """Yield the records of ``parser.data``, reusing unchanged subtrees.
+
+    Args:
+        parser: non-streaming :class:`PolicyParser`
+        previous: index of an earlier parse (may be empty)
+        current: index filled with the entries of this parse
+    """
+    nodes: Dict[int, Tuple[str, List[dict]]] = {}
+    top = [parser.data] if isinstance(parser.data, dict) and "@name" in parser.data else named_children(parser.data)
+    for obj in top:
+        subtree_digest(obj, nodes)
+    for obj in top:
+        yield from _visit(parser, obj, None, nodes, previous, current)
+
+
+def _path(node: Optional[PathNode]) -> str:
+    return node.path if node is not None else ""
+
+
+def _visit(parser, obj, parent, nodes, previous, current) -> Iterator[Any]:
+    digest, children = nodes[id(obj)]
+    entry = previous.get(_path(parent), digest)
+    if entry is not None:
+        yield from _reuse(parser, entry, digest, parent, previous, current)
+        return
+
+    is_group = any(key in obj for key in CHILD_KEYS)
+    records = parser.node_records(obj, parent, is_group)
+    current.add(_path(parent), digest, SubtreeEntry(
+        obj.get("@name"), is_group, records, tuple(nodes[id(c)][0] for c in children)
+    ))
+    current.parsed += 1
+    yield from records
+
+    if is_group:
+        parent = parser.path_node(obj, parent)
+    for child in children:
+        yield from _visit(parser, child, parent, nodes, previous, current)
+
+
+def _reuse(parser, entry, digest, parent, previous, current) -> Iterator[Any]:
+    node = parser.paths.child(parent, entry.name) if entry.name else parent
+    # 이전 파싱 결과를 그대로 쓰는 쪽이 있을 수 있으므로 복사본만 변경
+    records = [copy.copy(record) for record in entry.records]
+    for record in records:
+        if isinstance(record, PolicyRecord):
+            # 이전 파싱의 경로 노드 대신 이번 경로 테이블의 노드를 가리키도록 변경
+            record.path_node = node
+            record.group_node = parent
+    current.add(_path(parent), digest, SubtreeEntry(entry.name, entry.is_group, records, entry.children))
+    current.reused += 1
+    yield from records
+
+    if entry.is_group:
+        parent = node
+    for child_digest in entry.children:
+        child = previous.get(_path(parent), child_digest)
+        yield from _reuse(parser, child, child_digest, parent, previous, current)
+
@@ -0,0 +1,151 @@
+"""Incremental XML reading for ``libraryContent`` exports.
+
+The regular parsers work on the nested dicts produced by ``xmltodict``,
+which means the whole export has to be in memory before parsing starts.
+:class:`LibraryStream` instead feeds the XML through an
+``ElementTree.XMLPullParser`` and hands the elements below each top-level
+section (``lists``, ``configurations``, ``ruleGroup``) to a section
+handler. Handlers turn finished elements into records and drop them from
+the tree, so memory stays bounded by the largest single record.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def element_to_dict(elem: ET.Element) -> Any:
+    """Convert an element into the structure ``xmltodict.parse`` produces.
+
+    Attributes become ``@name`` keys, repeated children become lists and a
+    text-only element collapses to its (stripped) text.
+    """
+    result: Dict[str, Any] = {f"@{k}": v for k, v in elem.attrib.items()}
+    for child in elem:
+        value = element_to_dict(child)
+        if child.tag in result:
+            existing = result[child.tag]
+            if isinstance(existing, list):
+                existing.append(value)
+            else:
+                result[child.tag] = [existing, value]
+        else:
+            result[child.tag] = value
+
+    text = elem.text.strip() if elem.text else ""
+    if text:
+        if not result:
+            return text
+        result["#text"] = text
+    return result or None
+
+
+def iter_chunks(source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Yield ``source`` in chunks suitable for ``XMLPullParser.feed``.
+
+    ``source`` may be XML ``bytes``/``str``, a file path, a binary file
+    object or any iterable of byte chunks (e.g. ``response.iter_content``).
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield view[start:start + chunk_size].tobytes()
+    elif isinstance(source, str) and source.lstrip().startswith("<"):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from iter(lambda: f.read(chunk_size), b"")
+    elif hasattr(source, "read"):
+        yield from iter(lambda: source.read(chunk_size), source.read(0))
+    elif isinstance(source, Iterable):
+        for chunk in source:
+            if chunk:
+                yield chunk
+    else:
+        raise ValueError("Invalid data source provided. Must be XML bytes/str, path or file object.")
+
+
+class SectionHandler:
+    """Base class for the per-section callbacks used by :class:`LibraryStream`.
+
+    ``start`` and ``end`` are called for the section element itself and for
+    every element below it. Both return the records completed by the event.
+    Handlers are responsible for detaching elements they have consumed.
+    """
+
+    def start(self, elem: ET.Element) -> List[Any]:
+        return []
+
+    def end(self, elem: ET.Element) -> List[Any]:
+        return []
+
+
+class LibraryStream:
+    """Single-pass incremental parser for a ``libraryContent`` export.
+
+    Args:
+        handlers: Maps a top-level section tag (``lists``, ``configurations``,
+            ``ruleGroup``) to the :class:`SectionHandler` that consumes it.
+            Sections without a handler are skipped.
+    """
+
+    def __init__(self, handlers: Dict[str, SectionHandler]) -> None:
+        self.handlers = handlers
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._depth = 0
+        self._root = None
+        self._section = None
+        self._section_elem = None
+        self._skipped: List[ET.Element] = []  # open elements of a section without handler
+
+    def feed(self, data: Any) -> List[Tuple[str, Any]]:
+        """Feed a chunk and return the ``(section, record)`` pairs it completed."""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> List[Tuple[str, Any]]:
+        self._parser.close()
+        return self._drain()
+
+    def iter_records(self, source: Any, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[str, Any]]:
+        """Stream ``source`` and yield ``(section, record)`` pairs as they complete."""
+        for chunk in iter_chunks(source, chunk_size):
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    def _drain(self) -> List[Tuple[str, Any]]:
+        out: List[Tuple[str, Any]] = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                self._depth += 1
+                if self._depth == 1:
+                    self._root = elem
+                    continue
+                if self._depth == 2:
+                    self._section_elem = elem
+                    self._section = self.handlers.get(elem.tag)
+                if self._section is not None:
+                    tag = self._section_elem.tag
+                    out.extend((tag, rec) for rec in self._section.start(elem))
+                else:
+                    self._skipped.append(elem)
+                continue
+
+            if self._depth >= 2 and self._section is not None:
+                tag = self._section_elem.tag
+                out.extend((tag, rec) for rec in self._section.end(elem))
+            if self._depth == 2:
+                self._root.remove(elem)
+                self._section = None
+                self._section_elem = None
+                self._skipped.clear()
+            elif self._depth > 2 and self._section is None:
+                # 처리하지 않는 섹션은 끝난 요소를 모든 깊이에서 바로 제거
+                # (ruleGroup 하나 아래 전체 정책이 트리에 쌓이지 않도록)
+                self._skipped.pop()
+                self._skipped[-1].remove(elem)
+            self._depth -= 1
+        return out
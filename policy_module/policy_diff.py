@@ -0,0 +1,503 @@
+"""정책 구조 비교 (diff)
+
+변경 작업 전후의 두 내보내기를 파싱 결과(:class:`PolicyParser`,
+:class:`ListsParser`, :class:`ConfigurationsParser` 레코드) 단위로 비교하여
+바뀐 그룹/룰, 조건식, 리스트 엔트리, 설정 속성을 찾습니다.
+
+- 그룹/룰은 ``@id``로 짝을 짓고, 각 노드의 내용(속성과 조건식 행)과 자식
+  해시로 서브트리 해시를 만듭니다. 해시가 같은 서브트리는 자식을 보지 않고
+  건너뜁니다.
+- 부모 그룹이 바뀐 노드는 ``moved``, 같은 그룹 안에서 순서가 바뀐 노드는
+  ``reordered``로 표시합니다 (순서가 유지된 최장 부분 수열 밖의 노드).
+- 이름 변경은 ``fields["name"]``으로, 조건식 변경은 행 단위 추가/삭제/수정으로
+  보고합니다.
+- 리스트는 ``list_id``로 짝을 짓고 엔트리 값의 추가/삭제를, 설정은 ``id``로
+  짝을 짓고 속성(``key``)별 변경을 보고합니다.
+
+    diff = before.diff(after)                 # PolicyManager 두 개
+    diff.summary()                            # {'rule.added': 3, 'list.changed': 1, ...}
+    for change in diff.items:
+        print(change.status, change.type, change.new_path or change.old_path, change.fields)
+    diff.to_excel("changes.xlsx")
+
+서브트리 해시는 :mod:`.parsers.subtree_index`처럼 노드 내용의 ``marshal``
+직렬화(버전 0)와 자식 해시를 이어 붙인 SHA-256입니다. 부모 그룹은 레코드의
+``group_path``로 찾습니다.
+"""
+
+import gc
+import hashlib
+import json
+import marshal
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .parsers.records import CONDITION_KEYS
+from .simulation.list_matcher import entry_value
+
+# 노드 자체 내용으로 비교하는 속성 (경로는 조상 이름에 따라 바뀌므로 제외)
+ITEM_FIELDS = (
+    "name", "enabled", "description", "defaultRights", "cycleRequest", "cycleResponse",
+    "cycleEmbeddedObject", "cloudSynced", "acElements", "actionContainer_raw", "immediateActions_raw",
+)
+# 조건식 행 비교 속성 (index는 행 순서로 대신함)
+CONDITION_FIELDS = tuple(key for key in CONDITION_KEYS if key != "index") + ("error",)
+LIST_FIELDS = ("list_name", "list_type_id", "list_classifier", "list_description")
+CONFIGURATION_FIELDS = ("name", "version", "mwg_version", "template_id", "target_id", "description")
+
+
+@dataclass
+class ConditionChange:
+    """조건식 행 하나의 변경 (``added``, ``removed``, ``changed``)"""
+
+    status: str
+    old: Optional[Dict[str, Any]] = None
+    new: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class ItemChange:
+    """그룹/룰 하나의 변경
+
+    Attributes:
+        id: ``@id``
+        type: ``group`` 또는 ``rule``
+        status: ``added``, ``removed``, ``changed``
+        name: 이름 (변경 후, 삭제면 변경 전)
+        old_path: 변경 전 경로 (추가면 ``None``)
+        new_path: 변경 후 경로 (삭제면 ``None``)
+        fields: 바뀐 속성 -> (변경 전, 변경 후)
+        conditions: 조건식 행 변경
+        moved: 부모 그룹이 바뀜
+        reordered: 같은 그룹 안에서 순서가 바뀜
+    """
+
+    id: str
+    type: str
+    status: str
+    name: Optional[str]
+    old_path: Optional[str] = None
+    new_path: Optional[str] = None
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    conditions: List[ConditionChange] = field(default_factory=list)
+    moved: bool = False
+    reordered: bool = False
+
+    @property
+    def renamed(self) -> bool:
+        return "name" in self.fields
+
+
+@dataclass
+class ListChange:
+    """리스트 하나의 변경 (엔트리는 값 기준, 문서 순서)"""
+
+    list_id: str
+    status: str
+    name: Optional[str]
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ConfigurationChange:
+    """설정 하나의 변경 (``properties``: 속성 key -> (변경 전, 변경 후) 속성 dict)"""
+
+    id: str
+    status: str
+    name: Optional[str]
+    fields: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    properties: Dict[str, Tuple[Optional[dict], Optional[dict]]] = field(default_factory=dict)
+
+
+@dataclass
+class PolicyDiff:
+    """두 내보내기의 비교 결과"""
+
+    items: List[ItemChange] = field(default_factory=list)
+    lists: List[ListChange] = field(default_factory=list)
+    configurations: List[ConfigurationChange] = field(default_factory=list)
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.items or self.lists or self.configurations)
+
+    def summary(self) -> Dict[str, int]:
+        """``<종류>.<상태>``별 변경 수 (이동/순서 변경/이름 변경 포함)"""
+        counts: Dict[str, int] = {}
+
+        def count(key: str) -> None:
+            counts[key] = counts.get(key, 0) + 1
+
+        for change in self.items:
+            count(f"{change.type}.{change.status}")
+            for flag in ("moved", "reordered", "renamed"):
+                if getattr(change, flag):
+                    count(f"{change.type}.{flag}")
+        for change in self.lists:
+            count(f"list.{change.status}")
+        for change in self.configurations:
+            count(f"configuration.{change.status}")
+        return counts
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """변경 하나(속성/조건식 행/엔트리/설정 속성)당 한 행"""
+        for c in self.items:
+            base = {"object": c.type, "id": c.id, "name": c.name, "status": c.status,
+                    "path": c.new_path or c.old_path}
+            if c.status != "changed":
+                yield {**base, "detail": None, "old": None, "new": None}
+                continue
+            if c.moved or c.reordered:
+                yield {**base, "detail": "moved" if c.moved else "reordered", "old": c.old_path, "new": c.new_path}
+            for name, (old, new) in c.fields.items():
+                yield {**base, "detail": name, "old": old, "new": new}
+            for cond in c.conditions:
+                yield {**base, "detail": f"condition.{cond.status}",
+                       "old": _condition_text(cond.old), "new": _condition_text(cond.new)}
+        for c in self.lists:
+            base = {"object": "list", "id": c.list_id, "name": c.name, "status": c.status, "path": None}
+            if c.status != "changed":
+                yield {**base, "detail": None, "old": None, "new": None}
+                continue
+            for name, (old, new) in c.fields.items():
+                yield {**base, "detail": name, "old": old, "new": new}
+            for value in c.added:
+                yield {**base, "detail": "entry.added", "old": None, "new": value}
+            for value in c.removed:
+                yield {**base, "detail": "entry.removed", "old": value, "new": None}
+        for c in self.configurations:
+            base = {"object": "configuration", "id": c.id, "name": c.name, "status": c.status, "path": None}
+            if c.status != "changed":
+                yield {**base, "detail": None, "old": None, "new": None}
+                continue
+            for name, (old, new) in c.fields.items():
+                yield {**base, "detail": name, "old": old, "new": new}
+            for key, (old, new) in c.properties.items():
+                yield {**base, "detail": f"property.{key}",
+                       "old": old.get("value") if old else None, "new": new.get("value") if new else None}
+
+    def to_excel(self, path: str) -> None:
+        import pandas as pd
+
+        pd.DataFrame(list(self.rows())).to_excel(path, index=False, engine="openpyxl")
+
+
+def _condition_text(row: Optional[Dict[str, Any]]) -> Optional[str]:
+    if row is None:
+        return None
+    values = row.get("property_values")
+    if isinstance(values, tuple):
+        values = ", ".join(map(str, values))
+    parts = (row.get("prefix"), row.get("property"), row.get("operator"), values)
+    return " ".join(str(part) for part in parts if part is not None)
+
+
+# marshal 버전 0은 참조/intern 플래그를 쓰지 않아 같은 내용이면 항상 같은 바이트
+_MARSHAL_VERSION = 0
+
+
+def _digest(node: "_Node") -> bytes:
+    """노드 내용과 자식 해시의 SHA-256"""
+    content = (node.id, node.key, node.rows)
+    try:
+        encoded = marshal.dumps(content, _MARSHAL_VERSION)
+    except ValueError:  # marshal이 지원하지 않는 값이 섞인 레코드
+        encoded = json.dumps(content, separators=(",", ":"), default=str).encode("utf-8")
+    h = hashlib.sha256(encoded)
+    for child in node.children:
+        h.update(child.digest)
+    return h.digest()
+
+
+class _Node:
+    """비교용 그룹/룰 노드"""
+
+    __slots__ = ("id", "type", "path", "key", "rows", "parent", "children", "position", "digest", "order")
+
+    def __init__(self, item_id: str, item_type: str, path: str, key: tuple, parent: Optional["_Node"], order: int):
+        self.id = item_id
+        self.type = item_type
+        self.path = path
+        self.key = key
+        self.rows: List[tuple] = []
+        self.parent = parent
+        self.children: List["_Node"] = []
+        self.position = 0
+        self.digest = b""
+        self.order = order
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.key[0]
+
+
+class _Tree:
+    """파싱 레코드(문서 순서)로 만든 그룹/룰 트리"""
+
+    def __init__(self, records: Iterable[Any]):
+        self.roots: List[_Node] = []
+        self.by_id: Dict[str, _Node] = {}
+        # 수십만 개의 노드/튜플을 만드는 동안 GC가 반복 실행되지 않도록 잠시 중지
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._build(records)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _build(self, records: Iterable[Any]) -> None:
+        nodes: List[_Node] = []
+        stack: List[_Node] = []
+        node: Optional[_Node] = None
+        by_id = self.by_id
+        for rec in records:
+            get = rec.get
+            item_id = get("id")
+            if item_id is None:
+                raw = get("condition_raw")
+                if raw and node is not None:
+                    node.rows.append(tuple(map(raw.get, CONDITION_FIELDS)))
+                continue
+            path = get("path") or ""
+            item_type = get("type") or "rule"
+            parent_path = get("group_path")
+            if parent_path is None:
+                # group_path가 없는 그룹 레코드 (RECORDS_VERSION 2 이전에 저장한 Parquet/Arrow)
+                suffix = " > " + (get("name") or "")
+                parent_path = path[: -len(suffix)] if item_type == "group" and path.endswith(suffix) else ""
+            # 스택에 있는 조상의 경로는 자손일수록 길어 서로 다르므로 문자열로 찾아도 부모는 하나
+            while stack and stack[-1].path != parent_path:
+                stack.pop()
+            parent = stack[-1] if stack else None
+            if item_id in by_id:  # 중복 id는 경로로 구분
+                item_id = f"{item_id}@{path}"
+            node = _Node(item_id, item_type, path, tuple(map(get, ITEM_FIELDS)), parent, len(nodes))
+            raw = get("condition_raw")
+            if raw:
+                node.rows.append(tuple(map(raw.get, CONDITION_FIELDS)))
+            siblings = parent.children if parent is not None else self.roots
+            node.position = len(siblings)
+            siblings.append(node)
+            by_id[item_id] = node
+            nodes.append(node)
+            if item_type == "group":
+                stack.append(node)
+        # 자식이 부모보다 뒤에 만들어지므로 역순으로 서브트리 해시 계산
+        for node in reversed(nodes):
+            node.digest = _digest(node)
+
+
+def _stable(positions: List[int]) -> set:
+    """순서가 유지된 최장 증가 부분 수열에 속한 위치"""
+    tails: List[int] = []  # 길이별 마지막 원소의 인덱스
+    previous = [-1] * len(positions)
+    for i, value in enumerate(positions):
+        low, high = 0, len(tails)
+        while low < high:
+            mid = (low + high) // 2
+            if positions[tails[mid]] < value:
+                low = mid + 1
+            else:
+                high = mid
+        previous[i] = tails[low - 1] if low else -1
+        if low == len(tails):
+            tails.append(i)
+        else:
+            tails[low] = i
+    stable = set()
+    i = tails[-1] if tails else -1
+    while i != -1:
+        stable.add(positions[i])
+        i = previous[i]
+    return stable
+
+
+def _condition_changes(old: List[tuple], new: List[tuple]) -> List[ConditionChange]:
+    as_row = lambda row: dict(zip(CONDITION_FIELDS, row))  # noqa: E731
+    changes = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old, new, autojunk=False).get_opcodes():
+        if tag == "equal":
+            continue
+        pairs = max(i2 - i1, j2 - j1)
+        for k in range(pairs):
+            before = old[i1 + k] if i1 + k < i2 else None
+            after = new[j1 + k] if j1 + k < j2 else None
+            status = "changed" if before is not None and after is not None else ("removed" if after is None else "added")
+            changes.append(ConditionChange(
+                status, as_row(before) if before is not None else None, as_row(after) if after is not None else None
+            ))
+    return changes
+
+
+class _PolicyDiffer:
+    def __init__(self, old: _Tree, new: _Tree):
+        self.old = old
+        self.new = new
+        self.changes: List[ItemChange] = []
+        self.compared = 0
+        self.skipped = 0
+
+    def run(self) -> List[ItemChange]:
+        self._children(None, None, self.old.roots, self.new.roots)
+        removed = sorted(
+            (self.old.by_id[item_id] for item_id in self.old.by_id.keys() - self.new.by_id.keys()),
+            key=lambda node: node.order,
+        )
+        self.changes.extend(
+            ItemChange(node.id, node.type, "removed", node.name, old_path=node.path) for node in removed
+        )
+        return self.changes
+
+    def _children(self, old_parent, new_parent, old_children, new_children) -> None:
+        old_by_id = self.old.by_id
+        matched = []
+        for child in new_children:
+            previous = old_by_id.get(child.id)
+            if previous is None:
+                self.changes.append(ItemChange(child.id, child.type, "added", child.name, new_path=child.path))
+                self._children(None, child, (), child.children)
+            else:
+                matched.append((previous, child))
+        same_parent = [prev.position for prev, _ in matched if prev.parent is old_parent]
+        stable = _stable(same_parent) if len(same_parent) > 1 else set(same_parent)
+        for previous, child in matched:
+            moved = (previous.parent.id if previous.parent else None) != (new_parent.id if new_parent else None)
+            reordered = not moved and previous.position not in stable
+            self._compare(previous, child, moved, reordered)
+
+    def _compare(self, old: _Node, new: _Node, moved: bool, reordered: bool) -> None:
+        self.compared += 1
+        if old.digest == new.digest and not moved and not reordered:
+            self.skipped += 1
+            return
+        change = ItemChange(new.id, new.type, "changed", new.name, old_path=old.path, new_path=new.path,
+                            moved=moved, reordered=reordered)
+        if old.key != new.key:
+            change.fields = {
+                name: (a, b) for name, a, b in zip(ITEM_FIELDS, old.key, new.key) if a != b
+            }
+        if old.rows != new.rows:
+            change.conditions = _condition_changes(old.rows, new.rows)
+        if change.fields or change.conditions or moved or reordered:
+            self.changes.append(change)
+        if old.digest != new.digest:
+            self._children(old, new, old.children, new.children)
+
+
+def diff_policy(old_records: Iterable[Any], new_records: Iterable[Any]) -> Tuple[List[ItemChange], Dict[str, int]]:
+    """그룹/룰 레코드 비교
+
+    Returns:
+        (변경 목록, 통계: 노드 수/비교한 노드/해시로 건너뛴 서브트리)
+    """
+    old, new = _Tree(old_records), _Tree(new_records)
+    differ = _PolicyDiffer(old, new)
+    changes = differ.run()
+    return changes, {
+        "old_items": len(old.by_id),
+        "new_items": len(new.by_id),
+        "compared": differ.compared,
+        "skipped": differ.skipped,
+    }
+
+
+def _list_table(records: Iterable[Any]) -> Dict[str, Tuple[tuple, List[str]]]:
+    """리스트 id -> (메타데이터, 엔트리 값 목록)"""
+    table: Dict[str, Tuple[tuple, List[str]]] = {}
+    for rec in records:
+        list_id = rec.get("list_id")
+        if not list_id:
+            continue
+        entry = table.get(list_id)
+        if entry is None:
+            entry = table[list_id] = (tuple(rec.get(key) for key in LIST_FIELDS), [])
+        value = entry_value(rec)
+        if value is not None:
+            entry[1].append(value)
+    return table
+
+
+def diff_lists(old_records: Iterable[Any], new_records: Iterable[Any]) -> List[ListChange]:
+    """리스트 레코드 비교 (엔트리 추가/삭제와 메타데이터 변경)"""
+    old, new = _list_table(old_records), _list_table(new_records)
+    changes = []
+    for list_id, (meta, entries) in new.items():
+        previous = old.get(list_id)
+        if previous is None:
+            changes.append(ListChange(list_id, "added", meta[0], added=list(dict.fromkeys(entries))))
+            continue
+        old_meta, old_entries = previous
+        if meta == old_meta and entries == old_entries:
+            continue
+        change = ListChange(list_id, "changed", meta[0], fields={
+            name: (a, b) for name, a, b in zip(LIST_FIELDS, old_meta, meta) if a != b
+        })
+        if entries != old_entries:
+            old_set, new_set = set(old_entries), set(entries)
+            change.added = [value for value in dict.fromkeys(entries) if value not in old_set]
+            change.removed = [value for value in dict.fromkeys(old_entries) if value not in new_set]
+        if change.fields or change.added or change.removed:
+            changes.append(change)
+    for list_id, (meta, entries) in old.items():
+        if list_id not in new:
+            changes.append(ListChange(list_id, "removed", meta[0], removed=list(dict.fromkeys(entries))))
+    return changes
+
+
+def _properties(record: Any) -> Dict[str, dict]:
+    return {
+        prop.get("key"): {name: value for name, value in prop.items() if name != "key"}
+        for prop in record.get("properties") or ()
+        if prop.get("key") is not None
+    }
+
+
+def diff_configurations(old_records: Iterable[Any], new_records: Iterable[Any]) -> List[ConfigurationChange]:
+    """설정 레코드 비교 (설정 속성은 ``key`` 기준)"""
+    old = {rec.get("id"): rec for rec in old_records if rec.get("id")}
+    new = {rec.get("id"): rec for rec in new_records if rec.get("id")}
+    changes = []
+    for config_id, rec in new.items():
+        previous = old.get(config_id)
+        if previous is None:
+            changes.append(ConfigurationChange(config_id, "added", rec.get("name")))
+            continue
+        change = ConfigurationChange(config_id, "changed", rec.get("name"), fields={
+            name: (previous.get(name), rec.get(name))
+            for name in CONFIGURATION_FIELDS
+            if previous.get(name) != rec.get(name)
+        })
+        before, after = _properties(previous), _properties(rec)
+        if before != after:
+            change.properties = {
+                key: (before.get(key), after.get(key))
+                for key in list(after) + [key for key in before if key not in after]
+                if before.get(key) != after.get(key)
+            }
+        if change.fields or change.properties:
+            changes.append(change)
+    changes.extend(
+        ConfigurationChange(config_id, "removed", rec.get("name"))
+        for config_id, rec in old.items()
+        if config_id not in new
+    )
+    return changes
+
+
+def diff_managers(before: Any, after: Any) -> PolicyDiff:
+    """두 :class:`PolicyManager`의 정책/리스트/설정 비교
+
+    그룹/룰 레코드는 :meth:`PolicyManager.iter_policy`로 읽으므로 비교에
+    필요한 키만 메모리에 남습니다.
+    """
+    items, stats = diff_policy(before.iter_policy(), after.iter_policy())
+    return PolicyDiff(
+        items=items,
+        lists=diff_lists(before.iter_lists(), after.iter_lists()),
+        configurations=diff_configurations(before.iter_configurations(), after.iter_configurations()),
+        stats=stats,
+    )
@@ -5,11 +5,32 @@ classes to store list entries and resolve list identifiers in policy
 records parsed by :class:`PolicyParser`.
 """
 
-from typing import Any, Dict, Iterable, List, Optional
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
 
+from .parsers.condition_parser import ConditionCache
+from .parsers.library import ParsedLibrary
+from .parsers.path_table import PathTable
+from .parsers.records import RECORDS_VERSION
 from .parsers.lists_parser import ListsParser
 from .parsers.policy_parser import PolicyParser
 from .parsers.configurations_parser import ConfigurationsParser
+from .parsers.subtree_index import SubtreeIndex
+from .parsers import columnar
+from .parsers.columnar import ColumnarSource
+from .parse_cache import ParseCache
+from .instrumentation import Instrumentation
+from .list_index import ListValueIndex
+from .list_refs import ListRef
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .policy_diff import PolicyDiff
+    from .snapshot_store import SnapshotStore
+
+# Distinct conditions kept by the condition cache while streaming
+STREAM_CONDITION_CACHE = 10000
 
 
 class PolicyManager:
@@ -20,17 +41,157 @@ class PolicyManager:
         source: Any,
         *,
         from_xml: bool = False,
+        stream: bool = False,
+        compact: bool = False,
+        cache_conditions: bool = False,
+        workers: int = 0,
+        previous_subtrees: Optional[SubtreeIndex] = None,
+        cache: Optional[ParseCache] = None,
+        instrumentation: Optional[Instrumentation] = None,
     ) -> None:
         """Initialize PolicyManager.
         
         Args:
-            source: The source data (XML or JSON) containing policy, lists and configurations
+            source: The source data (XML or JSON) containing policy, lists and configurations,
+                an already parsed :class:`ParsedLibrary`, or a :class:`ColumnarSource`
+                written by :meth:`to_columnar`
             from_xml: Whether the source is in XML format
+            stream: Read the XML incrementally instead of building the whole
+                document in memory. ``source`` may then also be a file path
+                or binary file object; each ``parse_*`` call reads it again.
+            compact: Return slotted records (see :mod:`.parsers.records`)
+                for policy rows and list entries instead of dicts
+            cache_conditions: Parse identical condition blocks only once and
+                share the resulting read-only rows (see :class:`ConditionCache`).
+                Off by default because ``condition_raw`` then holds shared
+                :class:`FrozenRow` dicts that cannot be modified in place.
+                In ``stream`` mode the cache holds at most
+                ``STREAM_CONDITION_CACHE`` conditions.
+            workers: Parse top-level rule groups in this many worker
+                processes (``None`` for one per CPU, ``0`` for serial).
+                Not available together with ``stream``.
+            previous_subtrees: :attr:`subtrees` of an earlier import. Rule
+                groups and rules whose content hash is unchanged reuse the
+                records stored there instead of being parsed again. Pass an
+                empty :class:`SubtreeIndex` to start tracking.
+            cache: :class:`ParseCache` keyed by the SHA-256 of ``source``.
+                On a hit nothing is parsed and the ``parse_*`` methods return
+                the cached results. On a miss the results are written to the
+                cache once lists, configurations and policy have all been
+                parsed with the ``parse_*`` methods.
+            instrumentation: Records duration, record counts and memory
+                peak of the load and ``parse_*`` stages
         """
         self.source = source
         self.from_xml = from_xml
+        self.stream = stream
+        self.compact = compact
         self.lists = {}  # Dictionary to store list entries
-        self.policy_parser = PolicyParser(source, from_xml=from_xml)
+        self._list_index: Optional[ListValueIndex] = None
+        if cache_conditions:
+            self.condition_cache = ConditionCache(max_entries=STREAM_CONDITION_CACHE if stream else None)
+        else:
+            self.condition_cache = None
+        policy_options = {
+            "compact": compact,
+            "condition_cache": self.condition_cache,
+            "workers": workers,
+            "previous_subtrees": previous_subtrees,
+        }
+        self.cache = cache
+        self.cache_key = None
+        self.cached = None
+        self._results: Dict[str, Any] = {}
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        if cache is not None:
+            with self.instrumentation.stage("cache_lookup") as stage:
+                variant = f"r{RECORDS_VERSION}-" + ("compact" if compact else "dict")
+                if cache_conditions:
+                    # 캐시된 조건 행은 공유된 FrozenRow
+                    variant += "-conditions"
+                if previous_subtrees is not None:
+                    variant += "-subtrees"
+                self.cache_key = cache.key(source, variant)
+                self.cached = cache.get(self.cache_key) if self.cache_key else None
+                stage.info["hit"] = self.cached is not None
+
+        if isinstance(source, ColumnarSource):
+            with self.instrumentation.stage("load_columnar"):
+                self.cached = self._load_columnar(source)
+
+        if self.cached is not None:
+            # Cache hit: skip XML parsing entirely
+            self.library = None
+            self.policy_parser = None
+            self.lists = self.cached["lists_by_id"]
+            self._list_index = self.cached.get("list_index")
+        elif stream:
+            self.library = None
+            self.policy_parser = PolicyParser(source, from_xml=from_xml, stream=True, **policy_options)
+        else:
+            # Parse the document once and share it with every parser
+            with self.instrumentation.stage("load"):
+                self.library = ParsedLibrary.load(source, from_xml=from_xml)
+            self.policy_parser = PolicyParser(self.library, **policy_options)
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        store: "SnapshotStore",
+        snapshot_id: Optional[int] = None,
+        *,
+        at: Optional["datetime"] = None,
+        proxy: Optional[str] = None,
+        stream: bool = False,
+        **options: Any,
+    ) -> "PolicyManager":
+        """Load an export kept in a :class:`SnapshotStore`.
+
+        Args:
+            store: Snapshot store
+            snapshot_id: Snapshot to load. Without it the snapshot in effect
+                at ``at`` (latest created at or before it) is used.
+            at: Point in time (UTC) when ``snapshot_id`` is not given
+            proxy: Only consider snapshots of this proxy for ``at``
+            stream: Decompress chunk by chunk into the streaming parser
+                instead of reading the whole export into memory
+            options: Other :class:`PolicyManager` arguments
+        """
+        if snapshot_id is None:
+            if at is None:
+                raise ValueError("Either snapshot_id or at is required.")
+            snapshot_id = store.find(at, proxy=proxy).id
+        source = store.open(snapshot_id) if stream else store.read(snapshot_id)
+        return cls(source, from_xml=True, stream=stream, **options)
+
+    @property
+    def paths(self) -> PathTable:
+        """Rule-group path table filled while policy records are parsed."""
+        if self.cached is not None:
+            return self.cached["paths"]
+        return self.policy_parser.paths
+
+    @property
+    def subtrees(self) -> Optional[SubtreeIndex]:
+        """Subtree hashes and records of this import (incremental mode only).
+
+        Filled while policy records are parsed; hand it to the next
+        :class:`PolicyManager` as ``previous_subtrees``.
+        """
+        if self.cached is not None:
+            return self.cached["subtrees"]
+        return self.policy_parser.subtrees
+
+    @property
+    def list_index(self) -> ListValueIndex:
+        """Reverse index of list entry values (see :class:`ListValueIndex`).
+
+        Built by :meth:`parse_lists`; built from :attr:`lists` on first use
+        when the lists were read with :meth:`iter_lists` instead.
+        """
+        if self._list_index is None:
+            self._list_index = ListValueIndex.from_lists(self.lists)
+        return self._list_index
 
     def parse_lists(self) -> List[Dict[str, Any]]:
         """Parse and store list entries from source.
@@ -38,14 +199,31 @@ class PolicyManager:
         Returns:
             List of parsed list records
         """
-        parser = ListsParser(self.source, from_xml=self.from_xml)
-        records = parser.parse()
-        # Store list entries in dictionary for quick lookup
-        for rec in records:
+        if self.cached is not None:
+            return self.cached["lists"]
+        with self.instrumentation.stage("parse_lists") as stage:
+            records = list(self.iter_lists())
+            stage.records = len(records)
+        with self.instrumentation.stage("index_lists", records=len(records)):
+            self._list_index = ListValueIndex.from_lists(self.lists)
+        return self._remember("lists", records)
+
+    def iter_lists(self) -> Iterator[Dict[str, Any]]:
+        """Yield list records while storing them for list resolution.
+
+        Must be consumed before :meth:`iter_policy` so that list
+        references can be resolved.
+        """
+        if self.cached is not None:
+            yield from self.cached["lists"]
+            return
+        parser = self._parser(ListsParser, compact=self.compact)
+        for rec in parser.iter_records():
+            # Store list entries in dictionary for quick lookup
             list_id = rec.get("list_id")
             if list_id:
                 self.lists.setdefault(list_id, []).append(rec)
-        return records
+            yield rec
 
     def parse_configurations(self) -> List[Dict[str, Any]]:
         """Parse configuration entries from source.
@@ -53,8 +231,18 @@ class PolicyManager:
         Returns:
             List of parsed configuration records
         """
-        parser = ConfigurationsParser(self.source, from_xml=self.from_xml)
-        return parser.parse()
+        if self.cached is not None:
+            return self.cached["configurations"]
+        with self.instrumentation.stage("parse_configurations") as stage:
+            records = self._parser(ConfigurationsParser).parse()
+            stage.records = len(records)
+        return self._remember("configurations", records)
+
+    def iter_configurations(self) -> Iterator[Dict[str, Any]]:
+        """Yield configuration records one by one."""
+        if self.cached is not None:
+            return iter(self.cached["configurations"])
+        return self._parser(ConfigurationsParser).iter_records()
 
     def parse_policy(self) -> List[Dict[str, Any]]:
         """Parse policy items and resolve list references.
@@ -62,10 +250,99 @@ class PolicyManager:
         Returns:
             List of unified policy item records
         """
-        records = self.policy_parser.parse()
-        self._resolve(records)
+        if self.cached is not None:
+            return self.cached["policy"]
+        with self.instrumentation.stage("parse_policy") as stage:
+            with self.instrumentation.stage("walk") as walk:
+                records = self.policy_parser.parse()
+                walk.records = len(records)
+            with self.instrumentation.stage("resolve", records=len(records)):
+                self._resolve(records)
+            stage.records = len(records)
+        return self._remember("policy", records)
+
+    def iter_policy(self) -> Iterator[Dict[str, Any]]:
+        """Yield policy records with list references resolved.
+
+        Unlike :meth:`parse_policy` the records are not kept on the parser,
+        so memory does not grow with the size of the ruleset.
+        """
+        if self.cached is not None:
+            yield from self.cached["policy"]
+            return
+        for rec in self.policy_parser.iter_records():
+            self._resolve_record(rec)
+            yield rec
+
+    def diff(self, other: "PolicyManager") -> "PolicyDiff":
+        """Structural diff from this export to ``other``.
+
+        Rules and groups are matched by ``@id``; subtrees whose content
+        hash is unchanged are skipped (see :mod:`.policy_diff`).
+        """
+        from .policy_diff import diff_managers
+
+        return diff_managers(self, other)
+
+    def to_columnar(
+        self,
+        directory: str,
+        extension: str = ".parquet",
+        row_group_size: int = columnar.DEFAULT_ROW_GROUP_SIZE,
+    ) -> ColumnarSource:
+        """Export lists, configurations, policy and paths as Parquet/Arrow files.
+
+        Records are streamed from the ``iter_*`` generators into row groups,
+        so nothing is collected beyond one row group per file.
+
+        Args:
+            directory: Output directory (created if missing)
+            extension: ``.parquet`` or ``.arrow``
+            row_group_size: Rows per row group / record batch
+
+        Returns:
+            A :class:`ColumnarSource` for reading the export back
+        """
+        os.makedirs(directory, exist_ok=True)
+        target = ColumnarSource(directory, extension)
+        columnar.write_lists(self.iter_lists(), target.file("lists"), row_group_size)
+        columnar.write_configurations(self.iter_configurations(), target.file("configurations"), row_group_size)
+        columnar.write_policy(self.iter_policy(), target.file("policy"), row_group_size)
+        columnar.write_paths(self.paths, target.file("paths"))
+        return target
+
+    def _load_columnar(self, source: ColumnarSource) -> Dict[str, Any]:
+        """Load a columnar export and resolve list references like a parse would."""
+        loaded = source.load()
+        for rec in loaded["lists"]:
+            list_id = rec.get("list_id")
+            if list_id:
+                self.lists.setdefault(list_id, []).append(rec)
+        self._resolve(loaded["policy"])
+        return {**loaded, "lists_by_id": self.lists, "subtrees": None}
+
+    def _remember(self, name: str, records: List[Any]) -> List[Any]:
+        """Keep a full parse result and write the cache once all three are known."""
+        if self.cache_key is None:
+            return records
+        self._results[name] = records
+        if len(self._results) == 3:
+            with self.instrumentation.stage("cache_write"):
+                self.cache.put(self.cache_key, {
+                    **self._results,
+                    "lists_by_id": self.lists,
+                    "list_index": self._list_index,
+                    "paths": self.paths,
+                    "subtrees": self.subtrees,
+                })
         return records
 
+    def _parser(self, parser_cls, **kwargs):
+        """Create a parser reading from the shared document or the stream."""
+        if self.stream:
+            return parser_cls(self.source, from_xml=self.from_xml, stream=True, **kwargs)
+        return parser_cls(self.library, **kwargs)
+
     def _resolve(self, records: Iterable[Dict[str, Any]]) -> None:
         """Resolve list references in policy records.
         
@@ -73,28 +350,35 @@ class PolicyManager:
             records: Policy records to resolve list references in
         """
         for rec in records:
-            cond_raw = rec.get("condition_raw")
-            if not isinstance(cond_raw, dict):
-                continue
-            values = cond_raw.get("property_values")
-            if not values:
-                continue
-            rec["lists_resolved"] = self._resolve_values(values)
+            self._resolve_record(rec)
+
+    def _resolve_record(self, rec: Dict[str, Any]) -> None:
+        """Resolve list references of a single policy record."""
+        cond_raw = rec.get("condition_raw")
+        if not hasattr(cond_raw, "get"):
+            return
+        values = cond_raw.get("property_values")
+        if not values:
+            return
+        rec["lists_resolved"] = self._resolve_values(values)
 
     def _resolve_values(self, values: Any) -> Any:
-        """Resolve list references to actual list entries.
-        
+        """Resolve list references to :class:`ListRef` handles.
+
+        The handles read their entries from :attr:`lists` on access, so a
+        list referenced by many rules is not copied into each record.
+
         Args:
             values: List reference(s) to resolve
             
         Returns:
-            Resolved list entries or original value if not a list reference
+            Handle(s) for known list ids, other values unchanged
         """
         if isinstance(values, str):
-            return self.lists.get(values, values)
+            return ListRef(values, self.lists) if values in self.lists else values
         if isinstance(values, (list, tuple)):
             return [
-                self.lists.get(val, val) if isinstance(val, str) else val
+                ListRef(val, self.lists) if isinstance(val, str) and val in self.lists else val
                 for val in values
             ]
         return values
@@ -0,0 +1,285 @@
+"""정책 전문 검색 (SQLite FTS5)
+
+그룹/룰 이름, 설명, 경로, 조건식(속성/연산자/값)과 리스트 엔트리 값을 SQLite
+FTS5 가상 테이블(``policy_search``)에 색인하고 순위(bm25)와 페이지 단위로
+검색합니다. :class:`PolicyStore`가 가져오기마다 색인을 갱신하며, 문서마다
+내용 해시를 저장하여 바뀐 문서만 다시 쓰고 사라진 문서는 삭제합니다.
+
+    search = PolicySearch(session)
+    page = search.search("example.com block", limit=20)
+    page = search.search("URL.Host", fields=["conditions"], kind="rule", offset=20)
+
+FTS5는 SQLite 전용이므로 다른 데이터베이스에서는 색인과 검색을 하지 않습니다
+(:attr:`PolicySearch.available`).
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from .simulation.list_matcher import entry_value
+
+SEARCH_TABLE = "policy_search"
+TEXT_COLUMNS = ("name", "description", "path", "conditions", "entries")
+# bm25 가중치: kind, ref, digest(색인 안 함), name, description, path, conditions, entries
+WEIGHTS = (0.0, 0.0, 0.0, 10.0, 2.0, 5.0, 1.0, 1.0)
+WRITE_BATCH = 5000
+
+
+@dataclass
+class SearchHit:
+    """검색 결과 한 건
+
+    Attributes:
+        kind: ``rule``, ``group`` 또는 ``list``
+        ref: 그룹/룰의 ``item_id`` 또는 리스트의 ``list_id``
+        name: 이름
+        path: 그룹/룰 경로 (리스트는 ``None``)
+        snippet: 일치 부분을 ``[``/``]``로 표시한 발췌
+        score: 순위 점수 (클수록 관련도가 높음)
+    """
+
+    kind: str
+    ref: str
+    name: Optional[str]
+    path: Optional[str]
+    snippet: str
+    score: float
+
+
+@dataclass
+class SearchPage:
+    """검색 결과 한 페이지"""
+
+    query: str
+    total: int
+    offset: int
+    limit: int
+    hits: List[SearchHit] = field(default_factory=list)
+
+    @property
+    def has_more(self) -> bool:
+        return self.offset + len(self.hits) < self.total
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value if isinstance(value, str) else str(value)
+
+
+def match_query(query: str, fields: Optional[Sequence[str]] = None) -> str:
+    """사용자 입력을 FTS5 질의로 변환
+
+    단어마다 구문으로 감싸 AND로 잇고 마지막 단어는 접두어로 검색합니다
+    (``example.com bl`` -> ``"example.com" "bl"*``).
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    if not terms:
+        return ""
+    terms[-1] += "*"
+    expression = " ".join(terms)
+    if fields:
+        unknown = set(fields) - set(TEXT_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown search fields: {sorted(unknown)}")
+        expression = "{" + " ".join(fields) + "} : (" + expression + ")"
+    return expression
+
+
+class PolicySearch:
+    """``policy_search`` FTS5 테이블 관리와 검색"""
+
+    def __init__(self, session: Session):
+        """초기화
+
+        Args:
+            session: SQLAlchemy 세션 (SQLite가 아니면 검색 비활성)
+        """
+        self.session = session
+        self._available: Optional[bool] = None
+
+    @property
+    def available(self) -> bool:
+        """FTS5 테이블을 사용할 수 있는지 여부 (처음 확인할 때 테이블 생성)"""
+        if self._available is None:
+            self._available = self._create()
+        return self._available
+
+    def _create(self) -> bool:
+        if self.session.get_bind().dialect.name != "sqlite":
+            return False
+        try:
+            self.session.execute(text(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+                "kind UNINDEXED, ref UNINDEXED, digest UNINDEXED, "
+                + ", ".join(TEXT_COLUMNS)
+                + ", tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            ))
+        except OperationalError:  # FTS5 없이 빌드된 SQLite
+            return False
+        return True
+
+    def indexer(self) -> Optional["SearchIndexer"]:
+        """가져오기 한 번의 색인 갱신기 (검색을 사용할 수 없으면 ``None``)"""
+        return SearchIndexer(self.session) if self.available else None
+
+    def search(
+        self,
+        query: str,
+        *,
+        kind: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+        raw: bool = False,
+    ) -> SearchPage:
+        """전문 검색
+
+        Args:
+            query: 검색어 (``raw``면 FTS5 질의 문법 그대로)
+            kind: ``rule``, ``group``, ``list`` 중 하나로 제한
+            fields: 검색할 컬럼 (``name``, ``description``, ``path``,
+                ``conditions``, ``entries``; 없으면 전체)
+            limit: 페이지 크기
+            offset: 건너뛸 결과 수
+            raw: ``query``를 변환하지 않고 FTS5 질의로 사용
+
+        Returns:
+            bm25 순위순 :class:`SearchPage`
+        """
+        page = SearchPage(query=query, total=0, offset=offset, limit=limit)
+        expression = query if raw else match_query(query, fields)
+        if not expression or not self.available:
+            return page
+        where = f"{SEARCH_TABLE} MATCH :query" + (" AND kind = :kind" if kind else "")
+        params = {"query": expression, "kind": kind, "limit": limit, "offset": offset}
+        page.total = self.session.execute(
+            text(f"SELECT count(*) FROM {SEARCH_TABLE} WHERE {where}"), params
+        ).scalar()
+        rank = f"bm25({SEARCH_TABLE}, {', '.join(map(str, WEIGHTS))})"
+        rows = self.session.execute(text(
+            f"SELECT kind, ref, name, path, snippet({SEARCH_TABLE}, -1, '[', ']', '…', 12), {rank} AS rank "
+            f"FROM {SEARCH_TABLE} WHERE {where} ORDER BY rank LIMIT :limit OFFSET :offset"
+        ), params)
+        page.hits = [
+            SearchHit(kind=kind_, ref=ref, name=name, path=path, snippet=snippet, score=-rank_)
+            for kind_, ref, name, path, snippet, rank_ in rows
+        ]
+        return page
+
+
+class SearchIndexer:
+    """가져오기 한 번 동안 검색 문서를 모아 바뀐 것만 기록
+
+    그룹/룰 문서는 :meth:`item` 다음에 오는 :meth:`condition` 행을 모아
+    다음 :meth:`item`이나 :meth:`finish`에서 완성됩니다.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        # (kind, ref) -> (rowid, digest)
+        self.existing: Dict[Tuple[str, str], Tuple[int, str]] = {
+            (kind, ref): (rowid, digest)
+            for rowid, kind, ref, digest in session.execute(
+                text(f"SELECT rowid, kind, ref, digest FROM {SEARCH_TABLE}")
+            )
+        }
+        self.seen: set = set()
+        self.inserted = 0
+        self.deleted = 0
+        self._inserts: List[Dict[str, Any]] = []
+        self._deletes: List[Dict[str, Any]] = []
+        self._item: Optional[Dict[str, Any]] = None
+        self._conditions: List[str] = []
+
+    def list(self, list_id: str, records: Iterable[Any]) -> None:
+        """리스트 문서 (엔트리 값 전체)"""
+        records = list(records)
+        first = records[0] if records else {}
+        entries = [value for value in map(entry_value, records) if value]
+        self.add("list", list_id, {
+            "name": _text(first.get("list_name")),
+            "description": _text(first.get("list_description")),
+            "entries": "\n".join(entries),
+        })
+
+    def item(self, item: Any) -> None:
+        """그룹/룰 문서 시작 (이어지는 조건식 행은 :meth:`condition`으로)"""
+        self._flush_item()
+        self._item = {
+            "kind": item.get("type") or "rule",
+            "ref": item.get("id"),
+            "name": _text(item.get("name")),
+            "description": _text(item.get("description")),
+            "path": _text(item.get("path") or item.get("group_path")),
+        }
+
+    def condition(self, row: Dict[str, Any], list_ids: Sequence[str] = ()) -> None:
+        """현재 그룹/룰의 조건식 행 (:meth:`PolicyStore._condition_row` 형식)"""
+        if self._item is None:
+            return
+        parts = [row.get("property") or "", row.get("operator") or "", row.get("values") or ""]
+        self._conditions.append(" ".join(parts + list(list_ids)))
+
+    def _flush_item(self) -> None:
+        item, self._item = self._item, None
+        if item is None:
+            return
+        kind, ref = item.pop("kind"), item.pop("ref")
+        item["conditions"] = "\n".join(self._conditions)
+        self._conditions = []
+        self.add(kind, ref, item)
+
+    def add(self, kind: str, ref: Optional[str], fields: Dict[str, Optional[str]]) -> None:
+        """문서 하나 (내용이 이전 가져오기와 같거나 이미 추가한 문서면 그대로 둠)"""
+        if not ref:
+            return
+        key = (kind, ref)
+        if key in self.seen:
+            # 한 가져오기에 같은 id가 두 번 나오면 첫 문서만 사용 (ParsedLibrary.merge와 같음)
+            return
+        self.seen.add(key)
+        values = {column: fields.get(column) for column in TEXT_COLUMNS}
+        digest = hashlib.sha1(
+            "\x1f".join(value or "" for value in values.values()).encode("utf-8")
+        ).hexdigest()
+        previous = self.existing.get(key)
+        if previous is not None:
+            if previous[1] == digest:
+                return
+            self._deletes.append({"rowid": previous[0]})
+        self._inserts.append({"kind": kind, "ref": ref, "digest": digest, **values})
+        if len(self._inserts) >= WRITE_BATCH:
+            self._write()
+
+    def _write(self) -> None:
+        if self._deletes:
+            self.session.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :rowid"), self._deletes)
+            self.deleted += len(self._deletes)
+            self._deletes = []
+        if self._inserts:
+            columns = ("kind", "ref", "digest") + TEXT_COLUMNS
+            self.session.execute(text(
+                f"INSERT INTO {SEARCH_TABLE} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(':' + c for c in columns)})"
+            ), self._inserts)
+            self.inserted += len(self._inserts)
+            self._inserts = []
+
+    def finish(self) -> int:
+        """남은 문서를 기록하고 이번 가져오기에 없는 문서 삭제
+
+        Returns:
+            새로 쓰거나 삭제한 문서 수
+        """
+        self._flush_item()
+        for key, (rowid, _) in self.existing.items():
+            if key not in self.seen:
+                self._deletes.append({"rowid": rowid})
+        self._write()
+        return self.inserted + self.deleted
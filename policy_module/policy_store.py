@@ -4,18 +4,40 @@
 API나 파일 소스로부터 데이터를 가져와 파싱하고 저장합니다.
 """
 
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Iterable, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import func, insert, select
 
-from .clients.skyhigh_client import SkyhighSWGClient
+from .clients.session_pool import SessionPool, client_session
+from .config import Config
+from .export_spool import ExportSpool
+from .proxy_export import DEFAULT_WORKERS, ProxyExport, export_proxies, select_proxies
 from .policy_manager import PolicyManager
+from .parse_cache import ParseCache
+from .instrumentation import Instrumentation
+from .policy_search import PolicySearch, SearchIndexer, SearchPage
+from .list_refs import dump_resolved, load_resolved
+from .parsers.library import ParsedLibrary
+from .parsers.path_table import PathTable
+from .parsers.records import as_dict
+from .parsers.subtree_index import SubtreeIndex
 from ppat_db.policy_db import (
-    PolicyList, PolicyConfiguration,
-    PolicyItem, PolicyCondition, ConditionListMap
+    PolicyList, PolicyConfiguration, PolicyPath, PolicySubtree,
+    PolicyItem, PolicyCondition, ConditionListMap, PolicySyncState
 )
 
+if TYPE_CHECKING:
+    from .snapshot_store import SnapshotStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STREAM_BATCH = 1000
+
 
 @dataclass
 class PolicyData:
@@ -23,6 +45,53 @@ class PolicyData:
     lists: List[Dict[str, Any]]
     configurations: List[Dict[str, Any]]
     items: List[Dict[str, Any]]
+    paths: PathTable = field(default_factory=PathTable)
+    subtrees: Optional[SubtreeIndex] = None
+
+
+@dataclass
+class SyncReport:
+    """``store_from_api`` 결과
+
+    Attributes:
+        proxy: 프록시 base_url
+        scope: ``main`` (메인 Rule Set) 또는 ``all`` (모든 최상위 Rule Set)
+        fingerprint: Rule Set 목록 지문 (``skip_unchanged``/``record_state`` 없이 구하지 않았으면 ``None``)
+        skipped: 변경이 없어 내보내기/저장을 생략했는지
+        export_bytes: 내보낸 크기 (생략했으면 생략한 마지막 내보내기 크기)
+        records: 저장한 그룹/룰 수 (생략했으면 다시 저장하지 않은 수)
+        skipped_runs: 마지막 저장 이후 연속으로 생략한 횟수
+        snapshot_ids: 내보내기를 보관한 :class:`SnapshotStore` 스냅샷 ID
+    """
+    proxy: str
+    scope: str
+    fingerprint: Optional[str]
+    skipped: bool
+    export_bytes: int = 0
+    records: int = 0
+    skipped_runs: int = 0
+    snapshot_ids: List[int] = field(default_factory=list)
+
+
+class StoredLists:
+    """``policy_lists.raw``에서 엔트리를 읽는 :class:`ListRef` 공급자
+
+    리스트마다 처음 접근할 때 한 번만 조회합니다.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._entries: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+
+    def get(self, list_id: str, default: Any = None) -> Any:
+        if list_id not in self._entries:
+            raw = self.session.scalar(select(PolicyList.raw).where(PolicyList.list_id == list_id))
+            self._entries[list_id] = raw.get("entries") if raw else None
+        entries = self._entries[list_id]
+        return default if entries is None else entries
+
+    def __contains__(self, list_id: str) -> bool:
+        return self.get(list_id) is not None
 
 
 class PolicyStore:
@@ -32,60 +101,397 @@ class PolicyStore:
     단일 트랜잭션으로 처리하여 데이터 일관성을 보장합니다.
     """
     
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        instrumentation: Optional[Instrumentation] = None,
+        *,
+        search: bool = False,
+    ):
         """초기화
         
         Args:
             session: SQLAlchemy 세션
+            instrumentation: 가져오기 단계별 시간/레코드 수/메모리 계측
+            search: 가져오기마다 전문 검색 색인(``policy_search``, SQLite FTS5) 갱신.
+                색인하지 않아도 :meth:`search`는 기존 색인을 조회함
         """
         self.session = session
+        self.instrumentation = instrumentation or Instrumentation.disabled()
+        self.search_index = PolicySearch(session) if search else None
 
-    def store_from_api(self, proxy_config) -> None:
+    def store_from_api(
+        self,
+        proxy_config,
+        *,
+        incremental: bool = False,
+        all_rulesets: bool = False,
+        max_workers: int = 4,
+        pool: Optional[SessionPool] = None,
+        skip_unchanged: bool = False,
+        record_state: bool = False,
+        max_age: Optional[timedelta] = None,
+        stream: bool = False,
+        batch_size: int = DEFAULT_STREAM_BATCH,
+        spool_path: Optional[str] = None,
+        snapshots: Optional["SnapshotStore"] = None,
+    ) -> SyncReport:
         """API에서 데이터를 가져와서 저장
         
+        ``skip_unchanged`` 또는 ``record_state``이면 내보내기 전에 전체 Rule Set
+        목록의 지문을 구해 ``policy_sync_state``에 기록합니다 (목록 조회 요청이
+        추가되므로 기본값은 지문 없이 내보내기 크기/레코드 수만 기록).
+        ``skip_unchanged``이면 저장된 지문과 비교하여, 같고 정책 테이블이 아직
+        그 프록시의 가져오기 결과이면 내보내기와 저장을 생략합니다. 목록
+        메타데이터(제목, 순서, 사용 여부, 하위 항목 수)만 비교하므로 룰 조건이나
+        리스트 엔트리만 바뀐 경우는 감지하지 못합니다. 그래서 기본값은 항상
+        가져오기이며, 생략을 켤 때는 ``max_age``로 주기적인 전체 가져오기를
+        함께 지정하는 것이 좋습니다.
+
         Args:
             proxy_config: 프록시 설정
+            incremental: 이전 가져오기 이후 바뀐 그룹/룰만 다시 파싱
+            all_rulesets: 메인 Rule Set만이 아니라 모든 최상위 Rule Set을 가져와
+                하나의 정책으로 저장
+            max_workers: ``all_rulesets``일 때 동시에 내보낼 Rule Set 수
+            pool: 로그인한 세션을 재사용할 풀 (없으면 호출마다 로그인/로그아웃)
+            skip_unchanged: Rule Set 목록이 바뀌지 않았으면 내보내기/저장 생략
+                (룰/리스트 내용만 바뀐 변경은 놓침)
+            record_state: 생략하지 않더라도 지문을 기록하여 다음
+                ``skip_unchanged`` 동기화에서 비교할 수 있게 함
+            max_age: 마지막 저장 후 이 시간이 지났으면 바뀌지 않았어도 다시 가져오기
+            stream: 내보내기를 메모리에 모으지 않고 받는 대로 증분 XML 파싱하여
+                ``batch_size`` 단위로 저장 (메모리 사용량이 Rule Set 크기와 무관).
+                ``incremental``은 무시되며 ``all_rulesets``와 함께 사용할 수 없음
+            batch_size: ``stream``일 때 한 번에 저장할 레코드 수
+            spool_path: ``stream``일 때 내보내기를 gzip으로 남길 경로
+                (없으면 임시 파일에 기록 후 삭제)
+            snapshots: 내보낸 Rule Set을 보관할 스냅샷 저장소 (변경이 없어
+                생략한 동기화는 보관하지 않음)
             
+        Returns:
+            동기화 결과 (생략 여부와 생략한 내보내기 크기/레코드 수).
+            이전 버전은 ``None``을 반환했음
+
         Raises:
             Exception: API 연결 또는 데이터 처리 실패시
         """
-        with SkyhighSWGClient(proxy_config) as client:
-            # 메인 룰셋만 가져오기
+        if stream and all_rulesets:
+            raise ValueError("stream은 all_rulesets와 함께 사용할 수 없습니다.")
+        scope = "all" if all_rulesets else "main"
+        with self.instrumentation.run("store_from_api", proxy=proxy_config.base_url, scope=scope) as run:
+            with client_session(proxy_config, pool) as client:
+                state = self._sync_state(proxy_config.base_url, scope)
+                fingerprint = None
+                if skip_unchanged or record_state:
+                    with self.instrumentation.stage("probe") as stage:
+                        fingerprint = client.fingerprint()
+                        unchanged = self._unchanged(state, fingerprint, max_age)
+                        stage.info["unchanged"] = unchanged
+                if skip_unchanged and unchanged:
+                    report = self._skip_sync(state)
+                    run.info.update(skipped=True, skipped_bytes=report.export_bytes, skipped_records=report.records)
+                    return report
+                kept: List[int] = []
+                if stream:
+                    size = self._stream_main(client, batch_size, spool_path, snapshots, kept)
+                    return self._finish_sync(state, fingerprint, size, kept)
+                if all_rulesets:
+                    source, size = self._download_rulesets(client, max_workers, snapshots, kept)
+                else:
+                    source, size = self._download_main(client, snapshots, kept)
+            self.store_from_source(source, from_xml=not all_rulesets, incremental=incremental)
+            return self._finish_sync(state, fingerprint, size, kept)
+
+    def _download_main(self, client, snapshots: Optional["SnapshotStore"], kept: List[int]) -> Tuple[bytes, int]:
+        """메인(첫 번째 최상위) Rule Set 내보내기"""
+        with self.instrumentation.stage("download") as stage:
             ruleset = client.list_rulesets(top_level_only=True)[0]
             content = client.export_ruleset(ruleset['id'], ruleset['title'])
-            self.store_from_source(content, from_xml=True)
+            stage.info["bytes"] = len(content)
+        self._keep_snapshot(snapshots, kept, client, ruleset, content)
+        return content, len(content)
+
+    def _stream_main(
+        self, client, batch_size: int, spool_path: Optional[str], snapshots: Optional["SnapshotStore"], kept: List[int]
+    ) -> int:
+        """메인 Rule Set 내보내기를 받는 대로 파싱하여 저장하고 내보내기 크기 반환"""
+        ruleset = client.list_rulesets(top_level_only=True)[0]
+        chunks = client.export_ruleset_stream(ruleset['id'], ruleset['title'])
+        with self.instrumentation.stage("download_and_store") as stage:
+            with ExportSpool(chunks, path=spool_path) as spool:
+                self.store_from_source(spool, from_xml=True, stream=True, batch_size=batch_size)
+                # 스풀 파일에서 다시 읽어 보관
+                self._keep_snapshot(snapshots, kept, client, ruleset, spool)
+            stage.info["bytes"] = spool.size
+        return spool.size
+
+    def _keep_snapshot(
+        self, snapshots: Optional["SnapshotStore"], kept: List[int], client, ruleset: Dict[str, Any], content: Any
+    ) -> None:
+        """내보내기를 스냅샷 저장소에 보관"""
+        if snapshots is None:
+            return
+        with self.instrumentation.stage("keep_snapshot") as stage:
+            info = snapshots.put(
+                content, proxy=client.proxy_config.base_url,
+                ruleset_id=ruleset.get('id'), ruleset_title=ruleset.get('title'),
+            )
+            stage.info.update(new_chunks=info.new_chunks, stored_bytes=info.stored_bytes)
+        kept.append(info.id)
+
+    def _download_rulesets(
+        self, client, max_workers: int, snapshots: Optional["SnapshotStore"], kept: List[int]
+    ) -> Tuple[ParsedLibrary, int]:
+        """모든 최상위 Rule Set을 동시에 내보내고 도착하는 대로 XML 파싱
 
-    def store_from_source(self, source: Any, *, from_xml: bool = False) -> None:
+        로그인한 세션 하나로 내보내기를 동시에 요청하고, 먼저 도착한
+        내보내기는 나머지를 기다리는 동안 파싱합니다. 하나라도 실패하면
+        아무것도 저장하지 않도록 예외를 전달합니다.
+
+        Returns:
+            Rule Set 순서대로 합친 문서 (:meth:`ParsedLibrary.merge`)와 내보내기 크기 합계
+        """
+        with self.instrumentation.stage("download") as stage:
+            parsed = {}
+            size = 0
+            rulesets = client.list_rulesets(top_level_only=True)
+            for ruleset, content in client.export_rulesets(rulesets, max_workers=max_workers):
+                size += len(content)
+                parsed[ruleset['id']] = ParsedLibrary(content, from_xml=True)
+                self._keep_snapshot(snapshots, kept, client, ruleset, content)
+            stage.records = len(parsed)
+            stage.info["bytes"] = size
+        return ParsedLibrary.merge(parsed[ruleset['id']] for ruleset in rulesets), size
+
+    def _sync_state(self, proxy: str, scope: str) -> PolicySyncState:
+        """프록시/범위의 동기화 상태 (없으면 저장 전 새 상태)"""
+        state = self.session.query(PolicySyncState).filter_by(proxy=proxy, scope=scope).one_or_none()
+        if state is None:
+            state = PolicySyncState(proxy=proxy, scope=scope, loaded=False, skipped=0)
+        return state
+
+    @staticmethod
+    def _unchanged(state: PolicySyncState, fingerprint: Optional[str], max_age: Optional[timedelta]) -> bool:
+        """지문이 같고 정책 테이블이 이 상태의 가져오기 결과인지"""
+        if not state.loaded or state.fingerprint != fingerprint:
+            return False
+        if max_age is not None and (state.synced_at is None or datetime.utcnow() - state.synced_at > max_age):
+            return False
+        return True
+
+    def _skip_sync(self, state: PolicySyncState) -> SyncReport:
+        """바뀌지 않은 동기화 기록 (확인 시각과 생략 횟수만 갱신)"""
+        state.checked_at = datetime.utcnow()
+        state.skipped = (state.skipped or 0) + 1
+        self.session.commit()
+        logger.info(
+            f"프록시 {state.proxy} Rule Set 변경 없음: 내보내기 {state.export_bytes} bytes, "
+            f"그룹/룰 {state.records}건 저장 생략 (연속 {state.skipped}회)"
+        )
+        return SyncReport(
+            proxy=state.proxy, scope=state.scope, fingerprint=state.fingerprint, skipped=True,
+            export_bytes=state.export_bytes or 0, records=state.records or 0, skipped_runs=state.skipped,
+        )
+
+    def _finish_sync(
+        self, state: PolicySyncState, fingerprint: Optional[str], size: int, kept: List[int]
+    ) -> SyncReport:
+        """저장한 가져오기를 동기화 상태로 기록 (지문을 구하지 않았으면 ``None``으로 기록)"""
+        self.session.add(state)
+        now = datetime.utcnow()
+        state.fingerprint = fingerprint
+        state.loaded = True
+        state.checked_at = state.synced_at = now
+        state.export_bytes = size
+        state.records = self.session.query(func.count(PolicyItem.id)).scalar()
+        state.skipped = 0
+        self.session.commit()
+        return SyncReport(
+            proxy=state.proxy, scope=state.scope, fingerprint=fingerprint, skipped=False,
+            export_bytes=size, records=state.records, snapshot_ids=kept,
+        )
+
+    def store_from_proxies(
+        self,
+        config: Config,
+        snapshots: "SnapshotStore",
+        *,
+        cluster_name: Optional[str] = None,
+        max_workers: int = DEFAULT_WORKERS,
+        pool: Optional[SessionPool] = None,
+    ) -> List[ProxyExport]:
+        """모든 프록시(또는 한 클러스터)에서 동시에 내보내어 프록시별 스냅샷으로 저장
+
+        내보내기는 ``max_workers``개의 스레드에서 동시에 진행되고, 끝난 결과부터
+        ``snapshots``에 추가합니다. 정책 테이블은 바꾸지 않으며
+        :meth:`store_from_snapshot`으로 원하는 스냅샷을 가져올 수 있습니다.
+
+        Args:
+            config: 프록시 설정
+            snapshots: 내보내기를 보관할 스냅샷 저장소
+            cluster_name: 지정하면 해당 클러스터 구성원만
+            max_workers: 동시에 내보낼 프록시 수
+            pool: 로그인한 세션을 재사용할 풀
+
+        Returns:
+            프록시별 결과 (끝난 순서, 실패한 프록시는 ``error``에 사유).
+            저장한 결과는 ``content``를 비우고 ``snapshot_id``를 채움
+        """
+        proxies = select_proxies(config, cluster_name)
+        results = []
+        with self.instrumentation.run("store_from_proxies", proxies=len(proxies), cluster=cluster_name):
+            with self.instrumentation.stage("export_and_store") as stage:
+                for result in export_proxies(proxies, max_workers, pool=pool):
+                    if result.ok:
+                        self._store_snapshot(snapshots, result)
+                    results.append(result)
+                stage.records = sum(1 for result in results if result.ok)
+                stage.info["failed"] = len(results) - stage.records
+                stage.info["bytes"] = sum(result.size for result in results)
+        return results
+
+    def _store_snapshot(self, snapshots: "SnapshotStore", result: ProxyExport) -> None:
+        """내보내기 하나를 스냅샷으로 저장하고 내용은 메모리에서 해제"""
+        try:
+            info = snapshots.put(
+                result.content,
+                proxy=result.proxy.base_url,
+                cluster_name=result.proxy.cluster_name,
+                ruleset_id=result.ruleset.get('id'),
+                ruleset_title=result.ruleset.get('title'),
+            )
+        except Exception as e:
+            result.error = f"스냅샷 저장 실패: {e}"
+            return
+        result.snapshot_id = info.id
+        result.content = None
+
+    def store_from_snapshot(
+        self,
+        snapshots: "SnapshotStore",
+        snapshot_id: Optional[int] = None,
+        *,
+        at: Optional[datetime] = None,
+        proxy: Optional[str] = None,
+        **options: Any,
+    ) -> None:
+        """스냅샷을 파싱하여 정책 테이블에 저장
+
+        Args:
+            snapshots: 스냅샷 저장소
+            snapshot_id: 가져올 스냅샷 (:attr:`ProxyExport.snapshot_id`,
+                :attr:`SyncReport.snapshot_ids`). 없으면 ``at`` 시점의 스냅샷
+            at: ``snapshot_id``가 없을 때 기준 시각 (UTC)
+            proxy: ``at``으로 찾을 때 이 프록시의 스냅샷만
+            **options: :meth:`store_from_source` 옵션 (``stream``이면 청크 단위로 읽음)
+        """
+        if snapshot_id is None:
+            if at is None:
+                raise ValueError("snapshot_id 또는 at이 필요합니다.")
+            snapshot_id = snapshots.find(at, proxy=proxy).id
+        source = snapshots.open(snapshot_id) if options.get("stream") else snapshots.read(snapshot_id)
+        self.store_from_source(source, from_xml=True, **options)
+
+    def store_from_source(
+        self,
+        source: Any,
+        *,
+        from_xml: bool = False,
+        stream: bool = False,
+        batch_size: Optional[int] = None,
+        incremental: bool = False,
+        cache: Optional[ParseCache] = None,
+    ) -> None:
         """소스 데이터에서 파싱하여 저장
         
         Args:
             source: 소스 데이터 (XML 또는 JSON)
             from_xml: XML 형식 여부
+            stream: XML 스트리밍 파싱 사용 여부
+            batch_size: 지정하면 파싱 결과를 모으지 않고 ``batch_size`` 단위로
+                파싱과 저장을 번갈아 수행 (메모리 사용량 일정)
+            incremental: ``policy_subtrees``에 저장된 이전 가져오기의 서브트리
+                해시와 비교하여 내용이 같은 그룹/룰은 파싱 결과를 재사용
+                (스트리밍 모드와 함께 사용 불가)
+            cache: 파싱 결과 디스크 캐시. 같은 소스를 다시 가져오면 XML 파싱 없이
+                캐시된 결과를 저장 (배치 저장에서는 캐시 조회만 수행)
             
         Raises:
             Exception: 파싱 또는 저장 실패시
         """
+        with self.instrumentation.run("store_from_source"):
+            self._store_from_source(source, from_xml, stream, batch_size, incremental, cache)
+
+    def _store_from_source(
+        self,
+        source: Any,
+        from_xml: bool,
+        stream: bool,
+        batch_size: Optional[int],
+        incremental: bool,
+        cache: Optional[ParseCache],
+    ) -> None:
+        instrumentation = self.instrumentation
+        previous = None
+        if incremental:
+            with instrumentation.stage("load_subtrees") as stage:
+                previous = self._load_subtrees()
+                stage.records = len(previous)
+        manager = PolicyManager(
+            source, from_xml=from_xml, stream=stream, cache_conditions=True,
+            previous_subtrees=previous, cache=cache, instrumentation=instrumentation,
+        )
+        indexer = self.search_index.indexer() if self.search_index is not None else None
+
+        if batch_size:
+            try:
+                with instrumentation.stage("parse_and_store") as stage:
+                    stage.records = self._store_batched(manager, batch_size, indexer)
+                self._finish_search(indexer)
+                with instrumentation.stage("commit"):
+                    self.session.commit()
+            except Exception as e:
+                self.session.rollback()
+                raise Exception(f"정책 데이터 저장 실패: {e}")
+            return
+
         # 1. 데이터 파싱
-        manager = PolicyManager(source, from_xml=from_xml)
         data = PolicyData(
             lists=manager.parse_lists(),
             configurations=manager.parse_configurations(),
             items=manager.parse_policy(),
+            paths=manager.paths,
+            subtrees=manager.subtrees,
         )
         
         # 2. 단일 트랜잭션으로 저장
         try:
-            self._store_all(data)
-            self.session.commit()
+            with instrumentation.stage("build_rows") as stage:
+                conditions = self._store_all(data, indexer)
+                stage.records = len(self.session.new)
+            with instrumentation.stage("insert", records=stage.records):
+                self.session.flush()
+            with instrumentation.stage("insert_conditions") as stage:
+                stage.records = self._insert_conditions(conditions)
+            self._finish_search(indexer)
+            with instrumentation.stage("commit"):
+                self.session.commit()
         except Exception as e:
             self.session.rollback()
             raise Exception(f"정책 데이터 저장 실패: {e}")
 
-    def _store_all(self, data: PolicyData) -> None:
+    def _store_all(
+        self, data: PolicyData, indexer: Optional[SearchIndexer] = None
+    ) -> List[Tuple[Dict[str, Any], Tuple[str, ...]]]:
         """단일 메서드로 모든 데이터 저장
         
         Args:
             data: 저장할 정책 데이터
+            indexer: 검색 문서를 함께 모을 색인 갱신기
+
+        Returns:
+            아이템 flush 후 :meth:`_insert_conditions`로 저장할 조건식 행
         """
         # 기존 데이터 삭제
         self._clear_existing_data()
@@ -99,59 +505,289 @@ class PolicyStore:
         
         # 각 리스트 그룹을 저장
         for list_id, items in list_groups.items():
-            # 첫 번째 항목의 메타데이터 사용
-            first_item = items[0]
-            list_record = PolicyList(
-                list_id=list_id,
-                entry_id=first_item.get("@id"),
-                value=first_item.get("value"),
-                name=first_item.get("list_name"),
-                type_id=first_item.get("list_type_id"),
-                classifier=first_item.get("list_classifier"),
-                description=first_item.get("list_description"),
-                raw={"entries": items}  # 모든 엔트리를 raw 필드에 저장
-            )
-            self.session.add(list_record)
+            self.session.add(self._list_record(list_id, items))
+            if indexer is not None:
+                indexer.list(list_id, items)
             
         # 설정 데이터 저장
         for config in data.configurations:
-            config_record = PolicyConfiguration(
-                configuration_id=config.get("id"),
-                name=config.get("name"),
-                version=config.get("version"),
-                mwg_version=config.get("mwg_version"),
-                template_id=config.get("template_id"),
-                target_id=config.get("target_id"),
-                description=config.get("description"),
-                raw=config  # 원본 데이터 저장
-            )
-            self.session.add(config_record)
+            self.session.add(self._configuration_record(config))
             
+        # 경로 테이블 저장
+        for row in data.paths.rows():
+            self.session.add(PolicyPath(**row))
+
         # 정책 아이템 데이터 저장
         for item in data.items:
             if not item.get("id"):  # 조건 데이터는 건너뛰기
                 continue
-                
-            item_record = PolicyItem(
-                item_id=item.get("id"),
-                item_type=item.get("type"),
-                name=item.get("name"),
-                path=item.get("path") or item.get("group_path"),
-                description=item.get("description"),
-                enabled=item.get("enabled"),
-                action=item.get("actionContainer_raw"),
-                action_options=item.get("immediateActions_raw"),
-                default_rights=item.get("defaultRights"),
-                cycle_request=item.get("cycleRequest"),
-                cycle_response=item.get("cycleResponse"),
-                cycle_embedded_object=item.get("cycleEmbeddedObject"),
-                cloud_synced=item.get("cloudSynced"),
-                ac_elements=item.get("acElements"),
-                raw=item  # 원본 데이터 저장
-            )
-            self.session.add(item_record)
+            self.session.add(self._item_record(item, data.paths))
+
+        # 증분 가져오기용 서브트리 해시 저장
+        if data.subtrees is not None:
+            for row in data.subtrees.rows():
+                self.session.add(PolicySubtree(**row))
+
+        return list(self._condition_rows(data.items, set(list_groups), indexer))
+
+    def _store_batched(
+        self, manager: PolicyManager, batch_size: int, indexer: Optional[SearchIndexer] = None
+    ) -> int:
+        """파서 제너레이터를 소비하며 ``batch_size`` 단위로 저장
+
+        레코드를 모두 모으지 않고 배치마다 flush 후 세션에서 분리하므로
+        정책 크기와 관계없이 메모리 사용량이 일정합니다.
+
+        Args:
+            manager: 소스를 담은 PolicyManager
+            batch_size: 한 번에 flush할 레코드 수
+            indexer: 검색 문서를 함께 모을 색인 갱신기
+
+        Returns:
+            저장한 행 수
+        """
+        self._clear_existing_data()
+        pending: List[Any] = []
+        conditions: List[Tuple[Dict[str, Any], Tuple[str, ...]]] = []
+        stored = 0
+
+        def add(record: Any) -> None:
+            nonlocal stored
+            stored += 1
+            pending.append(record)
+            if len(pending) >= batch_size:
+                flush()
+
+        def flush() -> None:
+            nonlocal stored
+            self.session.add_all(pending)
+            self.session.flush()
+            self.session.expunge_all()
+            pending.clear()
+            # 조건식은 해당 아이템이 flush된 뒤에 저장
+            stored += self._insert_conditions(conditions)
+            conditions.clear()
+
+        # 리스트 엔트리는 리스트 단위로 연속해서 나오므로 인접한 항목끼리 묶음
+        for list_id, items in groupby(manager.iter_lists(), key=lambda rec: rec.get("list_id")):
+            if list_id:
+                items = list(items)
+                add(self._list_record(list_id, items))
+                if indexer is not None:
+                    indexer.list(list_id, items)
+
+        for config in manager.iter_configurations():
+            add(self._configuration_record(config))
+
+        paths = manager.paths
+        stored_paths = 0
+        list_ids = set(manager.lists)
+        owner = None
+        for item in manager.iter_policy():
+            # 새로 생긴 경로 노드를 아이템보다 먼저 저장
+            if len(paths) > stored_paths:
+                for row in paths.rows(stored_paths):
+                    add(PolicyPath(**row))
+                stored_paths = len(paths)
+            if item.get("id"):
+                owner = item.get("id")
+                add(self._item_record(item, paths))
+                if indexer is not None:
+                    indexer.item(item)
+            condition = self._condition_row(owner, item, list_ids)
+            if condition is not None:
+                conditions.append(condition)
+                if indexer is not None:
+                    indexer.condition(*condition)
+
+        if manager.subtrees is not None:
+            for row in manager.subtrees.rows():
+                add(PolicySubtree(**row))
+
+        flush()
+        return stored
+
+    def _condition_rows(
+        self, items: Iterable[Dict[str, Any]], list_ids: Set[str], indexer: Optional[SearchIndexer] = None
+    ) -> Iterable[Tuple[Dict[str, Any], Tuple[str, ...]]]:
+        """정책 레코드의 조건식 행 (이어지는 행은 앞선 그룹/룰에 속함)"""
+        owner = None
+        for item in items:
+            if item.get("id"):
+                owner = item.get("id")
+                if indexer is not None:
+                    indexer.item(item)
+            condition = self._condition_row(owner, item, list_ids)
+            if condition is not None:
+                if indexer is not None:
+                    indexer.condition(*condition)
+                yield condition
+
+    def _finish_search(self, indexer: Optional[SearchIndexer]) -> None:
+        """모은 검색 문서 중 바뀐 것만 기록하고 사라진 문서 삭제"""
+        if indexer is None:
+            return
+        with self.instrumentation.stage("search_index") as stage:
+            stage.records = indexer.finish()
+            stage.info["documents"] = len(indexer.seen)
+
+    def search(self, query: str, **options: Any) -> SearchPage:
+        """정책/리스트 전문 검색 (:meth:`PolicySearch.search` 참고)"""
+        search_index = self.search_index or PolicySearch(self.session)
+        return search_index.search(query, **options)
+
+    @staticmethod
+    def _condition_row(
+        owner: Optional[str], item: Dict[str, Any], list_ids: Set[str]
+    ) -> Optional[Tuple[Dict[str, Any], Tuple[str, ...]]]:
+        """정책 레코드 하나를 ``policy_conditions`` 행과 참조 리스트 id로 변환"""
+        row = item.get("condition_raw")
+        if owner is None or not row or not row.get("property"):
+            return None
+        values = row.get("property_values")
+        values = list(values) if isinstance(values, (list, tuple)) else ([] if values is None else [values])
+        # 조건식 행에는 값 종류가 남지 않으므로 파싱된 리스트 id와 일치하는 값을 리스트 참조로 봄
+        referenced = tuple(dict.fromkeys(v for v in values if isinstance(v, str) and v in list_ids))
+        return {
+            "item_id": owner,
+            "position": row.get("index"),
+            "prefix": row.get("prefix"),
+            "open_bracket": row.get("open_bracket") or 0,
+            "close_bracket": row.get("close_bracket") or 0,
+            "property": row.get("property"),
+            "operator": row.get("operator"),
+            "values": json.dumps(values, ensure_ascii=False, default=str),
+            "result": item.get("condition_result"),
+        }, referenced
+
+    def _insert_conditions(self, conditions: List[Tuple[Dict[str, Any], Tuple[str, ...]]]) -> int:
+        """조건식 행과 조건식→리스트 매핑을 한 번의 executemany씩으로 저장
+
+        ``render_nulls``로 ``None`` 값도 그대로 넣어, ORM 대량 삽입이 ``None``인
+        열 조합마다 문장을 나누지 않게 합니다 (나뉘면 ``RETURNING`` 결과를
+        이어 붙이는 비용이 행 수의 제곱으로 늘어남).
+
+        Returns:
+            저장한 행 수
+        """
+        if not conditions:
+            return 0
+        ids = self.session.scalars(
+            insert(PolicyCondition)
+            .returning(PolicyCondition.id, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True),
+            [row for row, _ in conditions],
+        ).all()
+        mappings = [
+            {"condition_id": condition_id, "list_id": list_id}
+            for condition_id, (_, list_ids) in zip(ids, conditions)
+            for list_id in list_ids
+        ]
+        if mappings:
+            self.session.execute(insert(ConditionListMap), mappings)
+        return len(conditions) + len(mappings)
+
+    def items_using_list(self, list_id: str) -> List[PolicyItem]:
+        """리스트를 조건식에서 참조하는 그룹/룰 (``condition_list_map`` 인덱스 조회)
+
+        Args:
+            list_id: 리스트 ID
+        """
+        referencing = (
+            select(PolicyCondition.item_id)
+            .join(ConditionListMap, ConditionListMap.condition_id == PolicyCondition.id)
+            .where(ConditionListMap.list_id == list_id)
+        )
+        return list(self.session.scalars(
+            select(PolicyItem).where(PolicyItem.item_id.in_(referencing)).order_by(PolicyItem.id)
+        ))
+
+    def item_raw(self, item: PolicyItem, lists: Optional[StoredLists] = None) -> Dict[str, Any]:
+        """저장된 아이템의 ``raw`` (``lists_resolved``는 DB에서 읽는 :class:`ListRef`로 복원)
+
+        Args:
+            item: 저장된 아이템
+            lists: 여러 아이템이 함께 쓸 엔트리 공급자 (없으면 새로 생성)
+        """
+        raw = dict(item.raw or {})
+        if raw.get("lists_resolved") is not None:
+            raw["lists_resolved"] = load_resolved(raw["lists_resolved"], lists or StoredLists(self.session))
+        return raw
+
+    def _list_record(self, list_id: str, items: List[Dict[str, Any]]) -> PolicyList:
+        """리스트 엔트리 묶음을 PolicyList로 변환"""
+        # 첫 번째 항목의 메타데이터 사용
+        first_item = items[0]
+        return PolicyList(
+            list_id=list_id,
+            entry_id=first_item.get("@id"),
+            value=first_item.get("value"),
+            name=first_item.get("list_name"),
+            type_id=first_item.get("list_type_id"),
+            classifier=first_item.get("list_classifier"),
+            description=first_item.get("list_description"),
+            raw={"entries": [as_dict(i) for i in items]}  # 모든 엔트리를 raw 필드에 저장
+        )
+
+    def _configuration_record(self, config: Dict[str, Any]) -> PolicyConfiguration:
+        """설정 레코드를 PolicyConfiguration으로 변환"""
+        return PolicyConfiguration(
+            configuration_id=config.get("id"),
+            name=config.get("name"),
+            version=config.get("version"),
+            mwg_version=config.get("mwg_version"),
+            template_id=config.get("template_id"),
+            target_id=config.get("target_id"),
+            description=config.get("description"),
+            raw=config  # 원본 데이터 저장
+        )
+
+    def _item_record(self, item: Dict[str, Any], paths: Optional[PathTable] = None) -> PolicyItem:
+        """정책 레코드를 PolicyItem으로 변환"""
+        path = item.get("path") or item.get("group_path")
+        node = paths.find(path) if paths is not None and path else None
+        return PolicyItem(
+            item_id=item.get("id"),
+            item_type=item.get("type"),
+            name=item.get("name"),
+            path=path,
+            path_id=node.id if node is not None else None,
+            description=item.get("description"),
+            enabled=item.get("enabled"),
+            action=item.get("actionContainer_raw"),
+            action_options=item.get("immediateActions_raw"),
+            default_rights=item.get("defaultRights"),
+            cycle_request=item.get("cycleRequest"),
+            cycle_response=item.get("cycleResponse"),
+            cycle_embedded_object=item.get("cycleEmbeddedObject"),
+            cloud_synced=item.get("cloudSynced"),
+            ac_elements=item.get("acElements"),
+            raw=self._raw(item)  # 원본 데이터 저장
+        )
+
+    @staticmethod
+    def _raw(item: Any) -> Dict[str, Any]:
+        """``raw`` 컬럼 값 (참조한 리스트는 엔트리 대신 리스트 id만 저장)"""
+        data = as_dict(item)
+        resolved = data.get("lists_resolved")
+        if resolved is None:
+            return data
+        return {**data, "lists_resolved": dump_resolved(resolved)}
+
+    def _load_subtrees(self) -> SubtreeIndex:
+        """이전 가져오기에서 저장한 서브트리 해시와 레코드 조회"""
+        rows = self.session.execute(select(
+            PolicySubtree.parent_path, PolicySubtree.content_hash, PolicySubtree.name,
+            PolicySubtree.is_group, PolicySubtree.children, PolicySubtree.records,
+        ))
+        return SubtreeIndex.from_rows(rows)
 
     def _clear_existing_data(self) -> None:
         """기존 데이터 삭제"""
-        for table in [PolicyList, PolicyConfiguration, PolicyItem]:
+        for table in [
+            ConditionListMap, PolicyCondition,
+            PolicyList, PolicyConfiguration, PolicyItem, PolicyPath, PolicySubtree,
+        ]:
             self.session.query(table).delete()
+        # 정책 테이블이 바뀌므로 어떤 프록시의 동기화 결과도 아님
+        self.session.query(PolicySyncState).update({PolicySyncState.loaded: False})
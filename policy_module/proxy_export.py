@@ -0,0 +1,121 @@
+"""여러 프록시 동시 내보내기
+
+설정(:class:`Config`)의 모든 프록시 또는 한 클러스터의 구성원에 로그인하여
+메인 Rule Set을 크기가 제한된 스레드 풀에서 동시에 내보냅니다. 내보내기는
+네트워크 대기가 대부분이므로 프록시 100대를 순서대로 로그인/내보내기하는
+대신 ``max_workers``대씩 겹쳐서 처리합니다.
+
+결과는 끝나는 순서대로 돌려주며, 동시에 메모리에 있는 내보내기는 실행 중인
+작업 수(``max_workers``)를 넘지 않습니다. 한 프록시의 실패는 해당 결과의
+``error``로만 남고 다른 프록시의 내보내기는 계속됩니다.
+
+    for result in export_proxies(select_proxies(config, "cluster-a"), max_workers=8):
+        print(result.proxy.base_url, result.ok, len(result.content or b""))
+
+주기적으로 실행하는 동기화 작업은 :class:`SessionPool`을 넘겨 로그인한 세션과
+연결을 실행 사이에 재사용할 수 있습니다 (``export_proxies(..., pool=pool)``).
+"""
+
+import functools
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from .clients.session_pool import SessionPool, client_session
+from .config import Config, ProxyConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+
+
+@dataclass
+class ProxyExport:
+    """프록시 하나의 내보내기 결과
+
+    Attributes:
+        proxy: 프록시 설정
+        ruleset: 내보낸 Rule Set (``list_rulesets`` 항목)
+        content: 내보내기 XML (저장 후에는 ``None``으로 비울 수 있음)
+        size: 내보내기 크기 (bytes)
+        seconds: 로그인부터 로그아웃까지 걸린 시간 (풀을 쓰면 내보내기 시간)
+        error: 실패한 경우 예외 메시지
+        snapshot_id: :class:`SnapshotStore`에 저장된 스냅샷 ID (:meth:`PolicyStore.store_from_proxies`)
+    """
+
+    proxy: ProxyConfig
+    ruleset: Optional[Dict[str, str]] = None
+    content: Optional[bytes] = None
+    size: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+    snapshot_id: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def select_proxies(config: Config, cluster_name: Optional[str] = None) -> List[ProxyConfig]:
+    """내보낼 프록시 목록 (클러스터를 지정하면 해당 클러스터 구성원만)"""
+    if cluster_name is None:
+        return list(config.proxies)
+    proxies = config.get_cluster_proxies(cluster_name)
+    if not proxies:
+        raise ValueError(f"클러스터 '{cluster_name}'에 속한 프록시가 없습니다.")
+    return list(proxies)
+
+
+def export_proxy(proxy: ProxyConfig, pool: Optional[SessionPool] = None) -> ProxyExport:
+    """프록시 하나에 로그인하여 메인(첫 번째 최상위) Rule Set 내보내기
+
+    ``pool``을 주면 풀의 세션을 재사용하고 로그아웃하지 않습니다.
+    """
+    start = time.perf_counter()
+    result = ProxyExport(proxy)
+    try:
+        with client_session(proxy, pool) as client:
+            result.ruleset = client.list_rulesets(top_level_only=True)[0]
+            result.content = client.export_ruleset(result.ruleset['id'], result.ruleset['title'])
+            result.size = len(result.content)
+    except Exception as e:
+        logger.error(f"프록시 {proxy.base_url} 내보내기 실패: {e}")
+        result.error = str(e)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def export_proxies(
+    proxies: Iterable[ProxyConfig],
+    max_workers: int = DEFAULT_WORKERS,
+    export: Callable[[ProxyConfig], ProxyExport] = export_proxy,
+    pool: Optional[SessionPool] = None,
+) -> Iterator[ProxyExport]:
+    """여러 프록시를 동시에 내보내고 끝나는 순서대로 결과 반환
+
+    Args:
+        proxies: 내보낼 프록시
+        max_workers: 동시에 실행할 내보내기 수
+        export: 프록시 하나를 내보내는 함수
+        pool: 로그인한 세션을 재사용할 풀 (``export``에 ``pool=``로 전달)
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers는 1 이상이어야 합니다.")
+    if pool is not None:
+        export = functools.partial(export, pool=pool)
+    proxies = iter(proxies)
+    pending: Set[Future] = set()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proxy-export") as executor:
+        while True:
+            # 실행 중인 작업이 max_workers개를 넘지 않도록 하나 끝날 때마다 하나씩 제출
+            for proxy in proxies:
+                pending.add(executor.submit(export, proxy))
+                if len(pending) >= max_workers:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
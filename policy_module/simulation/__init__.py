@@ -0,0 +1,23 @@
+"""정책 시뮬레이션 모듈
+
+요청 컨텍스트(URL.Host, Client.IP, 사용자 그룹, 미디어 타입 등)를 파싱된
+룰 트리에 순서대로 적용하여 어떤 룰이 동작하는지 확인합니다:
+- PolicySimulator: 룰 트리 구성과 요청 평가
+- ConditionCompiler: 조건식 행을 불리언 평가 함수로 컴파일
+- ListMatcher: 리스트 연산자용 엔트리 매칭
+- BatchResult: 요청 테이블 일괄 평가 결과 (룰별 적중 수와 요청 위치)
+"""
+
+from .compiler import ConditionCompiler
+from .list_matcher import ListMatcher
+from .simulator import PolicySimulator, SimulationNode, SimulationResult
+from .batch import BatchResult
+
+__all__ = [
+    'PolicySimulator',
+    'SimulationNode',
+    'SimulationResult',
+    'BatchResult',
+    'ConditionCompiler',
+    'ListMatcher'
+]
@@ -0,0 +1,304 @@
+"""Column-at-a-time simulation of large request tables.
+
+:func:`evaluate_batch` runs a whole table of requests (one column per
+property, e.g. a day of access logs in a pandas ``DataFrame`` or a Parquet
+file) through a :class:`PolicySimulator` tree. Instead of evaluating one
+request at a time it keeps a boolean mask of the requests still being
+evaluated and computes every condition as a NumPy column operation:
+
+- each property column is dictionary-encoded once per chunk
+  (``pandas.factorize``), so a term is evaluated on the distinct values
+  only (a set lookup in the resolved list for plain list membership, the
+  scalar predicate of :class:`ConditionCompiler` otherwise) and expanded to
+  the rows with one ``take``,
+- the rows of a condition are combined with ``&``/``|``/``~`` using the
+  same expression builder as the scalar evaluator,
+- groups narrow the mask for their children, ``Stop Rule Set`` drops rows
+  from the enclosing group's mask and terminal actions drop them from the
+  global one.
+
+List-valued cells (e.g. ``Authentication.UserGroups``) are exploded and
+combined per row; scalar cells of such a column count as one-value lists
+and an empty sequence is a present value and combines like
+``any([])``/``all([])``, as in the scalar evaluator. Properties with a
+parameter are read from a column named ``Property(parameter)``
+(``Header.Get(User-Agent)``) or from dict cells of the ``Property`` column.
+Missing columns and missing values make a term false, as in
+:meth:`PolicySimulator.evaluate`.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .compiler import TermSpec, row_key
+from .simulator import STOP_CYCLE, STOP_RULE_SET, PolicySimulator, SimulationNode
+
+DEFAULT_CHUNK_SIZE = 500_000
+SEQUENCE_TYPES = (list, tuple, set, frozenset)
+BATCH_OPERATORS = (" & ", " | ", "~")
+
+
+@dataclass
+class BatchResult:
+    """Per-rule hits of a batch.
+
+    Attributes:
+        rules: every rule of the simulator, in document order
+        matches: rule position -> sorted request positions the rule matched
+        final: per request, position of the rule that ended the evaluation
+            (``-1`` if none did)
+    """
+
+    rules: List[SimulationNode]
+    matches: Dict[int, np.ndarray] = field(default_factory=dict)
+    final: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+
+    def hits(self) -> pd.DataFrame:
+        """Hit count per matched rule (``final_hits``: requests the rule ended)."""
+        final_counts = np.bincount(self.final[self.final >= 0], minlength=len(self.rules))
+        rows = [
+            {
+                "id": self.rules[pos].id,
+                "name": self.rules[pos].name,
+                "path": self.rules[pos].path,
+                "action": self.rules[pos].action,
+                "hits": len(indices),
+                "final_hits": int(final_counts[pos]),
+            }
+            for pos, indices in sorted(self.matches.items())
+        ]
+        return pd.DataFrame(rows, columns=["id", "name", "path", "action", "hits", "final_hits"])
+
+    def actions(self) -> pd.Series:
+        """Final action id per request (``None`` if no terminal rule fired)."""
+        actions = np.array([None] + [rule.action for rule in self.rules], dtype=object)
+        return pd.Series(actions[self.final + 1])
+
+    def matched(self, rule: SimulationNode) -> np.ndarray:
+        """Request positions matched by ``rule``."""
+        for pos, candidate in enumerate(self.rules):
+            if candidate is rule:
+                return self.matches.get(pos, np.empty(0, dtype=np.int64))
+        raise KeyError(rule.path)
+
+
+def _as_sequence(cell: Any) -> Any:
+    if isinstance(cell, SEQUENCE_TYPES) or cell is None or (isinstance(cell, float) and np.isnan(cell)):
+        return cell
+    return [cell]
+
+
+class _Column:
+    """Dictionary-encoded property column of one chunk."""
+
+    __slots__ = ("codes", "uniques", "owners", "size", "present", "text")
+
+    def __init__(self, series: pd.Series, size: int):
+        self.size = size
+        self.owners = None
+        empty = None
+        sequences = series.map(lambda cell: isinstance(cell, SEQUENCE_TYPES)).to_numpy(dtype=bool)
+        if sequences.any():
+            # 다중 값 셀: 값마다 한 행으로 펼치고 원래 행 위치(owners)를 기록
+            # 빈 시퀀스는 펼치면 값 없음(NaN)이 되므로 따로 기록 (스칼라 평가에서는 값이 있는 셀)
+            empty = series.map(lambda cell: isinstance(cell, SEQUENCE_TYPES) and len(cell) == 0).to_numpy(dtype=bool)
+            if not sequences.all():
+                # 스칼라와 섞인 열: 스칼라 셀은 한 값짜리 목록으로 펼침
+                series = series.map(_as_sequence)
+            exploded = series.explode()
+            self.owners = np.asarray(exploded.index, dtype=np.int64)
+            series = exploded
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        self.codes = codes
+        self.uniques = np.asarray(uniques, dtype=object)
+        self.text = pd.api.types.infer_dtype(self.uniques, skipna=True) in ("string", "empty")
+        present = codes >= 0
+        if self.owners is not None:
+            present = (np.bincount(self.owners[present], minlength=size) > 0) | empty
+        self.present = present
+
+    def expand(self, unique_result: np.ndarray, combine) -> np.ndarray:
+        """Per-row result of a per-unique-value result."""
+        # codes == -1 (값 없음)은 마지막에 붙인 False로 매핑
+        values = np.append(unique_result, False)[self.codes]
+        if self.owners is None:
+            return values
+        valid = self.codes >= 0
+        owners = self.owners[valid]
+        true_counts = np.bincount(owners, weights=values[valid], minlength=self.size)
+        if combine is all:
+            # 빈 시퀀스는 all([])처럼 참 (값 없는 행은 present에서 제외)
+            totals = np.bincount(owners, minlength=self.size)
+            return self.present & (true_counts == totals)
+        return true_counts > 0
+
+
+class _Chunk:
+    """Term evaluation over one chunk of the request table."""
+
+    def __init__(self, frame: pd.DataFrame, compiler):
+        self.frame = frame.reset_index(drop=True)
+        self.size = len(frame)
+        self.compiler = compiler
+        self._columns: Dict[Any, Optional[_Column]] = {}
+        self._terms: Dict[Tuple, np.ndarray] = {}
+        self._false = np.zeros(self.size, dtype=bool)
+
+    def column(self, spec: TermSpec) -> Optional[_Column]:
+        name = spec.property
+        if spec.parameter is not None:
+            parameter = ", ".join(spec.parameter) if isinstance(spec.parameter, tuple) else spec.parameter
+            name = f"{spec.property}({parameter})"
+        if name not in self._columns:
+            self._columns[name] = self._load(name, spec)
+        return self._columns[name]
+
+    def _load(self, name: str, spec: TermSpec) -> Optional[_Column]:
+        if name in self.frame.columns:
+            return _Column(self.frame[name], self.size)
+        if spec.parameter is not None and spec.property in self.frame.columns:
+            parameter = spec.parameter
+            series = self.frame[spec.property].map(
+                lambda cell: cell.get(parameter) if isinstance(cell, dict) else None
+            )
+            return _Column(series, self.size)
+        return None
+
+    def term(self, key: Tuple, row: Any) -> np.ndarray:
+        result = self._terms.get(key)
+        if result is None:
+            result = self._terms[key] = self._evaluate(self.compiler.spec(row, key))
+        return result
+
+    def _evaluate(self, spec: Optional[TermSpec]) -> np.ndarray:
+        if spec is None:
+            return self._false
+        column = self.column(spec)
+        if column is None:
+            return self._false
+        uniques = column.uniques
+        matcher = spec.matcher
+        predicate = spec.predicate
+        if column.text and matcher is not None and predicate == matcher.contains and not matcher.has_wildcards:
+            # 와일드카드 없는 리스트는 해석된 엔트리 집합 조회만으로 충분
+            predicate = matcher.exact.__contains__
+        unique_result = np.fromiter(map(predicate, uniques), dtype=bool, count=len(uniques))
+        result = column.expand(unique_result, spec.combine)
+        if spec.negate:
+            result = column.present & ~result
+        return result
+
+
+def _table(requests: Any) -> pd.DataFrame:
+    if isinstance(requests, pd.DataFrame):
+        return requests
+    if hasattr(requests, "to_pandas"):  # pyarrow.Table
+        return requests.to_pandas()
+    if isinstance(requests, str):
+        return pd.read_parquet(requests)
+    return pd.DataFrame(requests)
+
+
+def evaluate_batch(
+    simulator: PolicySimulator,
+    requests: Any,
+    cycle: str = "request",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BatchResult:
+    """Evaluate a table of requests against the simulator's rule tree.
+
+    Args:
+        simulator: compiled rule tree
+        requests: ``DataFrame``, ``pyarrow.Table``, Parquet path or a dict
+            of columns; one column per property id
+        cycle: ``request``, ``response`` or ``embedded``
+        chunk_size: rows evaluated at once (bounds the memory of cached
+            term columns)
+
+    Returns:
+        :class:`BatchResult` with positions relative to ``requests``
+    """
+    frame = _table(requests)
+    rules = simulator.rule_nodes
+    positions = {id(rule): pos for pos, rule in enumerate(rules)}
+    conditions: Dict[int, Any] = {}
+    matched: Dict[int, List[np.ndarray]] = {}
+    final = np.full(len(frame), -1, dtype=np.int64)
+
+    for start in range(0, len(frame), max(chunk_size, 1)):
+        chunk = _Chunk(frame.iloc[start:start + chunk_size], simulator.compiler)
+        alive = np.ones(chunk.size, dtype=bool)
+        run = _Runner(simulator, chunk, cycle, alive, conditions, positions)
+        run.nodes(simulator.roots, alive.copy())
+        for pos, indices in run.matched.items():
+            matched.setdefault(pos, []).append(indices + start)
+        final[start:start + chunk.size] = run.final
+
+    return BatchResult(
+        rules=rules,
+        matches={pos: np.concatenate(parts) for pos, parts in matched.items()},
+        final=final,
+    )
+
+
+class _Runner:
+    """Walks the tree for one chunk with boolean masks."""
+
+    def __init__(self, simulator, chunk: _Chunk, cycle: str, alive: np.ndarray, conditions, positions):
+        self.simulator = simulator
+        self.chunk = chunk
+        self.cycle = cycle
+        self.alive = alive
+        self.conditions = conditions
+        self.positions = positions
+        self.matched: Dict[int, np.ndarray] = {}
+        self.final = np.full(chunk.size, -1, dtype=np.int64)
+
+    def condition(self, node: SimulationNode, mask: np.ndarray) -> np.ndarray:
+        """``mask`` narrowed to the rows where ``node``'s condition holds."""
+        if not node.rows:
+            return mask
+        keys = tuple(map(row_key, node.rows))
+        evaluate = self.conditions.get(keys)
+        if evaluate is None:
+            # t{i}(c): 청크가 항 결과를 캐시하므로 같은 항은 청크당 한 번만 계산
+            namespace = {f"t{i}": _bind(key, row) for i, (key, row) in enumerate(zip(keys, node.rows))}
+            evaluate = self.conditions[keys] = self.simulator.compiler.build(
+                list(node.rows), namespace, BATCH_OPERATORS
+            )
+        return mask & evaluate(self.chunk)
+
+    def nodes(self, nodes: List[SimulationNode], mask: np.ndarray) -> None:
+        alive = self.alive
+        for node in nodes:
+            if not node.enabled:
+                continue
+            current = mask & alive
+            if not current.any():
+                return
+            if node.is_group:
+                if self.cycle not in node.cycles:
+                    continue
+                inside = self.condition(node, current)
+                if inside.any():
+                    self.nodes(node.children, inside)
+                continue
+            hit = self.condition(node, current)
+            if not hit.any():
+                continue
+            pos = self.positions[id(node)]
+            self.matched[pos] = np.flatnonzero(hit)
+            if node.flow == STOP_CYCLE:
+                self.final[hit] = pos
+                alive &= ~hit
+            elif node.flow == STOP_RULE_SET:
+                mask = mask & ~hit
+
+
+def _bind(key: Tuple, row: Any):
+    def term(chunk: _Chunk) -> np.ndarray:
+        return chunk.term(key, row)
+    return term
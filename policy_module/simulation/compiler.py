@@ -0,0 +1,341 @@
+"""Compile :class:`ConditionParser` rows into boolean evaluators.
+
+Every row becomes a *term* closure ``term(context) -> bool`` that looks up
+the row's property in the request context and applies the operator to the
+pre-processed operand (a string, number, regular expression or
+:class:`ListMatcher`). The rows of one condition are then joined by their
+``prefix`` and bracket counts into a single Python expression such as
+``t0(c) and (t1(c) or not t2(c))``, compiled once into a function, so
+evaluation is plain bytecode with native short-circuiting. ``AND`` binds
+tighter than ``OR``, as in the Skyhigh rule editor.
+
+Context values are looked up by property id (``URL.Host``,
+``Client.IP``, ``Authentication.UserGroups`` …). A value may be a list for
+multi-valued properties, and a dict keyed by the first parameter for
+properties that take parameters (``Header.Get`` → ``{"User-Agent": …}``).
+A property missing from the context makes its term false.
+"""
+
+import re
+from operator import attrgetter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .list_matcher import ListMatcher, parse_address
+
+Predicate = Callable[[Any], bool]
+Evaluator = Callable[[Dict[str, Any]], bool]
+
+_MISSING = object()
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _number(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _scalar(operator: str, operand: Any) -> Optional[Predicate]:
+    """Predicate of a positive scalar operator (``None`` if unsupported)."""
+    text = _text(operand) if operand is not None else ""
+    if operator == "equals":
+        number = _number(operand)
+
+        def equals(value):
+            value_text = _text(value)
+            if value_text == text:
+                return True
+            # 숫자 속성은 "80"과 80.0처럼 표기가 달라도 같은 값으로 비교
+            return number is not None and not isinstance(value, str) and _number(value) == number
+
+        return equals
+    if operator == "contains":
+        return lambda value: text in _text(value)
+    if operator == "starts with":
+        return lambda value: _text(value).startswith(text)
+    if operator == "ends with":
+        return lambda value: _text(value).endswith(text)
+    if operator == "matches":
+        try:
+            pattern = re.compile(text)
+        except re.error:
+            pattern = re.compile(re.escape(text))
+        return lambda value: pattern.fullmatch(_text(value)) is not None
+    if operator == "is in range":
+        interval = _range(text)
+        if interval is None:
+            return None
+        first, last = interval
+        return lambda value: (address := parse_address(value)) is not None and first <= address <= last
+    comparisons = {
+        "less than": lambda a, b: a < b,
+        "greater than": lambda a, b: a > b,
+        "less than or equals": lambda a, b: a <= b,
+        "greater than or equals": lambda a, b: a >= b,
+    }
+    if operator in comparisons:
+        number = _number(operand)
+        if number is None:
+            return None
+        compare = comparisons[operator]
+        return lambda value: (v := _number(value)) is not None and compare(v, number)
+    return None
+
+
+def _range(text: str) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    first, _, last = text.partition("-")
+    first, last = parse_address(first), parse_address(last or first)
+    if first is None or last is None:
+        return None
+    return first, last
+
+
+# 리스트 연산자: 이름 -> (ListMatcher 메서드, 다중 값 결합 방식)
+_LIST_OPERATORS = {
+    "in list": ("contains", any),
+    "is in list": ("contains", any),
+    "at least one in list": ("contains", any),
+    "all in list": ("contains", all),
+    "is in range list": ("in_range", any),
+    "matches in list": ("matches", any),
+}
+
+# 부정 연산자 -> 긍정 연산자
+_NEGATIONS = {
+    "does not equal": "equals",
+    "not equals": "equals",
+    "does not contain": "contains",
+    "does not start with": "starts with",
+    "does not end with": "ends with",
+    "does not match": "matches",
+    "is not in range": "is in range",
+    "not in list": "in list",
+    "is not in list": "in list",
+    "none in list": "at least one in list",
+    "not all in list": "all in list",
+    "is not in range list": "is in range list",
+    "does not match in list": "matches in list",
+}
+
+
+def is_list_operator(operator: str) -> bool:
+    return _NEGATIONS.get(operator, operator) in _LIST_OPERATORS
+
+
+class TermSpec(NamedTuple):
+    """What one condition row tests, independent of how it is evaluated."""
+
+    property: str
+    parameter: Any  # 첫 파라미터 (여러 개면 tuple, 없으면 None)
+    operator: str  # 긍정형 연산자
+    operand: Any
+    predicate: Predicate  # 값 하나에 대한 긍정형 판정
+    combine: Callable  # 다중 값 결합 (any/all)
+    negate: bool
+    matcher: Optional[ListMatcher] = None
+
+
+# 조건식 식 생성 시 사용할 연산자 (스칼라: and/or/not, 배치: &/|/~)
+SCALAR_OPERATORS = (" and ", " or ", "not ")
+
+
+class ConditionCompiler:
+    """Compiles condition rows, sharing identical terms and conditions.
+
+    Args:
+        lists: list id -> list entry records (``PolicyManager.lists``)
+        strict: raise ``ValueError`` for unsupported operators instead of
+            compiling them to an always-false term
+    """
+
+    def __init__(self, lists: Optional[Dict[str, List[Any]]] = None, strict: bool = False):
+        self.lists = lists or {}
+        self.strict = strict
+        self.unsupported: Dict[str, int] = {}
+        self.missing_lists: Dict[str, int] = {}
+        self._matchers: Dict[str, ListMatcher] = {}
+        self._terms: Dict[Tuple, Evaluator] = {}
+        self._specs: Dict[Tuple, Optional[TermSpec]] = {}
+        self._conditions: Dict[Tuple, Optional[Evaluator]] = {}
+        self._code: Dict[str, Any] = {}  # 괄호/접두어 구조가 같은 조건식은 코드 객체 공유
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "terms": len(self._terms),
+            "conditions": len(self._conditions),
+            "lists": len(self._matchers),
+            "unsupported": dict(self.unsupported),
+            "missing_lists": dict(self.missing_lists),
+        }
+
+    def matcher(self, list_id: str) -> ListMatcher:
+        matcher = self._matchers.get(list_id)
+        if matcher is None:
+            records = self.lists.get(list_id)
+            if records is None:
+                self.missing_lists[list_id] = self.missing_lists.get(list_id, 0) + 1
+                records = []
+            matcher = self._matchers[list_id] = ListMatcher.from_records(list_id, records)
+        return matcher
+
+    def compile(self, rows: Any) -> Optional[Evaluator]:
+        """Evaluator of one condition (``None`` when it has no rows: always true)."""
+        rows = [row for row in (rows or ()) if row]
+        if not rows:
+            return None
+        keys = tuple(map(row_key, rows))
+        condition = self._conditions.get(keys)
+        if condition is None:
+            condition = self._conditions[keys] = self._compile(rows, keys)
+        return condition
+
+    def _compile(self, rows: List[Any], keys: Tuple) -> Evaluator:
+        namespace = {f"t{i}": self.term(row, keys[i]) for i, row in enumerate(rows)}
+        return self.build(rows, namespace, SCALAR_OPERATORS)
+
+    def build(self, rows: List[Any], namespace: Dict[str, Any], operators: Tuple[str, str, str]) -> Callable:
+        """``lambda c: ...`` joining ``t{i}(c)`` by the rows' prefixes and brackets.
+
+        Args:
+            rows: condition rows
+            namespace: ``t{i}`` names used by the expression
+            operators: AND, OR and NOT tokens
+        """
+        and_op, or_op, not_op = operators
+        parts: List[str] = []
+        depth = 0
+        for i, row in enumerate(rows):
+            prefix = (row.get("prefix") or "").upper()
+            if i:
+                parts.append(or_op if prefix.startswith("OR") else and_op)
+            if "NOT" in prefix:
+                parts.append(not_op)
+            opening = int(row.get("open_bracket") or 0)
+            parts.append("(" * opening)
+            depth += opening
+            parts.append(f"t{i}(c)")
+            # 짝이 맞지 않는 닫는 괄호는 무시하고 남은 여는 괄호는 마지막에 닫음
+            closing = min(int(row.get("close_bracket") or 0), depth)
+            parts.append(")" * closing)
+            depth -= closing
+        parts.append(")" * depth)
+        source = f"lambda c: {''.join(parts)}"
+        code = self._code.get(source)
+        if code is None:
+            code = self._code[source] = compile(source, "<condition>", "eval")
+        return eval(code, namespace)
+
+    def term(self, row: Any, key: Optional[Tuple] = None) -> Evaluator:
+        """Closure evaluating one condition row against a context dict."""
+        key = key or row_key(row)
+        term = self._terms.get(key)
+        if term is None:
+            spec = self.spec(row, key)
+            term = self._terms[key] = _false if spec is None else _make_term(spec)
+        return term
+
+    def spec(self, row: Any, key: Optional[Tuple] = None) -> Optional[TermSpec]:
+        """:class:`TermSpec` of a row (``None`` if it can never match)."""
+        key = key or row_key(row)
+        if key not in self._specs:
+            self._specs[key] = self._spec(row)
+        return self._specs[key]
+
+    def _spec(self, row: Any) -> Optional[TermSpec]:
+        if row.get("error"):
+            return None
+        prop = row.get("property")
+        operator = (row.get("operator") or "equals").strip().lower()
+        values = row.get("property_values")
+        values = list(values) if isinstance(values, (list, tuple)) else ([] if values is None else [values])
+        if row.get("expression_mode") == "value" and values:
+            operand = values.pop()
+        else:
+            operand = row.get("expression_value")
+        parameters = tuple(values)
+
+        positive = _NEGATIONS.get(operator, operator)
+        matcher = None
+        if positive in _LIST_OPERATORS:
+            method, combine = _LIST_OPERATORS[positive]
+            matcher = self.matcher(_text(operand))
+            predicate = getattr(matcher, method)
+        else:
+            predicate = _scalar(positive, operand)
+            combine = any
+        if predicate is None:
+            if self.strict:
+                raise ValueError(f"Unsupported condition operator: {operator!r}")
+            self.unsupported[operator] = self.unsupported.get(operator, 0) + 1
+            return None
+        parameter = parameters[0] if len(parameters) == 1 else (parameters or None)
+        return TermSpec(prop, parameter, positive, operand, predicate, combine, positive != operator, matcher)
+
+
+def _false(context: Dict[str, Any]) -> bool:
+    return False
+
+
+_KEY_FIELDS = (
+    "prefix", "open_bracket", "close_bracket", "property", "operator",
+    "property_values", "expression_value", "expression_mode", "error",
+)
+_record_key = attrgetter(*_KEY_FIELDS)
+
+
+def row_key(row: Any) -> Tuple:
+    """Hashable identity of a row (dict row or compact :class:`ConditionRecord`)."""
+    if isinstance(row, dict):
+        key = tuple(map(row.get, _KEY_FIELDS))
+    else:
+        key = _record_key(row)
+    if isinstance(key[5], list):
+        key = key[:5] + (tuple(key[5]),) + key[6:]
+    return key
+
+
+def _make_term(spec: TermSpec) -> Evaluator:
+    prop, parameter, predicate, combine, negate = (
+        spec.property, spec.parameter, spec.predicate, spec.combine, spec.negate
+    )
+
+    def lookup(context):
+        value = context.get(prop, _MISSING)
+        if parameter is not None and isinstance(value, dict):
+            value = value.get(parameter, _MISSING)
+        return value
+
+    if negate:
+        def term(context):
+            value = lookup(context)
+            if value is _MISSING:
+                return False
+            if isinstance(value, (list, tuple, set, frozenset)):
+                return not combine(map(predicate, value))
+            return not predicate(value)
+    elif parameter is None:
+        # 파라미터 없는 속성 (가장 흔한 경우): 조회를 인라인으로
+        def term(context):
+            value = context.get(prop, _MISSING)
+            if value is _MISSING:
+                return False
+            if isinstance(value, (list, tuple, set, frozenset)):
+                return combine(map(predicate, value))
+            return predicate(value)
+    else:
+        def term(context):
+            value = lookup(context)
+            if value is _MISSING:
+                return False
+            if isinstance(value, (list, tuple, set, frozenset)):
+                return combine(map(predicate, value))
+            return predicate(value)
+    return term
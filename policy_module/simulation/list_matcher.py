@@ -0,0 +1,141 @@
+"""Membership tests against the entries of one policy list.
+
+A :class:`ListMatcher` is built once per list id from the list entry
+records of :class:`ListsParser` and answers the list operators of a
+condition: exact entries go into a set, wildcard entries (``*``/``?``) into
+one combined regular expression, and IP/CIDR/range entries into sorted
+integer intervals. Regex entries for ``matches in list`` are compiled on
+first use.
+"""
+
+import bisect
+import fnmatch
+import ipaddress
+import re
+from typing import Any, Iterable, List, Optional, Pattern, Tuple
+
+_WILDCARD = re.compile(r"[*?]")
+
+
+def entry_value(record: Any) -> Optional[str]:
+    """The comparable value of a list entry record (``entry`` or ``value`` field)."""
+    value = record.get("entry")
+    if value is None:
+        value = record.get("value")
+    if isinstance(value, dict):
+        value = value.get("#text") or value.get("@value")
+    return value if isinstance(value, str) else None
+
+
+def parse_interval(text: str) -> Optional[Tuple[int, int, int]]:
+    """``(version, first, last)`` of an IP, CIDR or ``a-b`` range entry."""
+    text = text.strip()
+    try:
+        if "-" in text:
+            first, last = (ipaddress.ip_address(part.strip()) for part in text.split("-", 1))
+            if first.version != last.version:
+                return None
+            return first.version, int(first), int(last)
+        network = ipaddress.ip_network(text, strict=False)
+    except ValueError:
+        return None
+    return network.version, int(network.network_address), int(network.broadcast_address)
+
+
+def parse_address(value: Any) -> Optional[Tuple[int, int]]:
+    """``(version, integer)`` of an IP address value."""
+    if isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return value.version, int(value)
+    try:
+        address = ipaddress.ip_address(str(value).strip())
+    except ValueError:
+        return None
+    return address.version, int(address)
+
+
+class ListMatcher:
+    """Compiled entries of one list."""
+
+    __slots__ = ("list_id", "exact", "_wildcard", "_starts", "_intervals", "_entries", "_regex")
+
+    def __init__(self, list_id: str, entries: Iterable[str]):
+        self.list_id = list_id
+        self._entries: List[str] = [e for e in entries if e is not None]
+        self.exact = frozenset(self._entries)
+        # 와일드카드/IP 구간/정규식은 해당 연산자가 처음 쓰일 때 준비
+        self._wildcard: Any = None
+        self._intervals: Optional[List[Tuple[int, int, int]]] = None
+        self._starts: List[Tuple[int, int]] = []
+        self._regex: Optional[Pattern] = None
+
+    @classmethod
+    def from_records(cls, list_id: str, records: Iterable[Any]) -> "ListMatcher":
+        return cls(list_id, (entry_value(rec) for rec in records))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def has_wildcards(self) -> bool:
+        """Whether ``contains`` needs more than the ``exact`` set."""
+        return self._wildcards() is not False
+
+    def _wildcards(self) -> Any:
+        wildcard = self._wildcard
+        if wildcard is None:
+            globs = [fnmatch.translate(e) for e in self._entries if _WILDCARD.search(e)]
+            wildcard = self._wildcard = re.compile("|".join(globs)) if globs else False
+        return wildcard
+
+    def contains(self, value: Any) -> bool:
+        """``in list``: exact entry or wildcard entry match."""
+        if not isinstance(value, str):
+            value = str(value)
+        if value in self.exact:
+            return True
+        wildcard = self._wildcard
+        if wildcard is None:
+            wildcard = self._wildcards()
+        return wildcard is not False and wildcard.match(value) is not None
+
+    def in_range(self, value: Any) -> bool:
+        """``is in range list``: IP inside one of the IP/CIDR/range entries."""
+        if self._intervals is None:
+            self._intervals = _merge(filter(None, map(parse_interval, self._entries)))
+            self._starts = [(version, first) for version, first, _ in self._intervals]
+        if not self._intervals:
+            return False
+        address = parse_address(value)
+        if address is None:
+            return False
+        # 구간이 겹치지 않으므로 시작 주소가 value 이하인 마지막 구간만 확인
+        position = bisect.bisect_right(self._starts, address) - 1
+        if position < 0:
+            return False
+        version, _, last = self._intervals[position]
+        return version == address[0] and last >= address[1]
+
+    def matches(self, value: Any) -> bool:
+        """``matches in list``: entries used as regular expressions."""
+        if self._regex is None:
+            patterns = []
+            for entry in self._entries:
+                try:
+                    re.compile(entry)
+                except re.error:
+                    entry = re.escape(entry)
+                patterns.append(f"(?:{entry})")
+            self._regex = re.compile("|".join(patterns) or r"(?!)")
+        return self._regex.fullmatch(value if isinstance(value, str) else str(value)) is not None
+
+
+def _merge(intervals: Iterable[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """Sort and merge overlapping/adjacent intervals of the same IP version."""
+    merged: List[Tuple[int, int, int]] = []
+    for version, first, last in sorted(intervals):
+        if merged and merged[-1][0] == version and first <= merged[-1][2] + 1:
+            if last > merged[-1][2]:
+                merged[-1] = (version, merged[-1][1], last)
+        else:
+            merged.append((version, first, last))
+    return merged
@@ -0,0 +1,245 @@
+"""What-if simulation of the rule-group tree.
+
+:class:`PolicySimulator` rebuilds the group/rule tree from the records of
+:class:`PolicyParser` (dict or compact), compiles every condition once with
+:class:`ConditionCompiler` and runs request contexts through the tree in
+document order, the way the appliance's rule engine does:
+
+- disabled groups/rules and groups not active in the requested cycle are
+  skipped,
+- a group whose condition holds is entered, a rule whose condition holds
+  fires,
+- ``Continue``-type actions keep going, ``Stop Rule Set`` leaves the
+  enclosing group, and ``Block``/``Redirect``/``Stop Cycle``/
+  ``Authenticate`` end the evaluation.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .compiler import ConditionCompiler, Evaluator
+
+CONTINUE = 0
+STOP_RULE_SET = 1
+STOP_CYCLE = 2
+
+# actionId 마지막 부분 -> 처리 방식 (그 외는 CONTINUE)
+ACTION_FLOW = {
+    "stopruleset": STOP_RULE_SET,
+    "stoprulesets": STOP_RULE_SET,
+    "block": STOP_CYCLE,
+    "redirect": STOP_CYCLE,
+    "stopcycle": STOP_CYCLE,
+    "authenticate": STOP_CYCLE,
+}
+
+CYCLES = {
+    "request": "cycleRequest",
+    "response": "cycleResponse",
+    "embedded": "cycleEmbeddedObject",
+}
+
+
+@dataclass(eq=False, slots=True)
+class SimulationNode:
+    """A compiled group or rule."""
+
+    is_group: bool
+    id: Optional[str]
+    name: Optional[str]
+    path: str
+    enabled: bool = True
+    condition: Optional[Evaluator] = None
+    rows: Tuple[Any, ...] = ()  # 조건식 행 (배치 평가용)
+    action: Optional[str] = None
+    flow: int = CONTINUE
+    cycles: Tuple[str, ...] = tuple(CYCLES)
+    children: List["SimulationNode"] = field(default_factory=list)
+
+    @property
+    def type(self) -> str:
+        return "group" if self.is_group else "rule"
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of one request context.
+
+    Attributes:
+        rule: the rule that ended the evaluation (``None`` if none did)
+        matched: every rule that fired, in order
+    """
+
+    rule: Optional[SimulationNode] = None
+    matched: List[SimulationNode] = field(default_factory=list)
+
+    @property
+    def action(self) -> Optional[str]:
+        return self.rule.action if self.rule is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "action": self.action,
+            "rule": _describe(self.rule),
+            "matched": [_describe(node) for node in self.matched],
+        }
+
+
+def _describe(node: Optional[SimulationNode]) -> Optional[Dict[str, Any]]:
+    if node is None:
+        return None
+    return {"id": node.id, "name": node.name, "path": node.path, "action": node.action}
+
+
+def action_id(record: Any) -> Optional[str]:
+    """``@actionId`` of a rule record (compact ``action_container`` or dict ``actionContainer_raw``)."""
+    container = getattr(record, "action_container", None)
+    if container is None:
+        raw = record.get("actionContainer_raw")
+        if not raw or raw == "None":
+            return None
+        try:
+            # dict 레코드는 str(dict)로 저장되어 있음
+            container = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            return None
+    if isinstance(container, list):
+        container = container[0] if container else None
+    return container.get("@actionId") if isinstance(container, dict) else None
+
+
+def action_flow(action: Optional[str]) -> int:
+    if not action:
+        return CONTINUE
+    return ACTION_FLOW.get(action.rsplit(".", 1)[-1].lower(), CONTINUE)
+
+
+class PolicySimulator:
+    """Evaluates request contexts against a parsed rule tree.
+
+    Args:
+        records: policy records of :meth:`PolicyManager.parse_policy` /
+            :meth:`PolicyParser.parse` in document order
+        lists: list id -> list entry records (``PolicyManager.lists``)
+        strict: raise ``ValueError`` on operators the compiler does not know
+    """
+
+    def __init__(self, records: Iterable[Any], lists: Optional[Dict[str, List[Any]]] = None, strict: bool = False):
+        self.compiler = ConditionCompiler(lists, strict=strict)
+        self.roots: List[SimulationNode] = []
+        self.rule_nodes: List[SimulationNode] = []  # 문서 순서의 모든 룰
+        self.groups = 0
+        self.rules = 0
+        self._build(records)
+
+    @classmethod
+    def from_manager(cls, manager, strict: bool = False) -> "PolicySimulator":
+        """Build from a :class:`PolicyManager` (parses lists and policy if needed)."""
+        if not manager.lists:
+            manager.parse_lists()
+        return cls(manager.parse_policy(), manager.lists, strict=strict)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"groups": self.groups, "rules": self.rules, **self.compiler.stats()}
+
+    def _build(self, records: Iterable[Any]) -> None:
+        groups: Dict[str, SimulationNode] = {}  # 경로 -> 가장 최근 그룹 노드
+        node: Optional[SimulationNode] = None
+        rows: List[Any] = []
+
+        def finish():
+            if node is not None:
+                node.rows = tuple(rows)
+                node.condition = self.compiler.compile(rows)
+
+        for record in records:
+            cond = record.get("condition_raw") or None
+            index = cond.get("index") if cond is not None else None
+            if index not in (None, 1) and node is not None:
+                rows.append(cond)  # 같은 그룹/룰의 다음 조건식 행
+                continue
+            finish()
+            node = self._node(record, groups)
+            rows = [cond] if cond is not None else []
+        finish()
+
+    def _node(self, record: Any, groups: Dict[str, SimulationNode]) -> SimulationNode:
+        is_group = record.get("type") == "group"
+        path = record.get("path") or ""
+        name = record.get("name")
+        node = SimulationNode(
+            is_group=is_group,
+            id=record.get("id"),
+            name=name,
+            path=path,
+            enabled=(record.get("enabled") or "true").lower() != "false",
+        )
+        if is_group:
+            node.cycles = tuple(
+                cycle for cycle, key in CYCLES.items() if (record.get(key) or "true").lower() != "false"
+            )
+            suffix = f" > {name}"
+            parent_path = path[: -len(suffix)] if name and path.endswith(suffix) else None
+            groups[path] = node
+            self.groups += 1
+        else:
+            node.action = action_id(record)
+            node.flow = action_flow(node.action)
+            parent_path = record.get("group_path")
+            self.rule_nodes.append(node)
+            self.rules += 1
+        parent = groups.get(parent_path) if parent_path else None
+        (parent.children if parent is not None and parent is not node else self.roots).append(node)
+        return node
+
+    def evaluate(self, context: Dict[str, Any], cycle: str = "request") -> SimulationResult:
+        """Run one request context through the tree.
+
+        Args:
+            context: property id -> value (see :mod:`.compiler`)
+            cycle: ``request``, ``response`` or ``embedded``
+        """
+        result = SimulationResult()
+        self._run(self.roots, context, cycle, result)
+        return result
+
+    def replay(self, contexts: Iterable[Dict[str, Any]], cycle: str = "request") -> Iterator[SimulationResult]:
+        """Evaluate a stream of contexts (e.g. parsed access-log lines)."""
+        evaluate = self.evaluate
+        for context in contexts:
+            yield evaluate(context, cycle)
+
+    def evaluate_batch(self, requests: Any, cycle: str = "request", chunk_size: Optional[int] = None):
+        """Evaluate a whole request table column by column (see :mod:`.batch`).
+
+        Returns:
+            :class:`BatchResult` with per-rule hit counts and matched request positions
+        """
+        from .batch import DEFAULT_CHUNK_SIZE, evaluate_batch
+
+        return evaluate_batch(self, requests, cycle, chunk_size or DEFAULT_CHUNK_SIZE)
+
+    def _run(self, nodes: List[SimulationNode], context, cycle: str, result: SimulationResult) -> bool:
+        """Returns ``True`` when the evaluation has to stop entirely."""
+        for node in nodes:
+            if not node.enabled:
+                continue
+            condition = node.condition
+            if node.is_group:
+                if cycle not in node.cycles:
+                    continue
+                if condition is not None and not condition(context):
+                    continue
+                if self._run(node.children, context, cycle, result):
+                    return True
+                continue
+            if condition is not None and not condition(context):
+                continue
+            result.matched.append(node)
+            if node.flow == STOP_CYCLE:
+                result.rule = node
+                return True
+            if node.flow == STOP_RULE_SET:
+                return False
+        return False
@@ -0,0 +1,358 @@
+"""내보내기 스냅샷 저장소 (중복 제거, zstd 압축)
+
+감사와 롤백을 위해 Rule Set 내보내기를 모두 보관하는 로컬 저장소입니다.
+내보내기를 내용 기반 청크로 나누어 청크마다 zstd로 압축해 SHA-256 이름으로
+한 번만 저장하므로, 대부분 같은 일일 스냅샷은 바뀐 부분의 청크만 추가로
+차지합니다.
+
+청크 경계는 그룹/룰/리스트 엔트리 등 요소가 시작하는 위치 중에서 그 뒤
+``WINDOW`` bytes의 해시로 고릅니다. 경계가 앞쪽 내용의 위치가 아니라 주변
+내용으로 결정되므로 룰 하나를 추가/삭제해도 그 주변 청크만 바뀝니다. 청크를
+이어 붙이면 원본 내보내기와 바이트 단위로 같습니다.
+
+디렉터리 구성::
+
+    index.json                  다음 스냅샷 ID와 스냅샷 목록 (id, 시각, 프록시, Rule Set, 크기, SHA-256)
+    manifests/<id>.json.zst     스냅샷의 청크 해시 목록
+    chunks/<h[:2]>/<h>.zst      zstd로 압축한 청크
+
+    store = SnapshotStore("/var/lib/proxy_tool/snapshots")
+    info = store.put(content, proxy=proxy.base_url, ruleset_id="1", ruleset_title="Main")
+    manager = PolicyManager.from_snapshot(store, info.id)
+    manager = PolicyManager.from_snapshot(store, at=datetime(2024, 1, 1), proxy=proxy.base_url)
+
+``zstandard``가 필요합니다 (``pip install zstandard``). 인덱스는 한 프로세스에서만
+갱신해야 합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import zstandard as zstd
+
+DEFAULT_LEVEL = 9
+FORMAT_VERSION = 1
+
+# 청크 경계 후보: 정책 요소가 시작하는 위치
+BOUNDARY = re.compile(rb"<(?:ruleGroup|rule|entry|list|configuration)\b")
+WINDOW = 64  # 경계 여부를 정하는 후보 뒤 해시 범위
+MIN_CHUNK = 4 * 1024
+MAX_CHUNK = 128 * 1024
+CHUNK_MASK = 0xF  # 최소 크기를 넘은 후보 16개 중 하나 꼴로 경계
+
+
+@dataclass
+class SnapshotInfo:
+    """스냅샷 하나의 인덱스 항목
+
+    Attributes:
+        id: 스냅샷 ID (1부터 증가, 삭제한 스냅샷의 ID는 다시 쓰지 않음)
+        created_at: 생성 시각 (UTC ISO 형식)
+        proxy: 프록시 base_url
+        cluster_name: 프록시가 속한 클러스터
+        ruleset_id: 내보낸 Rule Set ID
+        ruleset_title: 내보낸 Rule Set 제목
+        size: 원본 크기
+        sha256: 원본 SHA-256
+        chunks: 청크 수
+        new_chunks: 저장할 때 새로 추가된 청크 수
+        stored_bytes: 저장할 때 새로 추가된 압축 청크 크기
+    """
+
+    id: int
+    created_at: str
+    proxy: Optional[str] = None
+    cluster_name: Optional[str] = None
+    ruleset_id: Optional[str] = None
+    ruleset_title: Optional[str] = None
+    size: int = 0
+    sha256: str = ""
+    chunks: int = 0
+    new_chunks: int = 0
+    stored_bytes: int = 0
+
+    @property
+    def created(self) -> datetime:
+        return datetime.fromisoformat(self.created_at)
+
+
+def _next_cut(data: Union[bytes, bytearray], start: int, final: bool) -> Optional[int]:
+    """``start``에서 시작하는 청크의 끝 (데이터가 더 필요하면 ``None``)"""
+    end = len(data)
+    limit = start + MAX_CHUNK
+    for match in BOUNDARY.finditer(data, start + MIN_CHUNK, min(limit, end)):
+        pos = match.start()
+        if pos + WINDOW > end and not final:
+            return None
+        if zlib.crc32(data[pos:pos + WINDOW]) & CHUNK_MASK == 0:
+            return pos
+    if limit <= end:
+        return limit
+    return end if final and end > start else None
+
+
+def split_chunks(source: Union[bytes, Iterable[bytes]]) -> Iterator[bytes]:
+    """내보내기를 내용 기반 청크로 나누기
+
+    ``source``는 bytes 또는 bytes 청크의 iterable(HTTP 응답, :class:`ExportSpool`)
+    이며, iterable은 청크 최대 크기 정도만 메모리에 둡니다.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+        start = 0
+        while True:
+            cut = _next_cut(data, start, final=True)
+            if cut is None:
+                return
+            yield data[start:cut]
+            start = cut
+
+    buffer = bytearray()
+    for piece in source:
+        buffer += piece
+        start = 0
+        while True:
+            cut = _next_cut(buffer, start, final=False)
+            if cut is None:
+                break
+            yield bytes(buffer[start:cut])
+            start = cut
+        del buffer[:start]
+    start = 0
+    while True:
+        cut = _next_cut(buffer, start, final=True)
+        if cut is None:
+            return
+        yield bytes(buffer[start:cut])
+        start = cut
+
+
+class SnapshotContent:
+    """스냅샷 원본을 청크 단위로 여러 번 읽을 수 있는 소스
+
+    ``PolicyManager(..., stream=True)``의 소스로 쓰면 섹션을 읽을 때마다 청크를
+    하나씩 압축 해제하므로 원본 전체를 메모리에 두지 않습니다.
+    """
+
+    def __init__(self, store: "SnapshotStore", hashes: List[str]):
+        self.store = store
+        self.hashes = hashes
+
+    def __iter__(self) -> Iterator[bytes]:
+        return map(self.store._read_chunk, self.hashes)
+
+
+class SnapshotStore:
+    """파일 인덱스 기반 중복 제거 스냅샷 저장소"""
+
+    def __init__(self, directory: str, level: int = DEFAULT_LEVEL):
+        """초기화
+
+        Args:
+            directory: 저장소 디렉터리 (없으면 생성)
+            level: zstd 압축 수준
+        """
+        self.directory = os.fspath(directory)
+        self.level = level
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(self.directory, "chunks"), exist_ok=True)
+        os.makedirs(os.path.join(self.directory, "manifests"), exist_ok=True)
+        self._next_id = 1
+        self._snapshots = self._load_index()
+
+    # 인덱스
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def _load_index(self) -> Dict[int, SnapshotInfo]:
+        try:
+            with open(self._index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 스냅샷 인덱스 버전입니다: {index.get('version')}")
+        snapshots = {entry["id"]: SnapshotInfo(**entry) for entry in index["snapshots"]}
+        # next_id가 없는 인덱스는 남은 스냅샷 기준으로 이어감
+        self._next_id = index.get("next_id", max(snapshots, default=0) + 1)
+        return snapshots
+
+    def _save_index(self) -> None:
+        index = {
+            "version": FORMAT_VERSION,
+            "next_id": self._next_id,
+            "snapshots": [asdict(info) for info in self._snapshots.values()],
+        }
+        self._write(self._index_path, json.dumps(index, ensure_ascii=False, indent=1).encode("utf-8"))
+
+    def _write(self, path: str, data: bytes) -> None:
+        """임시 파일에 쓴 뒤 교체 (중간에 실패해도 기존 파일 유지)"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _manifest_path(self, snapshot_id: int) -> str:
+        return os.path.join(self.directory, "manifests", f"{snapshot_id}.json.zst")
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "chunks", digest[:2], digest + ".zst")
+
+    # 저장
+
+    def put(
+        self,
+        content: Union[bytes, Iterable[bytes]],
+        *,
+        proxy: Optional[str] = None,
+        cluster_name: Optional[str] = None,
+        ruleset_id: Optional[str] = None,
+        ruleset_title: Optional[str] = None,
+        created_at: Optional[datetime] = None,
+    ) -> SnapshotInfo:
+        """내보내기를 스냅샷으로 저장
+
+        Args:
+            content: 내보내기 XML bytes 또는 bytes 청크 iterable
+            proxy: 프록시 base_url
+            cluster_name: 프록시가 속한 클러스터
+            ruleset_id: Rule Set ID
+            ruleset_title: Rule Set 제목
+            created_at: 생성 시각 (UTC, 기본값은 현재)
+
+        Returns:
+            추가된 스냅샷의 인덱스 항목
+        """
+        compressor = zstd.ZstdCompressor(level=self.level)
+        digest = hashlib.sha256()
+        hashes: List[str] = []
+        size = new_chunks = stored_bytes = 0
+        for chunk in split_chunks(content):
+            digest.update(chunk)
+            size += len(chunk)
+            chunk_hash = hashlib.sha256(chunk).hexdigest()
+            hashes.append(chunk_hash)
+            path = self._chunk_path(chunk_hash)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                compressed = compressor.compress(chunk)
+                self._write(path, compressed)
+                new_chunks += 1
+                stored_bytes += len(compressed)
+
+        with self._lock:
+            info = SnapshotInfo(
+                id=self._next_id,
+                created_at=(created_at or datetime.utcnow()).isoformat(),
+                proxy=proxy,
+                cluster_name=cluster_name,
+                ruleset_id=ruleset_id,
+                ruleset_title=ruleset_title,
+                size=size,
+                sha256=digest.hexdigest(),
+                chunks=len(hashes),
+                new_chunks=new_chunks,
+                stored_bytes=stored_bytes,
+            )
+            self._write(self._manifest_path(info.id), compressor.compress(json.dumps(hashes).encode("utf-8")))
+            self._snapshots[info.id] = info
+            self._next_id += 1
+            self._save_index()
+        return info
+
+    # 조회
+
+    def list(self, proxy: Optional[str] = None) -> List[SnapshotInfo]:
+        """스냅샷 목록 (생성 시각 순, ``proxy``를 지정하면 해당 프록시만)"""
+        infos = [info for info in self._snapshots.values() if proxy is None or info.proxy == proxy]
+        return sorted(infos, key=lambda info: (info.created_at, info.id))
+
+    def get(self, snapshot_id: int) -> SnapshotInfo:
+        try:
+            return self._snapshots[snapshot_id]
+        except KeyError:
+            raise ValueError(f"스냅샷 {snapshot_id}이(가) 없습니다.") from None
+
+    def find(self, at: datetime, proxy: Optional[str] = None) -> SnapshotInfo:
+        """``at`` 시점의 스냅샷 (그 이전에 만든 것 중 가장 최근)"""
+        candidates = [info for info in self.list(proxy) if info.created <= at]
+        if not candidates:
+            raise ValueError(f"{at.isoformat()} 이전 스냅샷이 없습니다.")
+        return candidates[-1]
+
+    def open(self, snapshot_id: int) -> SnapshotContent:
+        """스냅샷 원본을 청크 단위로 읽는 소스"""
+        self.get(snapshot_id)
+        with open(self._manifest_path(snapshot_id), "rb") as f:
+            hashes = json.loads(zstd.ZstdDecompressor().decompress(f.read()))
+        return SnapshotContent(self, hashes)
+
+    def read(self, snapshot_id: int) -> bytes:
+        """스냅샷 원본 (저장할 때의 SHA-256과 비교)"""
+        content = b"".join(self.open(snapshot_id))
+        if hashlib.sha256(content).hexdigest() != self.get(snapshot_id).sha256:
+            raise ValueError(f"스냅샷 {snapshot_id}의 내용이 손상되었습니다.")
+        return content
+
+    def _read_chunk(self, digest: str) -> bytes:
+        with open(self._chunk_path(digest), "rb") as f:
+            return zstd.ZstdDecompressor().decompress(f.read())
+
+    # 정리
+
+    def remove(self, snapshot_id: int) -> None:
+        """스냅샷 삭제 (청크는 :meth:`collect_garbage`에서 정리)"""
+        with self._lock:
+            self.get(snapshot_id)
+            del self._snapshots[snapshot_id]
+            self._save_index()
+        path = self._manifest_path(snapshot_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def collect_garbage(self) -> int:
+        """어떤 스냅샷도 참조하지 않는 청크 삭제 후 삭제한 수 반환"""
+        with self._lock:
+            referenced = set()
+            for snapshot_id in self._snapshots:
+                referenced.update(self.open(snapshot_id).hashes)
+            removed = 0
+            chunks_dir = os.path.join(self.directory, "chunks")
+            for prefix in os.listdir(chunks_dir):
+                for name in os.listdir(os.path.join(chunks_dir, prefix)):
+                    if name.endswith(".zst") and name[:-4] not in referenced:
+                        os.remove(os.path.join(chunks_dir, prefix, name))
+                        removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """스냅샷 수, 원본 크기 합계, 실제 저장 크기와 비율"""
+        chunks_dir = os.path.join(self.directory, "chunks")
+        stored = chunks = 0
+        for prefix in os.listdir(chunks_dir):
+            for name in os.listdir(os.path.join(chunks_dir, prefix)):
+                stored += os.path.getsize(os.path.join(chunks_dir, prefix, name))
+                chunks += 1
+        logical = sum(info.size for info in self._snapshots.values())
+        return {
+            "snapshots": len(self._snapshots),
+            "chunks": chunks,
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "ratio": logical / stored if stored else 0.0,
+        }
@@ -3,8 +3,9 @@
 정책 데이터베이스 관리 기능을 제공합니다.
 """
 
-from .policy_db import save_policy_to_db
+from .policy_db import migrate_policy_tables, save_policy_to_db
 
 __all__ = [
+    'migrate_policy_tables',
     'save_policy_to_db'
 ]
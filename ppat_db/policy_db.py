@@ -1,20 +1,50 @@
 """정책 관리 데이터베이스 모델"""
 
-from .database import db
 import json
+import warnings
+from datetime import datetime
+
+from sqlalchemy import inspect, insert, text
+
+from .database import db
+
+class PolicyPath(db.Model):
+    """정책 그룹/룰 경로 모델
+
+    파서의 경로 테이블(``PathTable``)을 그대로 저장합니다. 경로 문자열은
+    노드당 한 번만 저장되고 ``policy_items``는 ``path_id``로 참조합니다.
+    """
+    __tablename__ = "policy_paths"
+
+    id = db.Column(db.Integer, primary_key=True)
+    parent_id = db.Column(db.Integer, db.ForeignKey('policy_paths.id'))
+    name = db.Column(db.String(200))
+    path = db.Column(db.String(500))
+
+    def __repr__(self):
+        return f'<PolicyPath {self.path}>'
 
 class PolicyItem(db.Model):
-    """정책 아이템 모델"""
+    """정책 아이템 모델 (그룹/룰 통합)"""
     __tablename__ = "policy_items"
 
     id = db.Column(db.Integer, primary_key=True)
     item_id = db.Column(db.String(100), unique=True, nullable=False)
+    item_type = db.Column(db.String(50), nullable=False)  # group, rule
     name = db.Column(db.String(200), nullable=False)
-    type = db.Column(db.String(50), nullable=False)
     path = db.Column(db.String(500))
-    enabled = db.Column(db.Boolean, default=True)
+    path_id = db.Column(db.Integer, db.ForeignKey('policy_paths.id'), index=True)
     description = db.Column(db.String(500))
-    raw_data = db.Column(db.JSON)
+    enabled = db.Column(db.String(10))
+    action = db.Column(db.Text)
+    action_options = db.Column(db.Text)
+    default_rights = db.Column(db.String(50))
+    cycle_request = db.Column(db.String(10))
+    cycle_response = db.Column(db.String(10))
+    cycle_embedded_object = db.Column(db.String(10))
+    cloud_synced = db.Column(db.String(10))
+    ac_elements = db.Column(db.Text)
+    raw = db.Column(db.JSON)
 
     # 관계 설정
     conditions = db.relationship("PolicyCondition", backref="item", lazy=True)
@@ -22,31 +52,83 @@ class PolicyItem(db.Model):
     def __repr__(self):
         return f'<PolicyItem {self.name}>'
 
+class PolicySubtree(db.Model):
+    """그룹/룰 서브트리 내용 해시 모델
+
+    증분 가져오기에 사용됩니다. 부모 경로와 Merkle 해시가 같은 서브트리는
+    다음 가져오기에서 다시 파싱하지 않고 ``records``를 재사용합니다.
+    """
+    __tablename__ = "policy_subtrees"
+
+    id = db.Column(db.Integer, primary_key=True)
+    parent_path = db.Column(db.String(500), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    name = db.Column(db.String(200))
+    is_group = db.Column(db.Boolean, nullable=False, default=False)
+    children = db.Column(db.JSON)  # 하위 서브트리 해시 (문서 순서)
+    records = db.Column(db.JSON)  # 이 그룹/룰 자체의 파싱 레코드
+
+    __table_args__ = (db.Index("ix_policy_subtrees_key", "parent_path", "content_hash"),)
+
+    def __repr__(self):
+        return f'<PolicySubtree {self.name} {self.content_hash[:12]}>'
+
 class PolicyCondition(db.Model):
-    """정책 조건식 모델"""
+    """정책 조건식 모델
+
+    그룹/룰 조건식의 행 하나입니다. ``position``은 조건식 안에서의 순서
+    (파서의 ``index``)입니다.
+    """
     __tablename__ = "policy_conditions"
 
     id = db.Column(db.Integer, primary_key=True)
-    item_id = db.Column(db.String(100), db.ForeignKey('policy_items.item_id'), nullable=False)
+    item_id = db.Column(db.String(100), db.ForeignKey('policy_items.item_id'), nullable=False, index=True)
+    position = db.Column(db.Integer)
     prefix = db.Column(db.String(50))
-    property = db.Column(db.String(100))
+    open_bracket = db.Column(db.Integer, default=0)
+    close_bracket = db.Column(db.Integer, default=0)
+    property = db.Column(db.String(100), index=True)
     operator = db.Column(db.String(50))
     values = db.Column(db.Text)  # JSON 문자열로 저장
     result = db.Column(db.String(50))
 
+    # 관계 설정
+    lists = db.relationship("ConditionListMap", backref="condition", lazy=True)
+
     def __repr__(self):
         return f'<PolicyCondition {self.property} {self.operator}>'
 
+class ConditionListMap(db.Model):
+    """조건식과 리스트 간 매핑 모델
+
+    ``list_id`` 인덱스로 "리스트 X를 사용하는 룰" 조회를 ``raw`` 스캔 없이
+    처리합니다.
+    """
+    __tablename__ = "condition_list_map"
+
+    id = db.Column(db.Integer, primary_key=True)
+    condition_id = db.Column(db.Integer, db.ForeignKey('policy_conditions.id'), nullable=False, index=True)
+    list_id = db.Column(db.String(100), nullable=False)
+
+    __table_args__ = (db.Index("ix_condition_list_map_list", "list_id", "condition_id"),)
+
+    def __repr__(self):
+        return f'<ConditionListMap {self.condition_id} -> {self.list_id}>'
+
 class PolicyList(db.Model):
     """정책 리스트 모델"""
     __tablename__ = "policy_lists"
 
     id = db.Column(db.Integer, primary_key=True)
     list_id = db.Column(db.String(100), unique=True, nullable=False)
-    name = db.Column(db.String(200), nullable=False)
-    type_id = db.Column(db.String(50), nullable=False)
+    entry_id = db.Column(db.String(100))
+    value = db.Column(db.Text)
+    name = db.Column(db.String(200))
+    type_id = db.Column(db.String(100))
     classifier = db.Column(db.String(100))
-    entries = db.Column(db.JSON)
+    description = db.Column(db.String(500))
+    metadata_json = db.Column("metadata", db.JSON)
+    raw = db.Column(db.JSON)
 
     def __repr__(self):
         return f'<PolicyList {self.name}>'
@@ -59,71 +141,176 @@ class PolicyConfiguration(db.Model):
     configuration_id = db.Column(db.String(100), unique=True, nullable=False)
     name = db.Column(db.String(200), nullable=False)
     version = db.Column(db.String(50))
+    mwg_version = db.Column(db.String(50))
+    template_id = db.Column(db.String(100))
+    target_id = db.Column(db.String(100))
     description = db.Column(db.String(500))
-    settings = db.Column(db.JSON)
+    metadata_json = db.Column("metadata", db.JSON)
+    raw = db.Column(db.JSON)
 
     def __repr__(self):
         return f'<PolicyConfiguration {self.name}>'
 
+class PolicySyncState(db.Model):
+    """프록시별 API 동기화 상태 모델
+
+    ``store_from_api``가 마지막으로 본 Rule Set 목록 지문(fingerprint)을
+    프록시와 범위(메인 Rule Set/전체 Rule Set)별로 저장합니다. 다음 동기화에서
+    지문이 같고 정책 테이블이 아직 그 가져오기 결과이면(``loaded``) 내보내기와
+    저장을 생략합니다.
+    """
+    __tablename__ = "policy_sync_state"
+
+    id = db.Column(db.Integer, primary_key=True)
+    proxy = db.Column(db.String(200), nullable=False)  # 프록시 base_url
+    scope = db.Column(db.String(20), nullable=False)  # main, all
+    fingerprint = db.Column(db.String(64))
+    loaded = db.Column(db.Boolean, nullable=False, default=False)  # 정책 테이블이 이 가져오기 결과인지
+    checked_at = db.Column(db.DateTime)  # 마지막 확인 시각
+    synced_at = db.Column(db.DateTime)  # 마지막 내보내기/저장 시각
+    export_bytes = db.Column(db.Integer)  # 마지막 내보내기 크기
+    records = db.Column(db.Integer)  # 마지막 저장 그룹/룰 수
+    skipped = db.Column(db.Integer, nullable=False, default=0)  # 마지막 저장 이후 생략 횟수
+
+    __table_args__ = (db.UniqueConstraint("proxy", "scope", name="uq_policy_sync_state_proxy_scope"),)
+
+    def __repr__(self):
+        return f'<PolicySyncState {self.proxy} {self.scope}>'
+
 def save_policy_to_db(policy_source, list_source=None, *, from_xml=False):
-    """정책과 리스트 데이터를 파싱하여 로컬 DB에 저장합니다."""
-    from policy_module.policy_manager import PolicyManager
-    
-    manager = PolicyManager(policy_source, list_source, from_xml=from_xml)
-    list_records = manager.parse_lists()
-    items = manager.parse_policy()
-    configs = manager.parse_configurations()
-
-    # 리스트 저장
-    for l in list_records:
-        rec = PolicyList(
-            list_id=l.get("list_id"),
-            name=l.get("list_name"),
-            type_id=l.get("list_type_id"),
-            classifier=l.get("list_classifier"),
-            description=l.get("list_description"),
-            raw=json.dumps(l, ensure_ascii=False)
-        )
-        db.session.merge(rec)
-
-    # 정책 아이템 저장
-    for item in items:
-        if item.get("id"):
-            record = PolicyItem(
-                item_id=item.get("id"),
-                name=item.get("name"),
-                type=item.get("type"),
-                path=item.get("path") or item.get("group_path"),
-                enabled=item.get("enabled"),
-                description=item.get("description"),
-                raw_data=json.dumps(item, ensure_ascii=False)
-            )
-            db.session.merge(record)
-
-            # 조건식 저장
-            cond = item.get("condition_raw") or {}
-            if cond:
-                cond_record = PolicyCondition(
-                    item_id=item.get("id"),
-                    prefix=cond.get("prefix"),
-                    property=cond.get("property"),
-                    operator=cond.get("operator"),
-                    values=json.dumps(cond.get("property_values"), ensure_ascii=False)
-                    if cond.get("property_values") is not None
-                    else None,
-                    result=cond.get("expression_value")
-                )
-                db.session.add(cond_record)
-
-    # 설정 저장
-    for conf in configs:
-        cfg = PolicyConfiguration(
-            configuration_id=conf.get("id"),
-            name=conf.get("name"),
-            version=conf.get("version"),
-            description=conf.get("description"),
-            settings=json.dumps(conf, ensure_ascii=False)
+    """정책과 리스트 데이터를 파싱하여 로컬 DB에 저장합니다.
+
+    ``list_source``는 더 이상 사용하지 않습니다. 전달하면 ``DeprecationWarning``을
+    내고 그 내보내기의 리스트와 설정을 ``policy_source``에 합쳐서 저장합니다.
+    """
+    from policy_module.parsers.library import ParsedLibrary
+    from policy_module.policy_store import PolicyStore
+
+    if list_source is not None:
+        warnings.warn(
+            "save_policy_to_db의 list_source는 더 이상 사용하지 않습니다. "
+            "리스트가 포함된 내보내기 하나를 전달하세요.",
+            DeprecationWarning,
+            stacklevel=2,
         )
-        db.session.merge(cfg)
+        lists = ParsedLibrary.load(list_source, from_xml=from_xml).content
+        policy_source = ParsedLibrary.merge([
+            ParsedLibrary.load(policy_source, from_xml=from_xml),
+            # 룰 그룹은 policy_source에서만 가져옴
+            ParsedLibrary({"libraryContent": {k: v for k, v in lists.items() if k != "ruleGroup"}}),
+        ])
+        from_xml = False
+
+    PolicyStore(db.session).store_from_source(policy_source, from_xml=from_xml)
+
+# PolicyStore 도입 전 스키마를 구분하는 컬럼 (테이블 -> 이전 스키마에만 있는 컬럼)
+LEGACY_POLICY_COLUMNS = {
+    "policy_items": "raw_data",
+    "policy_lists": "entries",
+    "policy_configurations": "settings",
+}
+
+def _legacy_json(value):
+    """이전 스키마의 JSON 값 (``json.dumps`` 문자열이 한 번 더 인코딩된 경우 포함)"""
+    while isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            break
+    return value
+
+def _legacy_enabled(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip().lower() in ("1", "true")
+    return "true" if value else "false"
+
+def migrate_policy_tables(engine):
+    """이전 스키마의 정책 테이블을 현재 모델로 변환합니다.
+
+    ``policy_items.type``/``raw_data``, ``policy_lists.entries``,
+    ``policy_configurations.settings`` 컬럼을 쓰던 테이블의 행을 읽어 두고
+    테이블을 다시 만든 뒤 현재 컬럼으로 옮깁니다. 이전 ``policy_conditions``는
+    ``position``/괄호 정보가 없어 옮기지 않고 삭제하며, 다음 가져오기에서 다시
+    생성됩니다. 이미 현재 스키마인 테이블은 건드리지 않습니다.
+
+    Returns:
+        변환한 테이블 이름 목록
+    """
+    inspector = inspect(engine)
+    tables = set(inspector.get_table_names())
+    columns = {
+        table: {column["name"] for column in inspector.get_columns(table)}
+        for table in tables
+    }
+    legacy = [
+        table for table, column in LEGACY_POLICY_COLUMNS.items()
+        if column in columns.get(table, ())
+    ]
+    legacy_conditions = (
+        "policy_conditions" in tables and "position" not in columns["policy_conditions"]
+    )
+    if not legacy and not legacy_conditions:
+        return []
+
+    with engine.begin() as conn:
+        rows = {
+            table: [dict(row._mapping) for row in conn.execute(text(f"SELECT * FROM {table}"))]
+            for table in legacy
+        }
+
+        # 조건식이 policy_items를 참조하므로 먼저 삭제
+        if legacy_conditions or "policy_items" in legacy:
+            for table in ("condition_list_map", "policy_conditions"):
+                if table in tables:
+                    conn.execute(text(f"DROP TABLE {table}"))
+        for table in legacy:
+            conn.execute(text(f"DROP TABLE {table}"))
+
+        db.Model.metadata.create_all(conn)
+
+        items = [
+            {
+                "item_id": row["item_id"],
+                "item_type": row["type"],
+                "name": row["name"],
+                "path": row.get("path"),
+                "description": row.get("description"),
+                "enabled": _legacy_enabled(row.get("enabled")),
+                "raw": _legacy_json(row.get("raw_data")),
+            }
+            for row in rows.get("policy_items", ())
+        ]
+        lists = [
+            {
+                "list_id": row["list_id"],
+                "name": row["name"],
+                "type_id": row.get("type_id"),
+                "classifier": row.get("classifier"),
+                "raw": {"entries": _legacy_json(row.get("entries")) or []},
+            }
+            for row in rows.get("policy_lists", ())
+        ]
+        configurations = [
+            {
+                "configuration_id": row["configuration_id"],
+                "name": row["name"],
+                "version": row.get("version"),
+                "description": row.get("description"),
+                "raw": _legacy_json(row.get("settings")),
+            }
+            for row in rows.get("policy_configurations", ())
+        ]
+        for model, values in (
+            (PolicyItem, items),
+            (PolicyList, lists),
+            (PolicyConfiguration, configurations),
+        ):
+            if values:
+                conn.execute(insert(model.__table__), values)
 
-    db.session.commit()
+    migrated = list(legacy)
+    if legacy_conditions and "policy_conditions" not in migrated:
+        migrated.append("policy_conditions")
+    return migrated
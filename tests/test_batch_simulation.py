@@ -0,0 +1,92 @@
+"""evaluate_batch와 스칼라 evaluate의 결과 일치 검사"""
+
+import random
+
+import pandas as pd
+import pytest
+
+import synthetic
+from policy_module import PolicyManager
+from policy_module.simulation import PolicySimulator
+from policy_module.simulation.batch import _Column
+
+LIST_OPERATORS = ("at least one in list", "not in list", "all in list")
+PREFIXES = ("AND", "OR", "AND NOT", "OR NOT")
+
+
+def _expressions(obj):
+    if isinstance(obj, dict):
+        if "@operatorId" in obj:
+            yield obj
+        for value in obj.values():
+            yield from _expressions(value)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from _expressions(value)
+
+
+def _simulator(compact: bool) -> PolicySimulator:
+    data = synthetic.generate(rules=400, depth=2, conditions=3, lists=20, list_entries=40, seed=7)
+    rnd = random.Random(7)
+    for expr in _expressions(data["libraryContent"]["ruleGroup"]):
+        # 부정 연산자/NOT 접두어가 다중 값 속성에 충분히 걸리도록 변경
+        if expr["@operatorId"] == "at least one in list":
+            expr["@operatorId"] = rnd.choice(LIST_OPERATORS)
+        if "@prefix" in expr:
+            expr["@prefix"] = rnd.choice(PREFIXES)
+    return PolicySimulator.from_manager(PolicyManager(data, compact=compact))
+
+
+def _contexts(count: int, mixed: bool = False):
+    rnd = random.Random(11)
+    for _ in range(count):
+        context = {
+            "URL.Host": f"example{rnd.randrange(60)}.com",
+            "URL.DestinationIP": f"10.{rnd.randrange(60)}.1.1",
+            "Authentication.IsAuthenticated": rnd.choice(("true", "false")),
+            "Connection.Protocol": rnd.choice(("HTTP", "HTTPS")),
+            "Destination.Port": rnd.choice(("80", "443")),
+            # 빈 리스트 셀과 값 없는 셀을 모두 포함
+            "URL.Categories": [f"Category {rnd.randrange(60)}" for _ in range(rnd.randrange(3))],
+            "Authentication.UserGroups": [f"example{rnd.randrange(60)}.com" for _ in range(rnd.randrange(3))],
+        }
+        if mixed and rnd.random() < 0.3:
+            # 같은 열에 스칼라 셀과 목록 셀이 섞인 경우
+            context["Authentication.UserGroups"] = f"example{rnd.randrange(60)}.com"
+        for key in ("URL.Categories", "Authentication.UserGroups", "URL.Host"):
+            if rnd.random() < 0.1:
+                del context[key]
+        yield context
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("mixed", [False, True])
+def test_batch_matches_scalar_with_empty_list_cells(compact, mixed):
+    simulator = _simulator(compact)
+    contexts = list(_contexts(2000, mixed))
+    if mixed:
+        # 각 청크의 첫 셀이 스칼라여도 목록 열로 처리되는지 확인
+        for start in range(0, len(contexts), 700):
+            contexts[start]["Authentication.UserGroups"] = "example1.com"
+    assert any(context.get("URL.Categories") == [] for context in contexts)
+    assert mixed == any(isinstance(context.get("Authentication.UserGroups"), str) for context in contexts)
+
+    keys = sorted(set().union(*contexts))
+    frame = pd.DataFrame({key: [context.get(key) for context in contexts] for key in keys})
+    batch = simulator.evaluate_batch(frame, chunk_size=700)
+
+    positions = {id(rule): pos for pos, rule in enumerate(batch.rules)}
+    matches = {}
+    for i, result in enumerate(simulator.replay(contexts)):
+        final = -1 if result.rule is None else positions[id(result.rule)]
+        assert batch.final[i] == final, i
+        for rule in result.matched:
+            matches.setdefault(positions[id(rule)], []).append(i)
+    assert {pos: list(rows) for pos, rows in batch.matches.items()} == matches
+
+
+def test_mixed_scalar_and_list_column():
+    column = _Column(pd.Series(["a", ["b", "c"], None, []]), 4)
+    assert list(column.uniques) == ["a", "b", "c"]
+    assert list(column.owners) == [0, 1, 1, 2, 3]
+    assert list(column.present) == [True, True, False, True]
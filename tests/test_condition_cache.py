@@ -0,0 +1,54 @@
+"""ConditionCache 적중/공유 검사"""
+
+import copy
+
+import pytest
+
+import synthetic
+from policy_module.parsers.condition_parser import FrozenRow
+from policy_module.policy_manager import PolicyManager
+
+
+@pytest.fixture
+def source():
+    """첫 번째 룰과 같은 조건식 블록을 가진 룰 4개"""
+    data = synthetic.generate(rules=4, depth=1, groups=1, lists=1, list_entries=1)
+    rules = data["libraryContent"]["ruleGroup"]["ruleGroups"]["ruleGroup"]["rules"]["rule"]
+    for rule in rules[1:]:
+        rule["condition"] = copy.deepcopy(rules[0]["condition"])
+    return data
+
+
+def _rows_by_rule(records):
+    rows, current = {}, None
+    for record in records:
+        current = record["id"] or current
+        if current.startswith("rule-"):
+            rows.setdefault(current, []).append(record["condition_raw"])
+    return rows
+
+
+def test_cache_is_opt_in(source):
+    manager = PolicyManager(source)
+    assert manager.condition_cache is None
+    assert not any(isinstance(r["condition_raw"], FrozenRow) for r in manager.parse_policy())
+
+
+def test_identical_blocks_share_rows(source):
+    manager = PolicyManager(source, cache_conditions=True)
+    records = manager.parse_policy()
+
+    stats = manager.condition_cache.stats()
+    assert (stats["condition_misses"], stats["condition_hits"], stats["conditions"]) == (1, 3, 1)
+    assert (stats["expression_misses"], stats["expression_hits"]) == (3, 0)
+
+    rows = _rows_by_rule(records)
+    first = rows.pop("rule-1")
+    assert len(first) == 3 and all(isinstance(row, FrozenRow) for row in first)
+    for other in rows.values():
+        assert all(a is b for a, b in zip(first, other))
+    with pytest.raises(TypeError):
+        first[0]["property"] = "changed"
+
+    plain = PolicyManager(source).parse_policy()
+    assert [dict(r, condition_raw=dict(r["condition_raw"])) for r in records] == plain
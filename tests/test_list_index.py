@@ -0,0 +1,99 @@
+"""ListValueIndex와 ListMatcher의 포함 판정 비교"""
+
+import pickle
+import random
+
+import pytest
+
+from policy_module.list_index import ListMatch, ListValueIndex
+from policy_module.simulation.list_matcher import ListMatcher
+
+
+def _entry(rnd):
+    n = rnd.randrange(8)
+    return rnd.choice((
+        f"host{n}.example.com",
+        f"*.dom{n}.com",
+        f"*.sub.dom{n}.com",
+        f"srv?.corp{n}.net",
+        f"api*.svc{n}.io",
+        f"10.{n}.{rnd.randrange(4)}.{rnd.randrange(4)}",
+        f"10.{n}.0.0/16",
+        f"192.168.{n}.10-192.168.{n}.20",
+        f"2001:db8:{n}::/48",
+    ))
+
+
+@pytest.fixture(scope="module")
+def lists():
+    rnd = random.Random(3)
+    return {
+        f"list{i}": [{"entry": _entry(rnd)} for _ in range(rnd.randrange(1, 12))]
+        for i in range(30)
+    }
+
+
+def _queries():
+    for n in range(9):
+        yield f"host{n}.example.com"
+        yield f"dom{n}.com"  # *.dom{n}.com는 도메인 자체를 포함하지 않음
+        yield f"www.dom{n}.com"
+        yield f"a.b.sub.dom{n}.com"
+        yield f"srv1.corp{n}.net"
+        yield f"srv12.corp{n}.net"
+        yield f"api.v2.svc{n}.io"
+        yield f"10.{n}.1.2"
+        yield f"10.{n}.200.7"
+        yield f"192.168.{n}.15"
+        yield f"192.168.{n}.21"
+        yield f"2001:db8:{n}::1"
+
+
+def _expected(matchers, value):
+    return [
+        list_id for list_id, matcher in matchers.items()
+        if matcher.contains(value) or matcher.in_range(value)
+    ]
+
+
+def test_lookup_matches_list_matcher(lists):
+    index = ListValueIndex.from_lists(lists)
+    matchers = {list_id: ListMatcher.from_records(list_id, records) for list_id, records in lists.items()}
+    checked = 0
+    for value in _queries():
+        expected = _expected(matchers, value)
+        assert sorted(index.lists_containing(value)) == sorted(expected), value
+        checked += bool(expected)
+    assert checked > 40
+
+
+def test_lookup_kinds():
+    index = ListValueIndex.from_lists({
+        "hosts": [{"entry": "Example.COM."}, {"entry": ".corp.net"}, {"entry": "*.example.com"}],
+        "ips": [{"entry": "10.0.0.0/8"}, {"entry": "10.1.0.0-10.1.255.255"}],
+        "globs": [{"entry": "db?.example.*"}],
+    })
+    assert index.lookup("example.com") == [ListMatch("hosts", "Example.COM.", "exact")]
+    assert index.lookup("WWW.Example.com") == [ListMatch("hosts", "*.example.com", "domain")]
+    # 앞에 점이 있는 엔트리는 도메인 자체도 포함
+    assert index.lists_containing("corp.net") == ["hosts"]
+    assert index.lists_containing("a.corp.net") == ["hosts"]
+    assert index.lookup("db1.example.org") == [ListMatch("globs", "db?.example.*", "wildcard")]
+    assert {m.entry for m in index.lookup("10.1.2.3")} == {"10.0.0.0/8", "10.1.0.0-10.1.255.255"}
+    # 범위 질의는 겹치는 IP 엔트리를 반환
+    assert {m.entry for m in index.lookup("10.2.0.0/16")} == {"10.0.0.0/8"}
+    assert index.lookup("11.0.0.1") == []
+
+
+def test_save_and_load(lists, tmp_path):
+    index = ListValueIndex.from_lists(lists)
+    path = tmp_path / "lists.index"
+    index.save(str(path))
+    loaded = ListValueIndex.load(str(path))
+    assert loaded.stats() == index.stats()
+    for value in _queries():
+        assert loaded.lookup(value) == index.lookup(value)
+
+    path.write_bytes(pickle.dumps({"version": -1, "index": index}))
+    with pytest.raises(ValueError):
+        ListValueIndex.load(str(path))
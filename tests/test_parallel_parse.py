@@ -0,0 +1,43 @@
+"""병렬 파싱과 직렬 파싱 결과 비교"""
+
+import pytest
+
+import synthetic
+from policy_module.parsers.condition_parser import ConditionCache
+from policy_module.parsers.policy_parser import PolicyParser
+from policy_module.parsers.records import as_dict
+
+
+@pytest.fixture(scope="module")
+def source():
+    # 최상위 그룹 6개, 그 아래 하위 그룹 2단계
+    return synthetic.generate(rules=300, depth=3, groups=6, branching=2, lists=4, list_entries=5)
+
+
+def _parse(source, compact, workers):
+    parser = PolicyParser(source, compact=compact, condition_cache=ConditionCache(), workers=workers)
+    if workers:
+        records = list(parser.iter_records())
+    else:
+        records = list(parser.walk(parser.data))
+    return parser, [as_dict(record) for record in records]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_parallel_matches_serial(source, compact):
+    serial_parser, serial = _parse(source, compact, 0)
+    parallel_parser, parallel = _parse(source, compact, 2)
+
+    assert len({record["path"] for record in serial if record["path"].count(" > ") == 1}) == 6
+    assert [r["path"] for r in parallel] == [r["path"] for r in serial]
+    assert [r["condition_index"] for r in parallel] == [r["condition_index"] for r in serial]
+    assert parallel == serial
+    assert [node.path for node in parallel_parser.paths.nodes] == [node.path for node in serial_parser.paths.nodes]
+
+    # 워커 캐시의 적중/미스 횟수가 호출한 프로세스의 캐시에 합산됨
+    # (조건식 미스에서만 표현식을 조회하므로 표현식 조회 수는 워커 분할에 따라 다름)
+    serial_stats = serial_parser.condition_cache.stats()
+    parallel_stats = parallel_parser.condition_cache.stats()
+    lookups = parallel_stats["condition_hits"] + parallel_stats["condition_misses"]
+    assert lookups == serial_stats["condition_hits"] + serial_stats["condition_misses"]
+    assert parallel_stats["condition_misses"] > parallel_parser.condition_cache.stats()["conditions"]
@@ -0,0 +1,81 @@
+"""ppat_db 저장/이전 스키마 변환 검사"""
+
+import json
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import Session
+
+import synthetic
+from ppat_db import migrate_policy_tables, save_policy_to_db
+from ppat_db.database import db
+from ppat_db.policy_db import PolicyConfiguration, PolicyItem, PolicyList
+
+
+LEGACY_TABLES = [
+    "CREATE TABLE policy_items (id INTEGER PRIMARY KEY, item_id VARCHAR(100) UNIQUE NOT NULL,"
+    " name VARCHAR(200) NOT NULL, type VARCHAR(50) NOT NULL, path VARCHAR(500),"
+    " enabled BOOLEAN, description VARCHAR(500), raw_data JSON)",
+    "CREATE TABLE policy_conditions (id INTEGER PRIMARY KEY, item_id VARCHAR(100) NOT NULL"
+    " REFERENCES policy_items(item_id), prefix VARCHAR(50), property VARCHAR(100),"
+    " operator VARCHAR(50), \"values\" TEXT, result VARCHAR(50))",
+    "CREATE TABLE policy_lists (id INTEGER PRIMARY KEY, list_id VARCHAR(100) UNIQUE NOT NULL,"
+    " name VARCHAR(200) NOT NULL, type_id VARCHAR(50) NOT NULL, classifier VARCHAR(100), entries JSON)",
+    "CREATE TABLE policy_configurations (id INTEGER PRIMARY KEY,"
+    " configuration_id VARCHAR(100) UNIQUE NOT NULL, name VARCHAR(200) NOT NULL,"
+    " version VARCHAR(50), description VARCHAR(500), settings JSON)",
+]
+
+
+def test_migrate_legacy_tables():
+    engine = create_engine("sqlite://")
+    raw = {"@id": "r1", "@name": "Block"}
+    entries = [{"value": "example.com"}]
+    with engine.begin() as conn:
+        for statement in LEGACY_TABLES:
+            conn.execute(text(statement))
+        # 이전 save_policy_to_db는 json.dumps 문자열을 JSON 컬럼에 넣었음
+        conn.execute(
+            text("INSERT INTO policy_items (item_id, name, type, path, enabled, raw_data)"
+                 " VALUES ('r1', 'Block', 'rule', 'Root > Block', 0, :raw)"),
+            {"raw": json.dumps(json.dumps(raw))},
+        )
+        conn.execute(text("INSERT INTO policy_conditions (item_id, property) VALUES ('r1', 'URL.Host')"))
+        conn.execute(
+            text("INSERT INTO policy_lists (list_id, name, type_id, entries)"
+                 " VALUES ('l1', 'Hosts', 'com.scur.type.string', :entries)"),
+            {"entries": json.dumps(entries)},
+        )
+        conn.execute(
+            text("INSERT INTO policy_configurations (configuration_id, name, settings)"
+                 " VALUES ('c1', 'Settings', :settings)"),
+            {"settings": json.dumps({"a": 1})},
+        )
+
+    migrated = migrate_policy_tables(engine)
+    assert set(migrated) == {"policy_items", "policy_lists", "policy_configurations", "policy_conditions"}
+    assert "position" in {column["name"] for column in inspect(engine).get_columns("policy_conditions")}
+
+    with Session(engine) as session:
+        item = session.scalars(select(PolicyItem)).one()
+        assert (item.item_type, item.path, item.enabled, item.raw) == ("rule", "Root > Block", "false", raw)
+        assert session.scalars(select(PolicyList)).one().raw == {"entries": entries}
+        assert session.scalars(select(PolicyConfiguration)).one().raw == {"a": 1}
+
+    assert migrate_policy_tables(engine) == []
+
+
+def test_save_policy_with_deprecated_list_source():
+    flask = pytest.importorskip("flask")
+    app = flask.Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    db.init_app(app)
+    policy = synthetic.generate(rules=5, lists=0)
+    lists = synthetic.generate(rules=3, lists=3, list_entries=2)
+    with app.app_context():
+        db.create_all()
+        with pytest.deprecated_call():
+            save_policy_to_db(policy, lists)
+        # 룰은 policy_source에서, 리스트는 list_source에서
+        assert db.session.query(PolicyItem).filter_by(item_type="rule").count() == 5
+        assert db.session.query(PolicyList).count() == 3
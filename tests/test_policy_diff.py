@@ -0,0 +1,60 @@
+"""그룹/룰 구조 비교 검사"""
+
+import copy
+
+import pytest
+
+import synthetic
+from policy_module.parsers.policy_parser import PolicyParser
+from policy_module.policy_diff import _Tree, diff_policy
+
+
+def _groups(group, found=None):
+    found = {} if found is None else found
+    found[group["@id"]] = group
+    children = (group.get("ruleGroups") or {}).get("ruleGroup") or []
+    for child in children if isinstance(children, list) else [children]:
+        _groups(child, found)
+    return found
+
+
+@pytest.fixture
+def source():
+    data = synthetic.generate(rules=12, depth=2, groups=2, branching=2, lists=1, list_entries=1)
+    # 이름에 경로 구분자가 들어간 그룹
+    _groups(data["libraryContent"]["ruleGroup"])["group-3"]["@name"] = "Web > Allow"
+    return data
+
+
+def _records(data, compact):
+    return list(PolicyParser(data, compact=compact).iter_records())
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_tree_uses_group_path(source, compact):
+    tree = _Tree(_records(source, compact))
+    group = tree.by_id["group-3"]
+    assert group.path == "Root > Group 1 > Web > Allow"
+    assert group.parent.id == "group-1"
+    assert [child.id for child in group.children] == ["rule-4", "rule-5", "rule-6"]
+    assert len(group.digest) == 32
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_diff_reports_move_and_rename(source, compact):
+    after = copy.deepcopy(source)
+    groups = _groups(after["libraryContent"]["ruleGroup"])
+    moved = groups["group-3"]["rules"]["rule"].pop(1)
+    groups["group-5"]["rules"]["rule"].append(moved)
+    groups["group-2"]["rules"]["rule"][0]["@name"] = "Rule One"
+
+    unchanged, stats = diff_policy(_records(source, compact), _records(source, compact))
+    assert unchanged == [] and stats["skipped"] == stats["compared"] == 1
+
+    changes, stats = diff_policy(_records(source, compact), _records(after, compact))
+    by_id = {change.id: change for change in changes}
+    assert set(by_id) == {"rule-1", "rule-5"}
+    assert by_id["rule-1"].fields == {"name": ("Rule 1", "Rule One")}
+    assert by_id["rule-5"].moved and by_id["rule-5"].new_path == "Root > Group 4 > Group 5 > Rule 5"
+    # 변경이 없는 그룹 6은 해시가 같아 자식을 보지 않음
+    assert stats["skipped"] > 0
@@ -0,0 +1,54 @@
+"""전문 검색 색인 갱신 검사"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+import synthetic
+from policy_module.policy_search import SEARCH_TABLE, PolicySearch
+from policy_module.policy_store import PolicyStore
+from ppat_db.database import db
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    db.Model.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _documents(session):
+    return session.execute(text(f"SELECT kind, ref, name FROM {SEARCH_TABLE} ORDER BY kind, ref")).all()
+
+
+def test_search_index_is_opt_in(session):
+    source = synthetic.generate(rules=10, depth=1, lists=2, list_entries=3)
+    PolicyStore(session).store_from_source(source)
+    assert not PolicySearch(session).available or _documents(session) == []
+
+    store = PolicyStore(session, search=True)
+    store.store_from_source(source)
+    if not PolicySearch(session).available:
+        pytest.skip("SQLite FTS5 not available")
+    assert len(_documents(session)) == 10 + 2 + 2  # 룰 + 그룹(루트, 그룹 1) + 리스트
+    assert store.search("Rule 1").total >= 1
+
+
+def test_duplicate_documents_are_written_once(session):
+    search = PolicySearch(session)
+    if not search.available:
+        pytest.skip("SQLite FTS5 not available")
+    indexer = search.indexer()
+    indexer.add("rule", "r1", {"name": "First"})
+    indexer.add("rule", "r1", {"name": "Second"})
+    assert indexer.finish() == 1
+    assert _documents(session) == [("rule", "r1", "First")]
+
+    indexer = search.indexer()
+    indexer.add("rule", "r1", {"name": "Changed"})
+    indexer.add("rule", "r1", {"name": "Changed again"})
+    # 이전 문서 삭제 1건 + 새 문서 1건
+    assert indexer.finish() == 2
+    assert _documents(session) == [("rule", "r1", "Changed")]
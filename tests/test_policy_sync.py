@@ -0,0 +1,109 @@
+"""store_from_api 변경 감지 검사 (가짜 어플라이언스 사용)"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import synthetic
+from policy_module.config import ProxyConfig
+from policy_module.policy_store import PolicyStore
+from ppat_db.database import db
+from ppat_db.policy_db import PolicyItem
+
+
+class FakeAppliance(BaseHTTPRequestHandler):
+    """로그인, Rule Set 목록, 내보내기만 흉내 내는 API"""
+
+    export = b""
+    exports = 0
+    listings = 0
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, code, body=b"", headers=None):
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.endswith("/login"):
+            return self.reply(200, headers={"Set-Cookie": "JSESSIONID=test; Path=/"})
+        if "logout" in self.path:
+            return self.reply(200)
+        type(self).exports += 1
+        self.reply(200, type(self).export)
+
+    def do_GET(self):
+        type(self).listings += 1
+        self.reply(200, b"<entries><entry><id>rs0</id><title>Main</title><noOfChild>3</noOfChild></entry></entries>")
+
+
+@pytest.fixture
+def appliance(tmp_path):
+    path = tmp_path / "export.xml"
+    synthetic.write_xml(str(path), synthetic.SyntheticSpec(rules=20, depth=1, lists=3, list_entries=5))
+    FakeAppliance.export = path.read_bytes()
+    FakeAppliance.exports = 0
+    FakeAppliance.listings = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAppliance)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield ProxyConfig(f"http://127.0.0.1:{server.server_address[1]}", "user", "password")
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    db.Model.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def _rule_names(session):
+    return {item.name for item in session.query(PolicyItem).filter_by(item_type="rule")}
+
+
+def test_content_only_edit_is_reimported(appliance, session):
+    store = PolicyStore(session)
+    assert not store.store_from_api(appliance).skipped
+    assert "Rule 1" in _rule_names(session)
+
+    # Rule Set 목록은 그대로이고 룰 이름만 바뀜
+    FakeAppliance.export = FakeAppliance.export.replace(b'name="Rule 1"', b'name="Rule One"')
+    report = store.store_from_api(appliance)
+
+    assert not report.skipped
+    assert FakeAppliance.exports == 2
+    assert "Rule One" in _rule_names(session)
+    assert "Rule 1" not in _rule_names(session)
+
+
+def test_skip_unchanged_is_opt_in(appliance, session):
+    store = PolicyStore(session)
+    store.store_from_api(appliance, record_state=True)
+    report = store.store_from_api(appliance, skip_unchanged=True)
+
+    assert report.skipped
+    assert FakeAppliance.exports == 1
+    assert report.records == session.query(PolicyItem).count()
+
+
+def test_fingerprint_is_probed_only_when_needed(appliance, session):
+    store = PolicyStore(session)
+    report = store.store_from_api(appliance)
+    # 메인 Rule Set을 찾는 목록 조회 한 번뿐 (지문 조회 없음)
+    assert FakeAppliance.listings == 1
+    assert report.fingerprint is None
+
+    # 지문이 기록되지 않았으므로 생략하지 않음
+    report = store.store_from_api(appliance, skip_unchanged=True)
+    assert not report.skipped and report.fingerprint is not None
+    assert FakeAppliance.listings == 3
@@ -0,0 +1,116 @@
+"""SnapshotStore 저장/복원, 중복 제거, 정리 검사"""
+
+import hashlib
+import json
+import os
+
+import pytest
+import zstandard as zstd
+
+import synthetic
+from policy_module.snapshot_store import SnapshotStore, split_chunks
+
+
+@pytest.fixture(scope="module")
+def export(tmp_path_factory):
+    path = tmp_path_factory.mktemp("export") / "export.xml"
+    synthetic.write_xml(str(path), synthetic.SyntheticSpec(rules=800, depth=2, lists=10, list_entries=20))
+    return path.read_bytes()
+
+
+def _edited(export):
+    # 룰 이름 하나만 바뀐 내보내기
+    edited = export.replace(b'name="Rule 400"', b'name="Rule Four Hundred"', 1)
+    assert edited != export
+    return edited
+
+
+def _chunk_files(store):
+    chunks_dir = os.path.join(store.directory, "chunks")
+    return {name for prefix in os.listdir(chunks_dir) for name in os.listdir(os.path.join(chunks_dir, prefix))}
+
+
+def test_round_trip(export, tmp_path):
+    store = SnapshotStore(tmp_path)
+    info = store.put(export, proxy="https://proxy1", ruleset_title="Main")
+    assert info.sha256 == hashlib.sha256(export).hexdigest()
+    assert info.size == len(export) and info.chunks > 10
+    assert store.read(info.id) == export
+    assert b"".join(store.open(info.id)) == export
+
+    # 청크 단위로 받은 내보내기도 같은 청크로 나뉨
+    pieces = (export[i:i + 1000] for i in range(0, len(export), 1000))
+    streamed = store.put(pieces, proxy="https://proxy1")
+    assert streamed.sha256 == info.sha256 and streamed.new_chunks == 0
+    assert store.open(streamed.id).hashes == store.open(info.id).hashes
+
+    # 손상된 청크는 SHA-256 비교로 감지
+    digest = store.open(info.id).hashes[3]
+    with open(store._chunk_path(digest), "wb") as f:
+        f.write(zstd.ZstdCompressor().compress(b"corrupted"))
+    with pytest.raises(ValueError):
+        store.read(info.id)
+
+
+def test_near_identical_snapshots_share_chunks(export, tmp_path):
+    store = SnapshotStore(tmp_path)
+    first = store.put(export)
+    second = store.put(_edited(export))
+    assert store.read(second.id) == _edited(export)
+    assert first.new_chunks == first.chunks
+    assert 0 < second.new_chunks <= 2
+    stats = store.stats()
+    assert stats["chunks"] == first.chunks + second.new_chunks
+    assert stats["logical_bytes"] == first.size + second.size
+    assert stats["stored_bytes"] < first.stored_bytes + second.size // 10
+
+
+def test_remove_and_collect_garbage(export, tmp_path):
+    store = SnapshotStore(tmp_path)
+    first = store.put(export)
+    second = store.put(_edited(export))
+    only_first = set(store.open(first.id).hashes) - set(store.open(second.id).hashes)
+
+    store.remove(first.id)
+    assert store.collect_garbage() == len(only_first)
+    assert not any(name[:-4] in only_first for name in _chunk_files(store))
+    assert store.read(second.id) == _edited(export)
+    with pytest.raises(ValueError):
+        store.get(first.id)
+
+    remaining = set(store.open(second.id).hashes)
+    store.remove(second.id)
+    assert store.collect_garbage() == len(remaining)
+    assert _chunk_files(store) == set()
+    assert store.stats()["snapshots"] == 0
+
+
+def test_ids_are_monotonic(export, tmp_path):
+    store = SnapshotStore(tmp_path)
+    ids = [store.put(export[: 10000 * n]).id for n in (1, 2, 3)]
+    assert ids == [1, 2, 3]
+    store.remove(3)
+    assert store.put(export[:5000]).id == 4
+
+    # 다시 열어도, 모두 삭제해도 이전 ID를 다시 쓰지 않음
+    store = SnapshotStore(tmp_path)
+    for info in store.list():
+        store.remove(info.id)
+    store = SnapshotStore(tmp_path)
+    assert store.put(export[:5000]).id == 5
+
+    # next_id가 없는 이전 인덱스는 남은 스냅샷 다음 ID부터
+    index_path = os.path.join(tmp_path, "index.json")
+    with open(index_path, encoding="utf-8") as f:
+        index = json.load(f)
+    del index["next_id"]
+    with open(index_path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    assert SnapshotStore(tmp_path).put(export[:5000]).id == 6
+
+
+def test_split_chunks_is_content_defined(export):
+    chunks = list(split_chunks(export))
+    assert b"".join(chunks) == export
+    edited = list(split_chunks(_edited(export)))
+    assert len(set(edited) - set(chunks)) <= 2